@@ -0,0 +1,291 @@
+"""
+OpenStack Swift Object Data Backends
+
+A backend stores the data of each object under the path the model records
+for it; everything else about the object lives in the model and the
+storage's metadata.
+"""
+import errno
+import hashlib
+import io
+import logging
+import os
+import os.path
+import shutil
+import tempfile
+import threading
+import uuid
+
+import six
+
+from openstackinabox.utils.directory import TemporaryDirectory
+
+from openstackinabox.models.swift import exceptions
+from openstackinabox.models.swift import streams
+
+
+LOG = logging.getLogger(__name__)
+
+
+def check_etag(etag, expected_etag):
+    if (
+        expected_etag is not None and
+        expected_etag.strip('"').lower() != etag.lower()
+    ):
+        raise exceptions.SwiftEtagMismatchError(
+            'Object data has etag {0}, expected {1}'.format(
+                etag, expected_etag
+            )
+        )
+
+
+def missing_data(path):
+    return OSError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+
+
+class SwiftFilesystemBackend(object):
+    """Object data stored as files in a temporary directory"""
+
+    @staticmethod
+    def get_file_etag(file_name, chunk_size=streams.DEFAULT_CHUNK_SIZE):
+        etag_generator = hashlib.md5()
+        with open(file_name, 'rb') as input_data:
+            for chunk in streams.iter_chunks(input_data, chunk_size):
+                etag_generator.update(chunk)
+
+        return etag_generator.hexdigest()
+
+    @staticmethod
+    def get_source_file(content):
+        # only real, named files on disk can be linked instead of copied
+        try:
+            content.fileno()
+            source_file = content.name
+
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+        if isinstance(source_file, six.string_types) and os.path.isfile(
+            source_file
+        ):
+            return source_file
+
+        return None
+
+    def __init__(self):
+        self.__storage = TemporaryDirectory()
+
+    def __repr__(self):
+        return 'SwiftFilesystemBackend({0})'.format(self.location)
+
+    @property
+    def storage(self):
+        return self.__storage
+
+    @property
+    def location(self):
+        return self.storage.name
+
+    def make_directory(self, path, parents=False):
+        if parents:
+            os.makedirs(path, exist_ok=True)
+
+        elif not os.path.exists(path):
+            os.mkdir(path)
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def get_size(self, path):
+        return os.path.getsize(path)
+
+    def write(self, path, content, link=False, expected_etag=None,
+              chunk_size=streams.DEFAULT_CHUNK_SIZE):
+        """Write object data to path, computing its etag in the same pass"""
+        source_file = self.get_source_file(content) if link else None
+        # existing data files may be hard links, so they are only ever
+        # replaced by a rename and never modified in place
+        temp_fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path),
+            prefix='.tmp-'
+        )
+        try:
+            linked = False
+            if source_file is not None:
+                os.close(temp_fd)
+                temp_fd = None
+                os.remove(temp_path)
+                try:
+                    os.link(source_file, temp_path)
+                    linked = True
+
+                except OSError:
+                    LOG.debug(
+                        'Unable to link {0}, copying instead'.format(
+                            source_file
+                        )
+                    )
+                    temp_fd = os.open(
+                        temp_path,
+                        os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                        0o600
+                    )
+
+            if linked:
+                etag = self.get_file_etag(temp_path, chunk_size)
+                size = os.path.getsize(temp_path)
+
+            else:
+                with os.fdopen(temp_fd, 'wb') as object_file:
+                    temp_fd = None
+                    etag, size = streams.copy_stream(
+                        content, object_file, chunk_size
+                    )
+
+            check_etag(etag, expected_etag)
+            os.replace(temp_path, path)
+
+        except Exception:
+            if temp_fd is not None:
+                os.close(temp_fd)
+
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+            raise
+
+        return (etag, size)
+
+    def link(self, source_path, path):
+        """Make path share the data at source_path"""
+        temp_path = '{0}/.tmp-{1}'.format(
+            os.path.dirname(path),
+            uuid.uuid4().hex
+        )
+        try:
+            try:
+                os.link(source_path, temp_path)
+
+            except OSError:
+                LOG.debug(
+                    'Unable to link {0}, copying instead'.format(source_path)
+                )
+                shutil.copyfile(source_path, temp_path)
+
+            os.replace(temp_path, path)
+
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+            raise
+
+    def read(self, path):
+        with open(path, 'rb') as data_input:
+            return data_input.read()
+
+    def open_stream(self, path, chunk_size=streams.DEFAULT_CHUNK_SIZE,
+                    offset=0, length=None, mmap=False):
+        if mmap:
+            return streams.SwiftObjectMemoryMap(
+                path, chunk_size=chunk_size, offset=offset, length=length
+            )
+
+        return streams.SwiftObjectStream(
+            path, chunk_size=chunk_size, offset=offset, length=length
+        )
+
+    def remove(self, path):
+        os.remove(path)
+
+    def cleanup(self):
+        self.storage.cleanup()
+
+
+class SwiftMemoryBackend(object):
+    """Object data kept in memory as immutable bytes keyed by path"""
+
+    def __init__(self):
+        self.__location = '/swift-memory-{0}'.format(uuid.uuid4().hex)
+        self.__directories = set([self.__location])
+        self.__data = {}
+        self.__lock = threading.Lock()
+
+    def __repr__(self):
+        return 'SwiftMemoryBackend({0})'.format(self.location)
+
+    @property
+    def storage(self):
+        return None
+
+    @property
+    def location(self):
+        return self.__location
+
+    @property
+    def data(self):
+        return self.__data
+
+    def make_directory(self, path, parents=False):
+        with self.__lock:
+            self.__directories.add(path)
+
+    def exists(self, path):
+        return path in self.__data or path in self.__directories
+
+    def get_size(self, path):
+        try:
+            return len(self.__data[path])
+
+        except KeyError:
+            raise missing_data(path)
+
+    def write(self, path, content, link=False, expected_etag=None,
+              chunk_size=streams.DEFAULT_CHUNK_SIZE):
+        """Store object data, computing its etag in the same pass"""
+        output = io.BytesIO()
+        etag, size = streams.copy_stream(content, output, chunk_size)
+        check_etag(etag, expected_etag)
+        with self.__lock:
+            self.__data[path] = output.getvalue()
+
+        return (etag, size)
+
+    def link(self, source_path, path):
+        """Make path share the data at source_path without copying it"""
+        with self.__lock:
+            try:
+                self.__data[path] = self.__data[source_path]
+
+            except KeyError:
+                raise missing_data(source_path)
+
+    def read(self, path):
+        try:
+            return self.__data[path]
+
+        except KeyError:
+            raise missing_data(path)
+
+    def open_stream(self, path, chunk_size=streams.DEFAULT_CHUNK_SIZE,
+                    offset=0, length=None, mmap=False):
+        return streams.SwiftObjectBuffer(
+            self.read(path),
+            chunk_size=chunk_size,
+            offset=offset,
+            length=length,
+            name=path
+        )
+
+    def remove(self, path):
+        with self.__lock:
+            try:
+                del self.__data[path]
+
+            except KeyError:
+                raise missing_data(path)
+
+    def cleanup(self):
+        with self.__lock:
+            self.__data.clear()
+            self.__directories = set([self.__location])
@@ -0,0 +1,75 @@
+"""
+OpenStack Swift Path Resolution Cache
+"""
+import collections
+
+
+class SwiftPathCache(object):
+    """Bounded LRU cache of resolved object information"""
+
+    def __init__(self, max_size):
+        if max_size < 1:
+            raise ValueError('Cache size must be at least 1')
+
+        self.__max_size = max_size
+        self.__entries = collections.OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    @property
+    def max_size(self):
+        return self.__max_size
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    @property
+    def evictions(self):
+        return self.__evictions
+
+    @property
+    def stats(self):
+        return {
+            'size': len(self),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+    def get(self, key):
+        try:
+            value = self.__entries.pop(key)
+
+        except KeyError:
+            self.__misses += 1
+            return None
+
+        self.__entries[key] = value
+        self.__hits += 1
+        return value
+
+    def put(self, key, value):
+        self.__entries.pop(key, None)
+        self.__entries[key] = value
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def invalidate(self, key):
+        self.__entries.pop(key, None)
+
+    def clear(self):
+        self.__entries.clear()
@@ -16,3 +16,19 @@ class SwiftUnknownContainerError(SwiftExceptions):
 
 class SwiftUnknownObjectError(SwiftExceptions):
     pass
+
+
+class SwiftEtagMismatchError(SwiftExceptions):
+    pass
+
+
+class SwiftUnknownBlobError(SwiftExceptions):
+    pass
+
+
+class SwiftManifestError(SwiftExceptions):
+    pass
+
+
+class SwiftContainerNotEmptyError(SwiftExceptions):
+    pass
@@ -1,8 +1,11 @@
 """
 OpenStack Swift Model
 """
+import contextlib
 import sqlite3
 
+import six
+
 from openstackinabox.models import base_model
 from openstackinabox.models.swift import exceptions
 
@@ -13,7 +16,10 @@ schema = [
     (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         tenantid TEXT NOT NULL,
-        path TEXT NOT NULL
+        path TEXT NOT NULL,
+        container_count INTEGER NOT NULL DEFAULT 0,
+        object_count INTEGER NOT NULL DEFAULT 0,
+        bytes_used INTEGER NOT NULL DEFAULT 0
     )
     ''',
     '''
@@ -22,7 +28,9 @@ schema = [
         tenantid INTEGER NOT NULL REFERENCES swift_tenants(id),
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         container_name TEXT NOT NULL,
-        path TEXT NOT NULL
+        path TEXT NOT NULL,
+        object_count INTEGER NOT NULL DEFAULT 0,
+        bytes_used INTEGER NOT NULL DEFAULT 0
     )
     ''',
     '''
@@ -32,8 +40,47 @@ schema = [
         containerid INTEGER NOT NULL REFERENCES swift_containers(id),
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         object_name TEXT NOT NULL,
-        path TEXT NOT NULL
+        path TEXT NOT NULL,
+        bytes INTEGER NOT NULL DEFAULT 0,
+        blobid INTEGER REFERENCES swift_blobs(id),
+        delete_at INTEGER
     )
+    ''',
+    '''
+    CREATE TABLE swift_blobs
+    (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        etag TEXT NOT NULL,
+        path TEXT NOT NULL,
+        bytes INTEGER NOT NULL DEFAULT 0,
+        refcount INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE UNIQUE INDEX swift_tenants_tenantid
+    ON swift_tenants (tenantid)
+    ''',
+    '''
+    CREATE UNIQUE INDEX swift_containers_container_name
+    ON swift_containers (tenantid, container_name)
+    ''',
+    '''
+    CREATE UNIQUE INDEX swift_objects_object_name
+    ON swift_objects (tenantid, containerid, object_name)
+    ''',
+    '''
+    CREATE INDEX swift_objects_delete_at
+    ON swift_objects (delete_at)
+    WHERE delete_at IS NOT NULL
+    ''',
+    '''
+    CREATE UNIQUE INDEX swift_blobs_etag
+    ON swift_blobs (etag)
+    ''',
+    '''
+    CREATE INDEX swift_blobs_unreferenced
+    ON swift_blobs (refcount)
+    WHERE refcount <= 0
     '''
 ]
 
@@ -41,9 +88,16 @@ SQL_INSERT_TENANT = '''
     INSERT INTO swift_tenants
     (tenantid, path)
     VALUES(:tenantid, :path)
+    ON CONFLICT (tenantid)
+    DO NOTHING
+'''
+SQL_UPDATE_TENANT = '''
+    UPDATE swift_tenants
+    SET path = :path
+    WHERE tenantid = :tenantid
 '''
 SQL_GET_TENANT = '''
-    SELECT id, tenantid, path
+    SELECT id, tenantid, path, container_count, object_count, bytes_used
     FROM swift_tenants
     WHERE id = :id
 '''
@@ -52,14 +106,29 @@ SQL_HAS_TENANT = '''
     FROM swift_tenants
     WHERE tenantid = :tenantid
 '''
+SQL_UPDATE_TENANT_USAGE = '''
+    UPDATE swift_tenants
+    SET container_count = container_count + :containers,
+        object_count = object_count + :objects,
+        bytes_used = bytes_used + :bytes
+    WHERE id = :tenantid
+'''
 
 SQL_INSERT_CONTAINER = '''
     INSERT INTO swift_containers
     (tenantid, container_name, path)
     VALUES (:tenantid, :container_name, :path)
+    ON CONFLICT (tenantid, container_name)
+    DO NOTHING
+'''
+SQL_UPDATE_CONTAINER = '''
+    UPDATE swift_containers
+    SET path = :path
+    WHERE tenantid = :tenantid
+      AND container_name = :container_name
 '''
 SQL_GET_CONTAINER = '''
-    SELECT tenantid, id, container_name, path
+    SELECT tenantid, id, container_name, path, object_count, bytes_used
     FROM swift_containers
     WHERE tenantid = :tenantid
       AND id = :containerid
@@ -70,14 +139,49 @@ SQL_HAS_CONTAINER = '''
     WHERE tenantid = :tenantid
       AND container_name = :container_name
 '''
+SQL_UPDATE_CONTAINER_USAGE = '''
+    UPDATE swift_containers
+    SET object_count = object_count + :objects,
+        bytes_used = bytes_used + :bytes
+    WHERE tenantid = :tenantid
+      AND id = :containerid
+'''
+SQL_REMOVE_CONTAINER = '''
+    DELETE
+    FROM swift_containers
+    WHERE tenantid = :tenantid
+      AND id = :containerid
+      AND object_count = 0
+'''
+SQL_LIST_CONTAINERS = '''
+    SELECT id, container_name, path, object_count, bytes_used
+    FROM swift_containers
+    WHERE tenantid = :tenantid
+      {0}
+    ORDER BY container_name
+    LIMIT :limit
+'''
 
 SQL_INSERT_OBJECT = '''
     INSERT INTO swift_objects
-    (tenantid, containerid, object_name, path)
-    VALUES(:tenantid, :containerid, :object_name, :path)
+    (tenantid, containerid, object_name, path, bytes, blobid, delete_at)
+    VALUES(:tenantid, :containerid, :object_name, :path, :bytes, :blobid,
+           :delete_at)
+    ON CONFLICT (tenantid, containerid, object_name)
+    DO NOTHING
+'''
+SQL_UPDATE_OBJECT = '''
+    UPDATE swift_objects
+    SET path = :path,
+        bytes = :bytes,
+        blobid = :blobid,
+        delete_at = :delete_at
+    WHERE tenantid = :tenantid
+      AND containerid = :containerid
+      AND object_name = :object_name
 '''
 SQL_GET_OBJECT = '''
-    SELECT tenantid, containerid, id, object_name, path
+    SELECT tenantid, containerid, id, object_name, path, bytes, blobid
     FROM swift_objects
     WHERE tenantid = :tenantid
       AND containerid = :containerid
@@ -90,6 +194,63 @@ SQL_HAS_OBJECT = '''
       AND containerid = :containerid
       AND object_name = :object_name
 '''
+SQL_RESOLVE_OBJECT = '''
+    SELECT swift_tenants.id, swift_containers.id, swift_objects.id,
+           swift_objects.object_name, swift_objects.path,
+           swift_objects.bytes, swift_objects.blobid
+    FROM swift_tenants
+    LEFT JOIN swift_containers
+      ON swift_containers.tenantid = swift_tenants.id
+     AND swift_containers.container_name = :container_name
+    LEFT JOIN swift_objects
+      ON swift_objects.tenantid = swift_tenants.id
+     AND swift_objects.containerid = swift_containers.id
+     AND swift_objects.object_name = :object_name
+    WHERE swift_tenants.tenantid = :tenantid
+'''
+SQL_LIST_OBJECTS = '''
+    SELECT id, object_name, path, bytes
+    FROM swift_objects
+    WHERE tenantid = :tenantid
+      AND containerid = :containerid
+      {0}
+    ORDER BY object_name
+    LIMIT :limit
+'''
+SQL_UPDATE_OBJECT_DELETE_AT = '''
+    UPDATE swift_objects
+    SET delete_at = :delete_at
+    WHERE tenantid = :tenantid
+      AND containerid = :containerid
+      AND id = :objectid
+'''
+SQL_GET_NEXT_DELETE_AT = '''
+    SELECT MIN(delete_at)
+    FROM swift_objects
+    WHERE delete_at IS NOT NULL
+'''
+SQL_LIST_EXPIRED_OBJECTS = '''
+    SELECT swift_tenants.tenantid, swift_containers.container_name,
+           swift_objects.object_name, swift_objects.delete_at
+    FROM swift_objects
+    JOIN swift_tenants
+      ON swift_tenants.id = swift_objects.tenantid
+    JOIN swift_containers
+      ON swift_containers.id = swift_objects.containerid
+    WHERE swift_objects.delete_at IS NOT NULL
+      AND swift_objects.delete_at <= :now
+    ORDER BY swift_objects.delete_at
+    LIMIT :limit
+'''
+SQL_GET_LAST_OBJECT = '''
+    SELECT id, object_name, path, bytes
+    FROM swift_objects
+    WHERE tenantid = :tenantid
+      AND containerid = :containerid
+      {0}
+    ORDER BY object_name DESC
+    LIMIT 1
+'''
 SQL_REMOVE_DELETE = '''
     DELETE
     FROM swift_objects
@@ -98,6 +259,79 @@ SQL_REMOVE_DELETE = '''
       AND id = :objectid
 '''
 
+SQL_INSERT_BLOB = '''
+    INSERT INTO swift_blobs
+    (etag, path, bytes)
+    VALUES(:etag, :path, :bytes)
+    ON CONFLICT (etag)
+    DO NOTHING
+'''
+SQL_GET_BLOB = '''
+    SELECT id, etag, path, bytes, refcount
+    FROM swift_blobs
+    WHERE etag = :etag
+'''
+SQL_UPDATE_BLOB_REFERENCES = '''
+    UPDATE swift_blobs
+    SET refcount = refcount + :references
+    WHERE id = :blobid
+'''
+SQL_LIST_UNREFERENCED_BLOBS = '''
+    SELECT id, path
+    FROM swift_blobs
+    WHERE refcount <= 0
+'''
+SQL_REMOVE_BLOB = '''
+    DELETE
+    FROM swift_blobs
+    WHERE id = :blobid
+      AND refcount <= 0
+'''
+
+# the greatest code point, and the surrogates no stored name can contain
+MAX_CHARACTER = six.unichr(0x10FFFF)
+SURROGATES = (0xD800, 0xDFFF)
+
+
+def get_name_successor(name):
+    """Least name greater than every name starting with name, or None"""
+    name = name.rstrip(MAX_CHARACTER)
+    if not name:
+        return None
+
+    code_point = ord(name[-1]) + 1
+    if SURROGATES[0] <= code_point <= SURROGATES[1]:
+        code_point = SURROGATES[1] + 1
+
+    return name[:-1] + six.unichr(code_point)
+
+
+def name_range_conditions(column, args, marker=None, end_marker=None,
+                          prefix=None, start=None):
+    """Build the range conditions a paged listing applies to column"""
+    conditions = []
+    if marker:
+        conditions.append('AND {0} > :marker'.format(column))
+        args['marker'] = marker
+
+    if end_marker:
+        conditions.append('AND {0} < :end_marker'.format(column))
+        args['end_marker'] = end_marker
+
+    if start:
+        conditions.append('AND {0} >= :start'.format(column))
+        args['start'] = start
+
+    if prefix:
+        conditions.append('AND {0} >= :prefix'.format(column))
+        args['prefix'] = prefix
+        prefix_end = get_name_successor(prefix)
+        if prefix_end is not None:
+            conditions.append('AND {0} < :prefix_end'.format(column))
+            args['prefix_end'] = prefix_end
+
+    return '\n      '.join(conditions)
+
 
 class SwiftServiceModel(base_model.BaseModel):
 
@@ -111,6 +345,7 @@ class SwiftServiceModel(base_model.BaseModel):
     def __init__(self, initialize=True):
         super(SwiftServiceModel, self).__init__('SwiftModel')
         self.__db = sqlite3.connect(':memory:')
+        self.__batch_depth = 0
         if initialize:
             self.initialize_db_schema(self.database)
 
@@ -118,6 +353,32 @@ class SwiftServiceModel(base_model.BaseModel):
     def database(self):
         return self.__db
 
+    @property
+    def in_batch(self):
+        return self.__batch_depth > 0
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Defer commits until the outermost batch completes"""
+        self.__batch_depth += 1
+        try:
+            yield self
+
+        except Exception:
+            self.__batch_depth -= 1
+            if not self.in_batch:
+                self.database.rollback()
+            raise
+
+        else:
+            self.__batch_depth -= 1
+            if not self.in_batch:
+                self.database.commit()
+
+    def commit(self):
+        if not self.in_batch:
+            self.database.commit()
+
     def has_tenant(self, tenantid):
         cursor = self.database.cursor()
         args = {
@@ -139,9 +400,15 @@ class SwiftServiceModel(base_model.BaseModel):
             'path': path
         }
         cursor.execute(SQL_INSERT_TENANT, args)
-        self.database.commit()
+        if cursor.rowcount == 1:
+            internal_tenant_id = cursor.lastrowid
+
+        else:
+            cursor.execute(SQL_UPDATE_TENANT, args)
+            internal_tenant_id = self.has_tenant(tenantid)
 
-        return self.has_tenant(tenantid)
+        self.commit()
+        return internal_tenant_id
 
     def get_tenant(self, internal_tenant_id):
         cursor = self.database.cursor()
@@ -160,7 +427,10 @@ class SwiftServiceModel(base_model.BaseModel):
         return {
             'id': result[0],
             'tenantid': result[1],
-            'path': result[2]
+            'path': result[2],
+            'container_count': result[3],
+            'object_count': result[4],
+            'bytes_used': result[5]
         }
 
     def has_container(self, internal_tenant_id, container_name):
@@ -185,10 +455,69 @@ class SwiftServiceModel(base_model.BaseModel):
             'container_name': container_name,
             'path': path
         }
-        cursor.execute(SQL_INSERT_CONTAINER, args)
-        self.database.commit()
+        with self.batch():
+            cursor.execute(SQL_INSERT_CONTAINER, args)
+            if cursor.rowcount == 1:
+                internal_container_id = cursor.lastrowid
+                self.update_usage(internal_tenant_id, containers=1)
+
+            else:
+                cursor.execute(SQL_UPDATE_CONTAINER, args)
+                internal_container_id = self.has_container(
+                    internal_tenant_id,
+                    container_name
+                )
 
-        return self.has_container(internal_tenant_id, container_name)
+        return internal_container_id
+
+    def update_usage(
+        self, internal_tenant_id, internal_container_id=None, containers=0,
+        objects=0, bytes_used=0
+    ):
+        """Apply a change in usage to a container and its tenant"""
+        cursor = self.database.cursor()
+        args = {
+            'tenantid': internal_tenant_id,
+            'containerid': internal_container_id,
+            'containers': containers,
+            'objects': objects,
+            'bytes': bytes_used
+        }
+        if internal_container_id is not None:
+            cursor.execute(SQL_UPDATE_CONTAINER_USAGE, args)
+
+        cursor.execute(SQL_UPDATE_TENANT_USAGE, args)
+        self.commit()
+
+    def list_containers(
+        self, internal_tenant_id, marker=None, end_marker=None, prefix=None,
+        start=None, limit=None
+    ):
+        """List a tenant's containers and their usage in name order"""
+        args = {
+            'tenantid': internal_tenant_id,
+            'limit': -1 if limit is None else limit
+        }
+        cursor = self.database.cursor()
+        cursor.execute(
+            SQL_LIST_CONTAINERS.format(
+                name_range_conditions(
+                    'container_name', args, marker=marker,
+                    end_marker=end_marker, prefix=prefix, start=start
+                )
+            ),
+            args
+        )
+        return [
+            {
+                'containerid': row[0],
+                'container_name': row[1],
+                'path': row[2],
+                'object_count': row[3],
+                'bytes_used': row[4]
+            }
+            for row in cursor.fetchall()
+        ]
 
     def get_container(self, internal_tenant_id, internal_container_id):
         cursor = self.database.cursor()
@@ -210,9 +539,37 @@ class SwiftServiceModel(base_model.BaseModel):
             'tenantid': result[0],
             'containerid': result[1],
             'container_name': result[2],
-            'path': result[3]
+            'path': result[3],
+            'object_count': result[4],
+            'bytes_used': result[5]
         }
 
+    def remove_container(self, internal_tenant_id, internal_container_id):
+        """Remove an empty container"""
+        cursor = self.database.cursor()
+        args = {
+            'tenantid': internal_tenant_id,
+            'containerid': internal_container_id
+        }
+        with self.batch():
+            cursor.execute(SQL_REMOVE_CONTAINER, args)
+            if cursor.rowcount == 1:
+                self.update_usage(internal_tenant_id, containers=-1)
+                return
+
+        container = self.get_container(
+            internal_tenant_id,
+            internal_container_id
+        )
+        raise exceptions.SwiftContainerNotEmptyError(
+            'Container {0} under internal tenant id {1} still has {2} '
+            'objects'.format(
+                container['container_name'],
+                internal_tenant_id,
+                container['object_count']
+            )
+        )
+
     def has_object(self, internal_tenant_id, internal_container_id,
                    object_name):
         cursor = self.database.cursor()
@@ -234,20 +591,65 @@ class SwiftServiceModel(base_model.BaseModel):
         return result[0]
 
     def add_object(self, internal_tenant_id, internal_container_id,
-                   object_name, path):
+                   object_name, path, size=0, blobid=None, delete_at=None):
+        """Add or replace an object"""
         cursor = self.database.cursor()
         args = {
             'tenantid': internal_tenant_id,
             'containerid': internal_container_id,
             'object_name': object_name,
-            'path': path
+            'path': path,
+            'bytes': size,
+            'blobid': blobid,
+            'delete_at': delete_at
         }
-        cursor.execute(SQL_INSERT_OBJECT, args)
-        self.database.commit()
+        with self.batch():
+            cursor.execute(SQL_INSERT_OBJECT, args)
+            if cursor.rowcount == 1:
+                internal_object_id = cursor.lastrowid
+                added_objects = 1
+                added_bytes = size
+
+            else:
+                internal_object_id = self.has_object(
+                    internal_tenant_id,
+                    internal_container_id,
+                    object_name
+                )
+                previous_object = self.get_object(
+                    internal_tenant_id,
+                    internal_container_id,
+                    internal_object_id
+                )
+                cursor.execute(SQL_UPDATE_OBJECT, args)
+                added_objects = 0
+                added_bytes = size - previous_object['bytes']
+                self.reference_blob(previous_object['blobid'], -1)
+
+            self.reference_blob(blobid, 1)
+            self.update_usage(
+                internal_tenant_id,
+                internal_container_id,
+                objects=added_objects,
+                bytes_used=added_bytes
+            )
 
-        return self.has_object(internal_tenant_id,
-                               internal_container_id,
-                               object_name)
+        return internal_object_id
+
+    def add_objects(self, objects):
+        with self.batch():
+            return [
+                self.add_object(
+                    object_info['tenantid'],
+                    object_info['containerid'],
+                    object_info['object_name'],
+                    object_info['path'],
+                    object_info.get('bytes', 0),
+                    object_info.get('blobid'),
+                    object_info.get('delete_at')
+                )
+                for object_info in objects
+            ]
 
     def get_object(
         self, internal_tenant_id, internal_container_id, internal_object_id
@@ -276,7 +678,98 @@ class SwiftServiceModel(base_model.BaseModel):
             'containerid': result[1],
             'objectid': result[2],
             'object_name': result[3],
-            'path': result[4]
+            'path': result[4],
+            'bytes': result[5],
+            'blobid': result[6]
+        }
+
+    def resolve_object(self, tenantid, container_name, object_name):
+        cursor = self.database.cursor()
+        args = {
+            'tenantid': tenantid,
+            'container_name': container_name,
+            'object_name': object_name
+        }
+        cursor.execute(SQL_RESOLVE_OBJECT, args)
+        result = cursor.fetchone()
+        if result is None:
+            raise exceptions.SwiftUnknownTenantError(
+                'Unknown tenant {0}'.format(tenantid)
+            )
+
+        if result[1] is None:
+            raise exceptions.SwiftUnknownContainerError(
+                'Unknown container {1} under tenant {0}'
+                .format(tenantid, container_name))
+
+        if result[2] is None:
+            raise exceptions.SwiftUnknownObjectError(
+                'Unknown object {2} in container {1} under tenant {0}'
+                .format(tenantid, container_name, object_name))
+
+        return {
+            'tenantid': result[0],
+            'containerid': result[1],
+            'objectid': result[2],
+            'object_name': result[3],
+            'path': result[4],
+            'bytes': result[5],
+            'blobid': result[6]
+        }
+
+    def list_objects(
+        self, internal_tenant_id, internal_container_id, marker=None,
+        end_marker=None, prefix=None, start=None, limit=None
+    ):
+        """List a container's objects in name order"""
+        args = {
+            'tenantid': internal_tenant_id,
+            'containerid': internal_container_id,
+            'limit': -1 if limit is None else limit
+        }
+        cursor = self.database.cursor()
+        cursor.execute(
+            SQL_LIST_OBJECTS.format(
+                name_range_conditions(
+                    'object_name', args, marker=marker,
+                    end_marker=end_marker, prefix=prefix, start=start
+                )
+            ),
+            args
+        )
+        return [
+            {
+                'objectid': row[0],
+                'object_name': row[1],
+                'path': row[2],
+                'bytes': row[3]
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def get_last_object(self, internal_tenant_id, internal_container_id,
+                        prefix=None):
+        """Find the container's last object in name order"""
+        args = {
+            'tenantid': internal_tenant_id,
+            'containerid': internal_container_id
+        }
+        cursor = self.database.cursor()
+        cursor.execute(
+            SQL_GET_LAST_OBJECT.format(
+                name_range_conditions('object_name', args, prefix=prefix)
+            ),
+            args
+        )
+        result = cursor.fetchone()
+        if result is None:
+            return None
+
+        return {
+            'objectid': result[0],
+            'object_name': result[1],
+            'path': result[2],
+            'bytes': result[3]
         }
 
     def remove_object(self, internal_tenant_id, internal_container_id,
@@ -287,5 +780,111 @@ class SwiftServiceModel(base_model.BaseModel):
             'containerid': internal_container_id,
             'objectid': internal_object_id,
         }
-        cursor.execute(SQL_REMOVE_DELETE, args)
-        self.database.commit()
+        cursor.execute(SQL_GET_OBJECT, args)
+        result = cursor.fetchone()
+        if result is None:
+            return
+
+        with self.batch():
+            cursor.execute(SQL_REMOVE_DELETE, args)
+            self.reference_blob(result[6], -1)
+            self.update_usage(
+                internal_tenant_id,
+                internal_container_id,
+                objects=-1,
+                bytes_used=-result[5]
+            )
+
+    def set_object_delete_at(self, internal_tenant_id, internal_container_id,
+                             internal_object_id, delete_at):
+        cursor = self.database.cursor()
+        args = {
+            'tenantid': internal_tenant_id,
+            'containerid': internal_container_id,
+            'objectid': internal_object_id,
+            'delete_at': delete_at
+        }
+        cursor.execute(SQL_UPDATE_OBJECT_DELETE_AT, args)
+        self.commit()
+
+    def get_next_delete_at(self):
+        """Find when the next object expires"""
+        cursor = self.database.cursor()
+        cursor.execute(SQL_GET_NEXT_DELETE_AT)
+        return cursor.fetchone()[0]
+
+    def list_expired_objects(self, now, limit=None):
+        """List the objects that have expired by now, earliest first"""
+        cursor = self.database.cursor()
+        args = {
+            'now': now,
+            'limit': -1 if limit is None else limit
+        }
+        cursor.execute(SQL_LIST_EXPIRED_OBJECTS, args)
+        return [
+            (tenantid, container_name, object_name)
+            for tenantid, container_name, object_name, delete_at
+            in cursor.fetchall()
+        ]
+
+    def add_blob(self, etag, path, size=0):
+        """Add a blob of object data with no references"""
+        cursor = self.database.cursor()
+        args = {
+            'etag': etag,
+            'path': path,
+            'bytes': size
+        }
+        cursor.execute(SQL_INSERT_BLOB, args)
+        if cursor.rowcount == 1:
+            blobid = cursor.lastrowid
+
+        else:
+            blobid = self.get_blob(etag)['blobid']
+
+        self.commit()
+        return blobid
+
+    def get_blob(self, etag):
+        cursor = self.database.cursor()
+        args = {
+            'etag': etag
+        }
+        cursor.execute(SQL_GET_BLOB, args)
+        result = cursor.fetchone()
+        if result is None:
+            raise exceptions.SwiftUnknownBlobError(
+                'Unknown blob with etag {0}'.format(etag)
+            )
+
+        return {
+            'blobid': result[0],
+            'etag': result[1],
+            'path': result[2],
+            'bytes': result[3],
+            'refcount': result[4]
+        }
+
+    def reference_blob(self, blobid, references):
+        """Add to, or with a negative count take from, a blob's references"""
+        if blobid is None:
+            return
+
+        cursor = self.database.cursor()
+        args = {
+            'blobid': blobid,
+            'references': references
+        }
+        cursor.execute(SQL_UPDATE_BLOB_REFERENCES, args)
+        self.commit()
+
+    def remove_unreferenced_blobs(self):
+        """Remove the blobs no object refers to any more"""
+        cursor = self.database.cursor()
+        with self.batch():
+            cursor.execute(SQL_LIST_UNREFERENCED_BLOBS)
+            blobs = cursor.fetchall()
+            for blobid, path in blobs:
+                cursor.execute(SQL_REMOVE_BLOB, {'blobid': blobid})
+
+        return [path for blobid, path in blobs]
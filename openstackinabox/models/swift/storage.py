@@ -1,21 +1,52 @@
 """
 """
+import concurrent.futures
+import email.utils
+import functools
 import hashlib
 import io
+import json
 import logging
-import os
 import os.path
+import time
 
 import six
 from stackinabox.util.tools import CaseInsensitiveDict
 
-from openstackinabox.utils.directory import TemporaryDirectory
-
+from openstackinabox.models.swift import backends
+from openstackinabox.models.swift import cache
 from openstackinabox.models.swift import exceptions
+from openstackinabox.models.swift import streams
+from openstackinabox.models.swift.model import get_name_successor
 
 
 LOG = logging.getLogger(__name__)
 
+LISTING_PAGE_SIZE = 1000
+
+# Object data layouts:
+#   flat - <tenant>/<container>/<object name>, each name percent-encoded
+#          into a single path component
+#   hashed - objects/<h[0:2]>/<h[2:4]>/<h>, h being the MD5 of the object's
+#            tenant, container and name
+LAYOUT_FLAT = 'flat'
+LAYOUT_HASHED = 'hashed'
+LAYOUTS = (LAYOUT_FLAT, LAYOUT_HASHED)
+
+# Swift's limit on static large objects nested in one another
+MANIFEST_DEPTH_LIMIT = 10
+
+# Number of expired objects removed per transaction by the reaper
+REAP_BATCH_SIZE = 1000
+
+# Container versioning modes, named after the metadata that enables them:
+#   stack - X-Versions-Location; overwrites are archived and deleting an
+#           object restores its latest archived version
+#   history - X-History-Location; overwrites and deletes are archived
+VERSIONS_STACK = 'x-versions-location'
+VERSIONS_HISTORY = 'x-history-location'
+VERSIONS_MODES = (VERSIONS_STACK, VERSIONS_HISTORY)
+
 
 class SwiftStorage(object):
 
@@ -27,20 +58,97 @@ class SwiftStorage(object):
         return etag_generator.hexdigest()
 
     @staticmethod
-    def get_file_etag(file_name):
+    def get_file_etag(file_name, chunk_size=streams.DEFAULT_CHUNK_SIZE):
+        return backends.SwiftFilesystemBackend.get_file_etag(
+            file_name,
+            chunk_size
+        )
+
+    @staticmethod
+    def get_path_name(name):
+        """Encode a tenant, container or object name as one path component"""
+        path_name = six.moves.urllib.parse.quote(name, safe='')
+        if path_name in ('.', '..'):
+            path_name = path_name.replace('.', '%2E')
+
+        return path_name
+
+    @staticmethod
+    def get_last_modified():
+        return email.utils.formatdate(time.time(), usegmt=True)
+
+    @staticmethod
+    def get_listing_time(last_modified):
+        """Format a Last-Modified date the way Swift's listings do"""
+        try:
+            modified = email.utils.parsedate_to_datetime(last_modified)
+
+        except (TypeError, ValueError):
+            return None
+
+        return modified.strftime('%Y-%m-%dT%H:%M:%S.%f')
+
+    @staticmethod
+    def is_static_manifest(metadata):
+        return metadata.get('x-static-large-object', '').lower() == 'true'
+
+    @staticmethod
+    def get_manifest_etag(segments):
         etag_generator = hashlib.md5()
-        with open(file_name, 'rb') as input_data:
-            for chunk in input_data:
-                etag_generator.update(chunk)
+        for segment in segments:
+            etag_generator.update(segment['hash'].encode('utf-8'))
 
         return etag_generator.hexdigest()
 
-    def __init__(self, service_id, model):
+    @staticmethod
+    def get_delete_at(metadata):
+        """Get when an object expires from its X-Delete-At metadata"""
+        try:
+            return int(metadata['x-delete-at'])
+
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def get_version_prefix(object_name):
+        # Swift's archive names are <name length, 3 hex digits><name>/<time>;
+        # '-' replaces the '/' as the last '/' of a request path starts the
+        # object name, which would leave the archives unaddressable
+        return '{0:03x}{1}-'.format(
+            len(object_name.encode('utf-8')),
+            object_name
+        )
+
+    @staticmethod
+    def get_source_file(content):
+        return backends.SwiftFilesystemBackend.get_source_file(content)
+
+    def __init__(
+        self, service_id, model, chunk_size=streams.DEFAULT_CHUNK_SIZE,
+        mmap_threshold=None, cache_size=None, layout=LAYOUT_FLAT,
+        backend=None, dedup=False
+    ):
+        if layout not in LAYOUTS:
+            raise ValueError('Unknown storage layout {0}'.format(layout))
+
         self.__id = service_id
         self.__model = model
-        self.__storage = TemporaryDirectory()
+        self.__layout = layout
+        self.__dedup = dedup
+        self.__chunk_size = chunk_size
+        self.__mmap_threshold = mmap_threshold
+        self.__cache = None
+        self.cache_size = cache_size
+        self.__backend = (
+            backend
+            if backend is not None
+            else backends.SwiftFilesystemBackend()
+        )
         self.__metadata_information = {}
         self.__custom_metadata = {}
+        self.__container_metadata = {}
+        self.__manifests = {}
+        self.__next_delete_at = None
 
     @property
     def model(self):
@@ -50,13 +158,49 @@ class SwiftStorage(object):
     def model(self, value):
         self.__model = value
 
+    @property
+    def layout(self):
+        return self.__layout
+
+    @property
+    def dedup(self):
+        return self.__dedup
+
+    @property
+    def chunk_size(self):
+        return self.__chunk_size
+
+    @property
+    def mmap_threshold(self):
+        return self.__mmap_threshold
+
+    @mmap_threshold.setter
+    def mmap_threshold(self, value):
+        self.__mmap_threshold = value
+
+    @property
+    def cache(self):
+        return self.__cache
+
+    @property
+    def cache_size(self):
+        return self.cache.max_size if self.cache is not None else None
+
+    @cache_size.setter
+    def cache_size(self, value):
+        self.__cache = cache.SwiftPathCache(value) if value else None
+
+    @property
+    def backend(self):
+        return self.__backend
+
     @property
     def storage(self):
-        return self.__storage
+        return self.backend.storage
 
     @property
     def location(self):
-        return self.storage.name
+        return self.backend.location
 
     @property
     def metadata(self):
@@ -66,36 +210,75 @@ class SwiftStorage(object):
     def custom_metadata(self):
         return self.__custom_metadata
 
+    @property
+    def container_metadata(self):
+        return self.__container_metadata
+
+    @property
+    def manifests(self):
+        return self.__manifests
+
+    @property
+    def next_delete_at(self):
+        """Earliest time any object may expire, or None"""
+        # may be earlier than the real next expiry; the reaper corrects it
+        return self.__next_delete_at
+
     def get_tenant_path(self, tenantid):
-        return '{0}/{1}'.format(self.location, tenantid)
+        return '{0}/{1}'.format(self.location, self.get_path_name(tenantid))
 
     def get_container_path(self, tenantid, container_name):
         return '{0}/{1}'.format(
             self.get_tenant_path(tenantid),
-            container_name
+            self.get_path_name(container_name)
         )
 
-    def get_object_path(self, tenantid, container_name, object_name):
-        try:
-            intTenantId = self.model.has_tenant(tenantid)
-            intContainerId = self.model.has_container(
-                intTenantId,
-                container_name
+    def get_new_object_path(self, tenantid, container_name, object_name):
+        if self.layout == LAYOUT_HASHED:
+            # the logical name only lives in the model, so any object name
+            # maps onto a bounded directory of fixed length file names
+            name_hash = hashlib.md5(
+                u'\0'.join(
+                    (tenantid, container_name, object_name)
+                ).encode('utf-8')
+            ).hexdigest()
+            return '{0}/objects/{1}/{2}/{3}'.format(
+                self.location,
+                name_hash[:2],
+                name_hash[2:4],
+                name_hash
             )
 
-            intObjectId = self.model.has_object(
-                intTenantId,
-                intContainerId,
-                object_name
-            )
+        return '{0}/{1}'.format(
+            self.get_container_path(tenantid, container_name),
+            self.get_path_name(object_name)
+        )
 
-            object_info = self.model.get_object(
-                intTenantId,
-                intContainerId,
-                intObjectId
-            )
+    def get_blob_path(self, etag):
+        return '{0}/.blobs/{1}/{2}/{3}'.format(
+            self.location,
+            etag[:2],
+            etag[2:4],
+            etag
+        )
+
+    def invalidate_object(self, tenantid, container_name, object_name):
+        if self.cache is not None:
+            self.cache.invalidate((tenantid, container_name, object_name))
 
-            return object_info['path']
+    def resolve_object(self, tenantid, container_name, object_name):
+        key = (tenantid, container_name, object_name)
+        if self.cache is not None:
+            object_info = self.cache.get(key)
+            if object_info is not None:
+                return object_info
+
+        try:
+            object_info = self.model.resolve_object(
+                tenantid,
+                container_name,
+                object_name
+            )
 
         except (
             exceptions.SwiftUnknownTenantError,
@@ -103,13 +286,25 @@ class SwiftStorage(object):
             exceptions.SwiftUnknownObjectError
         ):
             LOG.exception(
-                'Swift Service ({0}): Failed to retrieved path for Object '
-                '{3} in Container {2} for Tenant {1}'.format(
+                'Swift Service ({0}): Failed to resolve Object {3} in '
+                'Container {2} for Tenant {1}'.format(
                     self.__id, tenantid, container_name, object_name
                 )
             )
             raise
 
+        if self.cache is not None:
+            self.cache.put(key, object_info)
+
+        return object_info
+
+    def get_object_path(self, tenantid, container_name, object_name):
+        return self.resolve_object(
+            tenantid,
+            container_name,
+            object_name
+        )['path']
+
     def add_tenant(self, tenantid):
         LOG.debug(
             'Swift Service ({0}): Checking if Tenant {1} exists...'.format(
@@ -133,14 +328,14 @@ class SwiftStorage(object):
             )
             intTenantId = self.model.add_tenant(tenantid, path)
 
-        if not os.path.exists(path):
+        if not self.backend.exists(path):
             LOG.debug(
                 'SwiftService ({0}): Creating path for Tenant {1} at '
                 '{2}'.format(
                     self.__id, tenantid, path
                 )
             )
-            os.mkdir(path)
+            self.backend.make_directory(path)
 
         return intTenantId
 
@@ -149,7 +344,7 @@ class SwiftStorage(object):
             intTenantId = self.model.has_tenant(tenantid)
 
             tenant_info = self.model.get_tenant(intTenantId)
-            return os.path.exists(tenant_info['path'])
+            return self.backend.exists(tenant_info['path'])
 
         except Exception:
             LOG.exception(
@@ -192,14 +387,14 @@ class SwiftStorage(object):
             path
         )
 
-        if not os.path.exists(path):
+        if not self.backend.exists(path):
             LOG.debug(
                 'SwiftService ({0}): Adding Container {2} for Tenant {1} at '
                 'path {3}'.format(
                     self.__id, tenantid, container_name, path
                 )
             )
-            os.mkdir(path)
+            self.backend.make_directory(path)
 
         return (intTenantId, intContainerId)
 
@@ -215,7 +410,7 @@ class SwiftStorage(object):
                 intContainerId
             )
             path = container_info['path']
-            return os.path.exists(path)
+            return self.backend.exists(path)
 
         except Exception:
             LOG.exception(
@@ -244,26 +439,141 @@ class SwiftStorage(object):
             )
             return (None, None)
 
-    def has_object(self, tenantid, container_name, object_name):
-        try:
-            intTenantId = self.model.has_tenant(tenantid)
-            intContainerId = self.model.has_container(
-                intTenantId,
-                container_name
+    @staticmethod
+    def paged_listing(
+        list_rows, name_key, make_entry, marker=None, end_marker=None,
+        limit=None, prefix=None, delimiter=None
+    ):
+        """Build a listing from pages of name ordered model rows"""
+        prefix = prefix or ''
+        listing = []
+        start = None
+        while limit is None or len(listing) < limit:
+            page_size = (
+                LISTING_PAGE_SIZE if limit is None else limit - len(listing)
             )
-            intObjectId = self.model.has_object(
-                intTenantId,
-                intContainerId,
-                object_name
+            rows = list_rows(
+                marker=marker,
+                end_marker=end_marker,
+                prefix=prefix,
+                start=start,
+                limit=page_size
             )
-            object_info = self.model.get_object(
+            for row in rows:
+                name = row[name_key]
+                index = (
+                    name.find(delimiter, len(prefix)) if delimiter else -1
+                )
+                if index >= 0:
+                    subdir = name[:index + len(delimiter)]
+                    if not marker or subdir > marker:
+                        listing.append({'subdir': subdir})
+
+                    # skip every remaining name under the subdir
+                    start = get_name_successor(subdir)
+                    if start is None:
+                        return listing
+
+                    break
+
+                listing.append(make_entry(row))
+                if limit is not None and len(listing) >= limit:
+                    break
+
+            else:
+                if len(rows) < page_size:
+                    break
+
+                marker = rows[-1][name_key]
+                start = None
+
+        return listing
+
+    def list_objects(
+        self, tenantid, container_name, marker=None, end_marker=None,
+        limit=None, prefix=None, delimiter=None
+    ):
+        """List the objects in a container"""
+        intTenantId = self.model.has_tenant(tenantid)
+        intContainerId = self.model.has_container(intTenantId, container_name)
+
+        def list_rows(**kwargs):
+            return self.model.list_objects(
                 intTenantId,
                 intContainerId,
-                intObjectId
+                **kwargs
             )
 
-            path = object_info['path']
-            return os.path.exists(path)
+        def make_entry(row):
+            metadata = self.metadata.get(row['path'], {})
+            return {
+                'name': row['object_name'],
+                'hash': metadata.get('etag'),
+                'bytes': row['bytes'],
+                'content_type': metadata.get('content-type'),
+                'last_modified': self.get_listing_time(
+                    metadata.get('last-modified')
+                )
+            }
+
+        return self.paged_listing(
+            list_rows, 'object_name', make_entry, marker=marker,
+            end_marker=end_marker, limit=limit, prefix=prefix,
+            delimiter=delimiter
+        )
+
+    def list_containers(
+        self, tenantid, marker=None, end_marker=None, limit=None, prefix=None,
+        delimiter=None
+    ):
+        """List the containers of a tenant"""
+        intTenantId = self.model.has_tenant(tenantid)
+
+        def list_rows(**kwargs):
+            return self.model.list_containers(intTenantId, **kwargs)
+
+        def make_entry(row):
+            return {
+                'name': row['container_name'],
+                'count': row['object_count'],
+                'bytes': row['bytes_used']
+            }
+
+        return self.paged_listing(
+            list_rows, 'container_name', make_entry, marker=marker,
+            end_marker=end_marker, limit=limit, prefix=prefix,
+            delimiter=delimiter
+        )
+
+    def get_account_usage(self, tenantid):
+        """Retrieve a tenant's usage counters"""
+        tenant_info = self.model.get_tenant(self.model.has_tenant(tenantid))
+        return {
+            'container_count': tenant_info['container_count'],
+            'object_count': tenant_info['object_count'],
+            'bytes_used': tenant_info['bytes_used']
+        }
+
+    def get_container_usage(self, tenantid, container_name):
+        """Retrieve a container's usage counters"""
+        intTenantId = self.model.has_tenant(tenantid)
+        container_info = self.model.get_container(
+            intTenantId,
+            self.model.has_container(intTenantId, container_name)
+        )
+        return {
+            'object_count': container_info['object_count'],
+            'bytes_used': container_info['bytes_used']
+        }
+
+    def has_object(self, tenantid, container_name, object_name):
+        try:
+            object_info = self.resolve_object(
+                tenantid,
+                container_name,
+                object_name
+            )
+            return self.backend.exists(object_info['path'])
 
         except Exception:
             LOG.exception(
@@ -276,7 +586,7 @@ class SwiftStorage(object):
 
     def load_object_from_file(
         self, tenantid, container_name, object_name, file_name, file_size=None,
-        allow_file_size_mismatch=False
+        allow_file_size_mismatch=False, link=False
     ):
         LOG.debug(
             'Swift Service ({0}): Checking that tenant {1} has container '
@@ -300,18 +610,19 @@ class SwiftStorage(object):
             else os.path.getsize(file_name)
         )
 
+        # the etag is computed by store_object while the data is copied
         metadata = CaseInsensitiveDict()
         metadata.update(
             {
                 'content-length': str(actual_file_size),
                 'content-type': 'application/binary',
-                'etag': self.get_file_etag(file_name)
             }
         )
         with open(file_name, 'rb') as content:
             self.store_object(
                 tenantid, container_name, object_name, content,
-                metadata, actual_file_size, allow_file_size_mismatch
+                metadata, actual_file_size, allow_file_size_mismatch,
+                link=link
             )
 
     def load_object(
@@ -348,7 +659,155 @@ class SwiftStorage(object):
         })
         self.store_object(
             tenantid, container_name, object_name, content, metadata,
-            actual_file_size, allow_file_size_mismatch
+            actual_file_size, allow_file_size_mismatch,
+            content_etag=metadata['etag']
+        )
+
+    def load_objects(self, objects, workers=None):
+        """Bulk load objects"""
+        objects = list(objects)
+        containers = {}
+        for object_spec in objects:
+            container_key = (
+                object_spec['tenantid'],
+                object_spec['container_name']
+            )
+            if container_key not in containers:
+                if self.has_container(*container_key):
+                    containers[container_key] = self.get_container(
+                        *container_key
+                    )
+
+                else:
+                    containers[container_key] = self.add_container(
+                        *container_key
+                    )
+
+        def write_object(object_spec, path):
+            if 'file_name' in object_spec:
+                with open(object_spec['file_name'], 'rb') as content:
+                    return self.write_object_data(
+                        path, content, link=object_spec.get('link', False)
+                    )
+
+            return self.write_object_data(path, object_spec.get('content'))
+
+        def get_content_etag(object_spec):
+            # only in-memory content can be hashed before it is written
+            content = object_spec.get('content')
+            if self.dedup and isinstance(
+                content, (six.binary_type, bytearray)
+            ):
+                return self.get_etag(content)
+
+            return None
+
+        LOG.debug(
+            'Swift Service ({0}): Bulk loading {1} objects'.format(
+                self.__id, len(objects)
+            )
+        )
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers
+        ) as executor:
+            jobs = []
+            written_etags = set()
+            for object_spec in objects:
+                path = self.get_new_object_path(
+                    object_spec['tenantid'],
+                    object_spec['container_name'],
+                    object_spec['object_name']
+                )
+                etag = get_content_etag(object_spec)
+                blob = self.find_blob(etag) if etag is not None else None
+                job = None
+                if blob is None and etag not in written_etags:
+                    job = executor.submit(write_object, object_spec, path)
+                    if etag is not None:
+                        written_etags.add(etag)
+
+                jobs.append((object_spec, path, etag, blob, job))
+
+            results = []
+            for object_spec, path, etag, blob, job in jobs:
+                if blob is not None:
+                    self.link_object_data(blob['path'], path)
+                    results.append(
+                        (object_spec, path, blob['etag'], blob['bytes'],
+                         blob['blobid'])
+                    )
+
+                elif job is None:
+                    # shares the data of an earlier object in the batch
+                    # once that has been stored
+                    results.append(
+                        (object_spec, path, etag,
+                         len(object_spec['content']), None)
+                    )
+
+                else:
+                    etag, size = job.result()
+                    results.append(
+                        (object_spec, path, etag, size, None)
+                    )
+
+        model_objects = []
+        object_metadata = {}
+        last_modified = self.get_last_modified()
+        for object_spec, path, etag, size, blobid in results:
+            if self.dedup and blobid is None:
+                blobid = self.share_object_data(path, etag, size)
+
+            intTenantId, intContainerId = containers[(
+                object_spec['tenantid'],
+                object_spec['container_name']
+            )]
+            model_objects.append({
+                'tenantid': intTenantId,
+                'containerid': intContainerId,
+                'object_name': object_spec['object_name'],
+                'path': path,
+                'bytes': size,
+                'blobid': blobid,
+                'delete_at': object_spec.get('delete_at')
+            })
+
+            metadata = CaseInsensitiveDict()
+            metadata.update({
+                'content-length': str(size),
+                'content-type': object_spec.get(
+                    'content_type', 'application/binary'
+                ),
+                'etag': etag,
+                'last-modified': last_modified,
+                'x-y-object-disk-path': path
+            })
+            if object_spec.get('delete_at') is not None:
+                metadata['x-delete-at'] = str(object_spec['delete_at'])
+                self.schedule_delete_at(object_spec['delete_at'])
+
+            object_metadata[path] = metadata
+
+        self.model.add_objects(model_objects)
+        if self.dedup:
+            self.remove_unreferenced_blobs()
+
+        self.metadata.update(object_metadata)
+        for path in object_metadata:
+            self.custom_metadata.pop(path, None)
+            self.manifests.pop(path, None)
+
+        for object_spec in objects:
+            self.invalidate_object(
+                object_spec['tenantid'],
+                object_spec['container_name'],
+                object_spec['object_name']
+            )
+
+        LOG.debug(
+            'Swift Service ({0}): Bulk loaded {1} objects'.format(
+                self.__id, len(objects)
+            )
         )
 
     def update_object_etag(
@@ -406,10 +865,75 @@ class SwiftStorage(object):
         if path in self.custom_metadata:
             del self.custom_metadata[path]
 
-    def store_object(
-        self, tenantid, container_name, object_name, content, metadata,
-        file_size=None, allow_file_size_mismatch=False
-    ):
+    def write_object_data(self, path, content, link=False,
+                          expected_etag=None):
+        """Write object data to path, computing its etag in the same pass"""
+        self.make_object_directory(path)
+        return self.backend.write(
+            path,
+            content,
+            link=link,
+            expected_etag=expected_etag,
+            chunk_size=self.chunk_size
+        )
+
+    def find_blob(self, etag):
+        try:
+            return self.model.get_blob(etag)
+
+        except exceptions.SwiftUnknownBlobError:
+            return None
+
+    def make_object_directory(self, path):
+        # hashed paths live in fan-out directories that may not exist yet,
+        # flat ones in their container's directory
+        directory = os.path.dirname(path)
+        if self.layout == LAYOUT_HASHED or not self.backend.exists(directory):
+            self.backend.make_directory(directory, parents=True)
+
+    def link_object_data(self, blob_path, path):
+        self.make_object_directory(path)
+        self.backend.link(blob_path, path)
+
+    def share_object_data(self, path, etag, size):
+        """Deduplicate the data just written to path"""
+        blob = self.find_blob(etag)
+        if blob is not None:
+            LOG.debug(
+                'Swift Service ({0}): Sharing data of {1} with blob '
+                '{2}'.format(
+                    self.__id, path, blob['path']
+                )
+            )
+            self.link_object_data(blob['path'], path)
+            return blob['blobid']
+
+        blob_path = self.get_blob_path(etag)
+        self.backend.make_directory(os.path.dirname(blob_path), parents=True)
+        self.backend.link(path, blob_path)
+        return self.model.add_blob(etag, blob_path, size)
+
+    def remove_unreferenced_blobs(self):
+        for blob_path in self.model.remove_unreferenced_blobs():
+            LOG.debug(
+                'Swift Service ({0}): Removing unreferenced blob {1}'.format(
+                    self.__id, blob_path
+                )
+            )
+            try:
+                self.backend.remove(blob_path)
+
+            except OSError:
+                LOG.exception(
+                    'Swift Service ({0}): blob data already missing'.format(
+                        self.__id
+                    )
+                )
+
+    def get_object_destination(self, tenantid, container_name, object_name):
+        """Prepare to store an object, adding its container if need be"""
+        self.archive_object(tenantid, container_name, object_name)
+
         path = None
         if self.has_container(tenantid, container_name):
             intTenantId, intContainerId = self.get_container(
@@ -433,9 +957,8 @@ class SwiftStorage(object):
         ):
 
             # no way it can already have the object...
-            path = '{0}/{1}'.format(
-                self.get_container_path(tenantid, container_name),
-                object_name
+            path = self.get_new_object_path(
+                tenantid, container_name, object_name
             )
 
         LOG.debug(
@@ -445,7 +968,58 @@ class SwiftStorage(object):
             )
         )
 
-        self.model.add_object(intTenantId, intContainerId, object_name, path)
+        return (intTenantId, intContainerId, path)
+
+    def store_object(
+        self, tenantid, container_name, object_name, content, metadata,
+        file_size=None, allow_file_size_mismatch=False, link=False,
+        verify_etag=False, content_etag=None
+    ):
+        """Store an object's data and metadata"""
+        intTenantId, intContainerId, path = self.get_object_destination(
+            tenantid,
+            container_name,
+            object_name
+        )
+
+        expected_etag = metadata.get('etag') if verify_etag else None
+        blob = (
+            self.find_blob(content_etag)
+            if self.dedup and content_etag is not None
+            else None
+        )
+        if blob is not None:
+            backends.check_etag(blob['etag'], expected_etag)
+            self.link_object_data(blob['path'], path)
+            etag = blob['etag']
+            stored_size = blob['bytes']
+            blobid = blob['blobid']
+
+        else:
+            etag, stored_size = self.write_object_data(
+                path,
+                content,
+                link=link,
+                expected_etag=expected_etag
+            )
+            blobid = (
+                self.share_object_data(path, etag, stored_size)
+                if self.dedup
+                else None
+            )
+
+        delete_at = self.get_delete_at(metadata)
+        self.model.add_object(
+            intTenantId, intContainerId, object_name, path, stored_size,
+            blobid, delete_at
+        )
+        self.schedule_delete_at(delete_at)
+        self.invalidate_object(tenantid, container_name, object_name)
+        # metadata POSTed to the object it replaces must not carry over
+        self.custom_metadata.pop(path, None)
+        self.manifests.pop(path, None)
+        if self.dedup:
+            self.remove_unreferenced_blobs()
 
         LOG.debug(
             'Swift Service ({0}): Added object {1}/{2}/{3}:{4} to model'
@@ -453,14 +1027,17 @@ class SwiftStorage(object):
                 self.__id, path, tenantid, container_name, object_name
             )
         )
+        if 'etag' not in metadata:
+            metadata['etag'] = etag
 
-        with open(path, 'wb') as object_file:
-            if content:
-                object_file.write(content)
-
-            object_file.flush()
+        if 'content-length' not in metadata:
+            metadata['content-length'] = str(stored_size)
 
-        LOG.debug('Swift Service ({0}): object data stored'.format(self.__id))
+        LOG.debug(
+            'Swift Service ({0}): object data stored with etag {1}'.format(
+                self.__id, etag
+            )
+        )
 
         for k, v in six.iteritems(metadata):
             LOG.debug(
@@ -470,7 +1047,7 @@ class SwiftStorage(object):
             )
 
         if file_size is None:
-            file_size = os.path.getsize(path)
+            file_size = stored_size
 
         LOG.debug(
             'Swift Service ({0}): object has disk size of {1} bytes'.format(
@@ -507,6 +1084,7 @@ class SwiftStorage(object):
                     )
                 )
 
+        metadata['last-modified'] = self.get_last_modified()
         metadata['x-y-object-disk-path'] = path
 
         for k, v in six.iteritems(metadata):
@@ -518,54 +1096,317 @@ class SwiftStorage(object):
         self.metadata[path] = metadata
         LOG.debug('Swift Service ({0}): Metadata stored'.format(self.__id))
 
-    def retrieve_object(self, tenantid, container_name, object_name):
-        if self.has_object(tenantid, container_name, object_name):
-            metadata = CaseInsensitiveDict()
-            path = self.get_object_path(
+    def copy_object(
+        self, tenantid, container_name, object_name, dest_tenantid,
+        dest_container_name, dest_object_name, metadata=None,
+        fresh_metadata=False
+    ):
+        """Copy an object without reading or rewriting its data"""
+        try:
+            source_info = self.resolve_object(
                 tenantid,
                 container_name,
                 object_name
             )
-            if path in self.metadata:
-                metadata.update(self.metadata[path])
 
-            custom_metadata = self.retrieve_custom_metadata(
-                tenantid, container_name, object_name
+        except (
+            exceptions.SwiftUnknownTenantError,
+            exceptions.SwiftUnknownContainerError,
+            exceptions.SwiftUnknownObjectError
+        ):
+            LOG.debug('Swift Service ({0}): No object.'.format(self.__id))
+            return None
+
+        source_path = source_info['path']
+        if not self.backend.exists(source_path):
+            LOG.debug(
+                'Swift Service ({0}): No data for object at {1}'.format(
+                    self.__id, source_path
+                )
             )
-            for k, v in six.iteritems(custom_metadata):
-                LOG.debug(
-                    'Swift Service ({0}): Custom Metadata[{1}] = {2} with '
-                    'type {3}'.format(
-                        self.__id, k, v, type(v)
+            return None
+
+        copied_metadata = CaseInsensitiveDict()
+        for k, v in six.iteritems(self.get_object_metadata(source_path)):
+            if not (
+                fresh_metadata and k.lower().startswith('x-object-meta-')
+            ):
+                copied_metadata[k] = v
+
+        intTenantId, intContainerId, path = self.get_object_destination(
+            dest_tenantid,
+            dest_container_name,
+            dest_object_name
+        )
+        LOG.debug(
+            'Swift Service ({0}): Copying object data from {1} to {2}'.format(
+                self.__id, source_path, path
+            )
+        )
+        if path != source_path:
+            self.link_object_data(source_path, path)
+
+        if metadata:
+            copied_metadata.update(metadata)
+
+        delete_at = self.get_delete_at(copied_metadata)
+        self.model.add_object(
+            intTenantId, intContainerId, dest_object_name, path,
+            source_info['bytes'], source_info['blobid'], delete_at
+        )
+        self.schedule_delete_at(delete_at)
+        self.invalidate_object(
+            dest_tenantid,
+            dest_container_name,
+            dest_object_name
+        )
+        if self.dedup:
+            self.remove_unreferenced_blobs()
+
+        copied_metadata['last-modified'] = self.get_last_modified()
+        copied_metadata['x-y-object-disk-path'] = path
+        self.metadata[path] = copied_metadata
+        self.custom_metadata.pop(path, None)
+        self.manifests.pop(path, None)
+        return copied_metadata
+
+    def store_manifest(
+        self, tenantid, container_name, object_name, segments, metadata
+    ):
+        """Store a static large object manifest"""
+        content = json.dumps([
+            {
+                'name': '/{0}/{1}'.format(
+                    segment['container'],
+                    segment['object']
+                ),
+                'hash': segment['hash'],
+                'bytes': segment['bytes']
+            }
+            for segment in segments
+        ]).encode('utf-8')
+
+        metadata['etag'] = self.get_manifest_etag(segments)
+        metadata['content-length'] = str(
+            sum(segment['bytes'] for segment in segments)
+        )
+        metadata['x-static-large-object'] = 'True'
+        self.store_object(
+            tenantid, container_name, object_name, content, metadata,
+            allow_file_size_mismatch=True
+        )
+        self.manifests[metadata['x-y-object-disk-path']] = list(segments)
+
+    def get_manifest_segments(self, tenantid, metadata):
+        """Look up the segments of a static or dynamic large object"""
+        path = metadata.get('x-y-object-disk-path')
+        if self.is_static_manifest(metadata):
+            segments = self.manifests.get(path)
+            if segments is None:
+                segments = []
+                for entry in json.loads(
+                    bytes(self.backend.read(path)).decode('utf-8')
+                ):
+                    segment_container, _, segment_object = (
+                        entry['name'].lstrip('/').rpartition('/')
                     )
+                    segments.append({
+                        'container': segment_container,
+                        'object': segment_object,
+                        'hash': entry['hash'],
+                        'bytes': entry['bytes']
+                    })
+
+                self.manifests[path] = segments
+
+            return segments
+
+        if metadata.get('x-object-manifest'):
+            container_name, _, prefix = six.moves.urllib.parse.unquote(
+                metadata['x-object-manifest']
+            ).lstrip('/').rpartition('/')
+            try:
+                listing = self.list_objects(
+                    tenantid,
+                    container_name,
+                    prefix=prefix
+                )
+
+            except (
+                exceptions.SwiftUnknownTenantError,
+                exceptions.SwiftUnknownContainerError
+            ):
+                listing = []
+
+            return [
+                {
+                    'container': container_name,
+                    'object': entry['name'],
+                    'hash': entry['hash'],
+                    'bytes': entry['bytes']
+                }
+                for entry in listing
+            ]
+
+        return None
+
+    def open_segments(self, tenantid, segments, depth=0):
+        """Stream the data of a large object's segments in order"""
+        return streams.SwiftChainedStream(
+            [
+                functools.partial(self.open_segment, tenantid, segment, depth)
+                for segment in segments
+            ],
+            chunk_size=self.chunk_size,
+            length=sum(segment['bytes'] for segment in segments)
+        )
+
+    def open_segment(self, tenantid, segment, depth=0):
+        """Open a segment, expanding it if it is a static large object"""
+        object_info = self.resolve_object(
+            tenantid,
+            segment['container'],
+            segment['object']
+        )
+        metadata = self.get_object_metadata(object_info['path'])
+        if self.is_static_manifest(metadata):
+            if depth >= MANIFEST_DEPTH_LIMIT:
+                raise exceptions.SwiftManifestError(
+                    'Large objects nested more than {0} deep'.format(
+                        MANIFEST_DEPTH_LIMIT
+                    )
+                )
+
+            return self.open_segments(
+                tenantid,
+                self.get_manifest_segments(tenantid, metadata),
+                depth + 1
+            )
+
+        return self.open_object_stream(object_info['path'])
+
+    def open_object_stream(self, path, offset=0, length=None):
+        use_mmap = (
+            self.mmap_threshold is not None and
+            (
+                self.backend.get_size(path) if length is None else length
+            ) >= max(self.mmap_threshold, 1)
+        )
+        if use_mmap:
+            LOG.debug(
+                'Swift Service ({0}): Memory mapping object data {1}'.format(
+                    self.__id, path
                 )
-            metadata.update(custom_metadata)
+            )
+
+        return self.backend.open_stream(
+            path,
+            chunk_size=self.chunk_size,
+            offset=offset,
+            length=length,
+            mmap=use_mmap
+        )
 
+    def get_object_metadata(self, path):
+        metadata = CaseInsensitiveDict()
+        if path in self.metadata:
+            metadata.update(self.metadata[path])
+
+        custom_metadata = self.custom_metadata.get(path, {})
+        for k, v in six.iteritems(custom_metadata):
             LOG.debug(
-                'Swift Service ({0}): Returning metadata - {1}'.format(
-                    self.__id, metadata
+                'Swift Service ({0}): Custom Metadata[{1}] = {2} with '
+                'type {3}'.format(
+                    self.__id, k, v, type(v)
                 )
             )
+        metadata.update(custom_metadata)
 
-            if 'content-length' in metadata:
-                LOG.debug(
-                    'Swift Service ({0}): Metadata data length - {1}'.format(
-                        self.__id, metadata['content-length']
-                    )
+        LOG.debug(
+            'Swift Service ({0}): Returning metadata - {1}'.format(
+                self.__id, metadata
+            )
+        )
+
+        if 'content-length' in metadata:
+            LOG.debug(
+                'Swift Service ({0}): Metadata data length - {1}'.format(
+                    self.__id, metadata['content-length']
+                )
+            )
+
+        return metadata
+
+    def retrieve_object_metadata(
+        self, tenantid, container_name, object_name, check_data=False
+    ):
+        """Look up an object's metadata without reading its data"""
+        try:
+            object_info = self.resolve_object(
+                tenantid,
+                container_name,
+                object_name
+            )
+
+        except (
+            exceptions.SwiftUnknownTenantError,
+            exceptions.SwiftUnknownContainerError,
+            exceptions.SwiftUnknownObjectError
+        ):
+            LOG.debug('Swift Service ({0}): No object.'.format(self.__id))
+            return None
+
+        if check_data and not self.backend.exists(object_info['path']):
+            LOG.debug(
+                'Swift Service ({0}): No data for object at {1}'.format(
+                    self.__id, object_info['path']
                 )
+            )
+            return None
+
+        return self.get_object_metadata(object_info['path'])
+
+    def retrieve_object(
+        self, tenantid, container_name, object_name, stream=False
+    ):
+        try:
+            object_info = self.resolve_object(
+                tenantid,
+                container_name,
+                object_name
+            )
+
+        except (
+            exceptions.SwiftUnknownTenantError,
+            exceptions.SwiftUnknownContainerError,
+            exceptions.SwiftUnknownObjectError
+        ):
+            object_info = None
+
+        if object_info is not None:
+            path = object_info['path']
+            metadata = self.get_object_metadata(path)
 
             data = None
             try:
-                with open(path, 'rb') as data_input:
-                    data = io.BytesIO(data_input.read())
+                if stream:
+                    data = self.open_object_stream(path)
+                    LOG.debug(
+                        'Swift Service ({0}): Returning stream of length - '
+                        '{1}'.format(
+                            self.__id, data.length
+                        )
+                    )
 
-                data.seek(0, os.SEEK_END)
-                LOG.debug(
-                    'Swift Service ({0}): Returning length - {1}'.format(
-                        self.__id, data.tell()
+                else:
+                    data = io.BytesIO(self.backend.read(path))
+                    data.seek(0, io.SEEK_END)
+                    LOG.debug(
+                        'Swift Service ({0}): Returning length - {1}'.format(
+                            self.__id, data.tell()
+                        )
                     )
-                )
-                data.seek(0, os.SEEK_SET)
+                    data.seek(0, io.SEEK_SET)
 
             except Exception:
                 LOG.exception('Failed to read object from disk')
@@ -578,51 +1419,328 @@ class SwiftStorage(object):
             LOG.debug('Swift Service ({0}): No object.'.format(self.__id))
             return (None, None)
 
-    def remove_object(self, tenantid, container_name, object_name):
-        if self.has_object(tenantid, container_name, object_name):
-            intTenantId, intContainerId = self.get_container(
-                tenantid, container_name
+    def retrieve_object_ranges(
+        self, tenantid, container_name, object_name, ranges
+    ):
+        """Open only the requested byte ranges of an object"""
+        try:
+            object_info = self.resolve_object(
+                tenantid,
+                container_name,
+                object_name
             )
+            size = self.backend.get_size(object_info['path'])
 
-            path = self.get_object_path(tenantid, container_name, object_name)
-            LOG.debug(
-                'Swift Service ({0}): Using path {1} for object '
-                '{2}/{3}:{4}'.format(
-                    self.__id, path, tenantid, container_name, object_name
+        except (
+            exceptions.SwiftUnknownTenantError,
+            exceptions.SwiftUnknownContainerError,
+            exceptions.SwiftUnknownObjectError,
+            OSError
+        ):
+            LOG.debug('Swift Service ({0}): No object.'.format(self.__id))
+            return (None, None, None)
+
+        path = object_info['path']
+        return (
+            size,
+            self.get_object_metadata(path),
+            [
+                (
+                    offset,
+                    length,
+                    functools.partial(
+                        self.open_object_stream, path, offset, length
+                    )
                 )
-            )
+                for offset, length in streams.resolve_ranges(ranges, size)
+            ]
+        )
 
-            intTenantId = self.model.has_tenant(tenantid)
-            intContainerId = self.model.has_container(
-                intTenantId, container_name
-            )
-            intObjectId = self.model.has_object(
-                intTenantId, intContainerId, object_name
+    def remove_object(self, tenantid, container_name, object_name):
+        try:
+            object_info = self.resolve_object(
+                tenantid,
+                container_name,
+                object_name
             )
+
+        except (
+            exceptions.SwiftUnknownTenantError,
+            exceptions.SwiftUnknownContainerError,
+            exceptions.SwiftUnknownObjectError
+        ):
             LOG.debug(
-                'Swift Service ({0}): T: {1}, C: {2}, O: {3}'.format(
-                    self.__id, intTenantId, intContainerId, intObjectId
-                )
+                'Swift Service ({0}): No object to remove'.format(self.__id)
             )
+            return
 
-            self.model.remove_object(
-                intTenantId, intContainerId, intObjectId
+        path = object_info['path']
+        LOG.debug(
+            'Swift Service ({0}): Using path {1} for object '
+            '{2}/{3}:{4}'.format(
+                self.__id, path, tenantid, container_name, object_name
             )
+        )
+        LOG.debug(
+            'Swift Service ({0}): T: {1}, C: {2}, O: {3}'.format(
+                self.__id,
+                object_info['tenantid'],
+                object_info['containerid'],
+                object_info['objectid']
+            )
+        )
 
-            LOG.debug(
-                'Swift Service ({0}): removed object from model'.format(
-                    self.__id
-                )
+        self.model.remove_object(
+            object_info['tenantid'],
+            object_info['containerid'],
+            object_info['objectid']
+        )
+        self.invalidate_object(tenantid, container_name, object_name)
+        self.metadata.pop(path, None)
+        self.custom_metadata.pop(path, None)
+        self.manifests.pop(path, None)
+        if self.dedup:
+            self.remove_unreferenced_blobs()
+
+        LOG.debug(
+            'Swift Service ({0}): removed object from model'.format(
+                self.__id
             )
+        )
 
-            os.remove(path)
+        try:
+            self.backend.remove(path)
             LOG.debug(
                 'Swift Service ({0}): removed object from disk'.format(
                     self.__id
                 )
             )
 
+        except OSError:
+            LOG.exception(
+                'Swift Service ({0}): object data already missing from '
+                'disk'.format(self.__id)
+            )
+
+    def schedule_delete_at(self, delete_at):
+        if delete_at is not None and (
+            self.__next_delete_at is None or
+            delete_at < self.__next_delete_at
+        ):
+            self.__next_delete_at = delete_at
+
+    def set_object_delete_at(
+        self, tenantid, container_name, object_name, delete_at
+    ):
+        """Set or, with a delete_at of None, clear when an object expires"""
+        object_info = self.resolve_object(
+            tenantid,
+            container_name,
+            object_name
+        )
+        self.model.set_object_delete_at(
+            object_info['tenantid'],
+            object_info['containerid'],
+            object_info['objectid'],
+            delete_at
+        )
+        metadata = self.metadata.setdefault(
+            object_info['path'],
+            CaseInsensitiveDict()
+        )
+        if delete_at is None:
+            metadata.pop('x-delete-at', None)
+
         else:
-            LOG.debug(
-                'Swift Service ({0}): No object to remove'.format(self.__id)
+            metadata['x-delete-at'] = str(delete_at)
+
+        self.schedule_delete_at(delete_at)
+
+    def reap_expired_objects(self, now=None):
+        """Remove every object that has expired by now"""
+        if now is None:
+            now = time.time()
+
+        if self.__next_delete_at is None or self.__next_delete_at > now:
+            return 0
+
+        reaped = 0
+        while True:
+            expired = self.model.list_expired_objects(
+                now,
+                limit=REAP_BATCH_SIZE
+            )
+            with self.model.batch():
+                for tenantid, container_name, object_name in expired:
+                    LOG.debug(
+                        'Swift Service ({0}): Removing expired object '
+                        '{1}/{2}:{3}'.format(
+                            self.__id, tenantid, container_name, object_name
+                        )
+                    )
+                    self.remove_object(tenantid, container_name, object_name)
+
+            reaped += len(expired)
+            if len(expired) < REAP_BATCH_SIZE:
+                break
+
+        self.__next_delete_at = self.model.get_next_delete_at()
+        return reaped
+
+    def store_or_update_container_metadata(
+        self, tenantid, container_name, metadata
+    ):
+        """Update a container's metadata"""
+        path = self.get_container_path(tenantid, container_name)
+        container_metadata = self.container_metadata.setdefault(
+            path,
+            CaseInsensitiveDict()
+        )
+        for k, v in six.iteritems(metadata):
+            if v is None:
+                container_metadata.pop(k, None)
+
+            else:
+                container_metadata[k] = v
+
+    def retrieve_container_metadata(self, tenantid, container_name):
+        container_metadata = CaseInsensitiveDict()
+        container_metadata.update(
+            self.container_metadata.get(
+                self.get_container_path(tenantid, container_name),
+                {}
+            )
+        )
+        return container_metadata
+
+    def get_versioning(self, tenantid, container_name):
+        """Look up how a container keeps versions of its objects"""
+        container_metadata = self.container_metadata.get(
+            self.get_container_path(tenantid, container_name)
+        )
+        if container_metadata:
+            for mode in VERSIONS_MODES:
+                if container_metadata.get(mode):
+                    return (mode, container_metadata[mode])
+
+        return (None, None)
+
+    def archive_object(self, tenantid, container_name, object_name):
+        """Archive an object's current version if its container keeps them"""
+        mode, versions_container = self.get_versioning(
+            tenantid,
+            container_name
+        )
+        if mode is None:
+            return None
+
+        version_name = '{0}{1:016.5f}'.format(
+            self.get_version_prefix(object_name),
+            time.time()
+        )
+        if self.copy_object(
+            tenantid, container_name, object_name,
+            tenantid, versions_container, version_name
+        ) is None:
+            return None
+
+        LOG.debug(
+            'Swift Service ({0}): Archived {1}/{2}:{3} as {4}'.format(
+                self.__id, tenantid, container_name, object_name,
+                version_name
+            )
+        )
+        return version_name
+
+    def list_versions(self, tenantid, container_name, object_name):
+        """List the archived versions of an object, oldest first"""
+        mode, versions_container = self.get_versioning(
+            tenantid,
+            container_name
+        )
+        if mode is None:
+            return []
+
+        try:
+            return [
+                entry['name']
+                for entry in self.list_objects(
+                    tenantid,
+                    versions_container,
+                    prefix=self.get_version_prefix(object_name)
+                )
+            ]
+
+        except (
+            exceptions.SwiftUnknownTenantError,
+            exceptions.SwiftUnknownContainerError
+        ):
+            return []
+
+    def get_latest_version(self, tenantid, versions_container, object_name):
+        try:
+            intTenantId = self.model.has_tenant(tenantid)
+            intContainerId = self.model.has_container(
+                intTenantId,
+                versions_container
             )
+
+        except (
+            exceptions.SwiftUnknownTenantError,
+            exceptions.SwiftUnknownContainerError
+        ):
+            return None
+
+        entry = self.model.get_last_object(
+            intTenantId,
+            intContainerId,
+            prefix=self.get_version_prefix(object_name)
+        )
+        return entry['object_name'] if entry is not None else None
+
+    def remove_versioned_object(self, tenantid, container_name, object_name):
+        """Delete an object the way its container's versioning asks"""
+        mode, versions_container = self.get_versioning(
+            tenantid,
+            container_name
+        )
+        if mode == VERSIONS_HISTORY:
+            self.archive_object(tenantid, container_name, object_name)
+
+        self.remove_object(tenantid, container_name, object_name)
+
+        if mode == VERSIONS_STACK:
+            version_name = self.get_latest_version(
+                tenantid,
+                versions_container,
+                object_name
+            )
+            if version_name is not None:
+                LOG.debug(
+                    'Swift Service ({0}): Restoring {1}/{2}:{3} from '
+                    '{4}'.format(
+                        self.__id, tenantid, container_name, object_name,
+                        version_name
+                    )
+                )
+                self.copy_object(
+                    tenantid, versions_container, version_name,
+                    tenantid, container_name, object_name
+                )
+                self.remove_object(tenantid, versions_container, version_name)
+
+    def remove_container(self, tenantid, container_name):
+        """Remove an empty container along with its metadata"""
+        intTenantId = self.model.has_tenant(tenantid)
+        intContainerId = self.model.has_container(intTenantId, container_name)
+        # the directory is left behind for a new container of the same name
+        self.model.remove_container(intTenantId, intContainerId)
+        self.container_metadata.pop(
+            self.get_container_path(tenantid, container_name),
+            None
+        )
+        LOG.debug(
+            'Swift Service ({0}): Removed container {1}/{2}'.format(
+                self.__id, tenantid, container_name
+            )
+        )
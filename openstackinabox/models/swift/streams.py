@@ -0,0 +1,365 @@
+"""
+OpenStack Swift Object Streams
+"""
+import hashlib
+import io
+import mmap
+import os
+
+import six
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_chunks(content, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Iterate over object content as binary chunks"""
+    if content is None:
+        return
+
+    if isinstance(content, six.text_type):
+        content = content.encode('utf-8')
+
+    if isinstance(content, (six.binary_type, bytearray, memoryview)):
+        if len(content):
+            yield content
+
+    elif hasattr(content, 'read'):
+        while True:
+            chunk = content.read(chunk_size)
+            if not chunk:
+                break
+
+            if isinstance(chunk, six.text_type):
+                chunk = chunk.encode('utf-8')
+
+            yield chunk
+
+    else:
+        for chunk in content:
+            if isinstance(chunk, six.text_type):
+                chunk = chunk.encode('utf-8')
+
+            if chunk:
+                yield chunk
+
+
+def copy_stream(content, output_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Copy content into output_file, hashing it along the way"""
+    etag_generator = hashlib.md5()
+    size = 0
+    for chunk in iter_chunks(content, chunk_size):
+        etag_generator.update(chunk)
+        output_file.write(chunk)
+        size += len(chunk)
+
+    return (etag_generator.hexdigest(), size)
+
+
+def resolve_ranges(ranges, size):
+    """Resolve byte ranges against an object's size"""
+    resolved = []
+    for first, last in ranges:
+        if first is None:
+            if last:
+                length = min(last, size)
+                if length:
+                    resolved.append((size - length, length))
+
+        elif first < size:
+            if last is None or last >= size:
+                last = size - 1
+
+            resolved.append((first, last - first + 1))
+
+    return resolved
+
+
+class SwiftObjectStream(object):
+    """File-like, chunked reader over an object's data file"""
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE, offset=0,
+                 length=None):
+        self.__path = path
+        self.__chunk_size = chunk_size
+        self.__file = open(path, 'rb')
+        self.__remaining = max(
+            os.fstat(self.__file.fileno()).st_size - offset,
+            0
+        )
+        if length is not None:
+            self.__remaining = min(self.__remaining, length)
+
+        self.__length = self.__remaining
+        if offset and self.__remaining:
+            self.__file.seek(offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                break
+
+            yield chunk
+
+    def __repr__(self):
+        return 'SwiftObjectStream({0})'.format(self.path)
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def chunk_size(self):
+        return self.__chunk_size
+
+    @property
+    def length(self):
+        return self.__length
+
+    @property
+    def closed(self):
+        return self.__file is None
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self.length - self.__remaining
+
+    def read(self, size=-1):
+        if self.closed:
+            return b''
+
+        if size is None or size < 0 or size > self.__remaining:
+            size = self.__remaining
+
+        data = self.__file.read(size) if size else b''
+        self.__remaining -= len(data)
+        # a zero sized read only probes the stream and must not end it
+        if not self.__remaining or (size and not data):
+            self.close()
+
+        return data
+
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+class SwiftObjectBuffer(object):
+    """File-like, zero-copy reader over object data held in memory"""
+
+    def __init__(self, data, chunk_size=DEFAULT_CHUNK_SIZE, offset=0,
+                 length=None, name=None):
+        self.__name = name
+        self.__chunk_size = chunk_size
+        view = memoryview(data)
+        end = len(view) if length is None else offset + length
+        self.__view = view[offset:end]
+        view.release()
+        self.__length = len(self.__view)
+        self.__position = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not len(chunk):
+                break
+
+            yield chunk
+
+    def __repr__(self):
+        return '{0}({1})'.format(type(self).__name__, self.__name)
+
+    @property
+    def path(self):
+        return self.__name
+
+    @property
+    def chunk_size(self):
+        return self.__chunk_size
+
+    @property
+    def length(self):
+        return self.__length
+
+    @property
+    def closed(self):
+        return self.__view is None
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self.__position
+
+    def read(self, size=-1):
+        if self.closed:
+            return b''
+
+        end = self.length
+        if size is not None and size >= 0:
+            end = min(end, self.__position + size)
+
+        data = self.__view[self.__position:end]
+        self.__position = end
+        if self.__position >= self.length:
+            self.close()
+
+        return data
+
+    def close(self):
+        if self.__view is not None:
+            self.__view.release()
+            self.__view = None
+            self.release()
+
+    def release(self):
+        """Release the underlying data once the stream is closed"""
+        pass
+
+
+class SwiftObjectMemoryMap(SwiftObjectBuffer):
+    """File-like, zero-copy reader over a memory-mapped object data file"""
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE, offset=0,
+                 length=None):
+        with open(path, 'rb') as data_input:
+            self.__map = mmap.mmap(
+                data_input.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        super(SwiftObjectMemoryMap, self).__init__(
+            self.__map,
+            chunk_size=chunk_size,
+            offset=offset,
+            length=length,
+            name=path
+        )
+
+    def release(self):
+        try:
+            self.__map.close()
+
+        except BufferError:
+            # slices handed out are still alive; the mapping is
+            # released once the last of them is garbage collected
+            pass
+
+        self.__map = None
+
+
+class SwiftChainedStream(object):
+    """File-like reader over a sequence of parts"""
+
+    def __init__(self, parts, chunk_size=DEFAULT_CHUNK_SIZE, length=None):
+        self.__parts = iter(parts)
+        self.__chunk_size = chunk_size
+        self.__length = length
+        self.__current = None
+        self.__position = 0
+        self.__closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                break
+
+            yield chunk
+
+    @property
+    def chunk_size(self):
+        return self.__chunk_size
+
+    @property
+    def length(self):
+        return self.__length
+
+    @property
+    def closed(self):
+        return self.__closed
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self.__position
+
+    def __next_part(self):
+        try:
+            part = next(self.__parts)
+
+        except StopIteration:
+            return False
+
+        if callable(part):
+            part = part()
+
+        if isinstance(part, six.text_type):
+            part = part.encode('utf-8')
+
+        if isinstance(part, (six.binary_type, bytearray, memoryview)):
+            part = io.BytesIO(part)
+
+        self.__current = part
+        return True
+
+    def __close_current(self):
+        if self.__current is not None:
+            self.__current.close()
+            self.__current = None
+
+    def read(self, size=-1):
+        if self.closed:
+            return b''
+
+        chunks = []
+        wanted = None if size is None or size < 0 else size
+        while wanted is None or wanted > 0:
+            if self.__current is None and not self.__next_part():
+                self.close()
+                break
+
+            chunk = self.__current.read(
+                self.chunk_size if wanted is None else wanted
+            )
+            if not len(chunk):
+                self.__close_current()
+                continue
+
+            chunks.append(bytes(chunk))
+            if wanted is not None:
+                wanted -= len(chunk)
+
+        data = b''.join(chunks)
+        self.__position += len(data)
+        return data
+
+    def close(self):
+        if not self.__closed:
+            self.__close_current()
+            for part in self.__parts:
+                if hasattr(part, 'close'):
+                    part.close()
+
+            self.__closed = True
@@ -2,8 +2,15 @@
 OpenStack Swift Services
 """
 import datetime
+import email.utils
+import functools
+import io
+import json
 import logging
+import posixpath
 import re
+import tarfile
+import time
 import uuid
 
 import six
@@ -12,16 +19,24 @@ from stackinabox.util.tools import CaseInsensitiveDict
 
 from openstackinabox.services import base_service
 
+from openstackinabox.models.swift import exceptions
+from openstackinabox.models.swift import streams
 from openstackinabox.models.swift.model import SwiftServiceModel
-from openstackinabox.models.swift.storage import SwiftStorage
+from openstackinabox.models.swift.storage import (
+    LAYOUT_FLAT, VERSIONS_MODES, SwiftStorage
+)
 
 
 LOG = logging.getLogger(__name__)
 
+# Number of recently requested paths whose split `split_uri` remembers
+SPLIT_URI_CACHE_SIZE = 4096
+
 
 class SwiftV1Service(base_service.BaseService):
 
     # Match: /<tenant-id>[/object/prefix]/<object>
+    #   No longer used for routing or by `split_uri`; kept for callers
     #   <tenant-id> = (\/\w+)
     #   [/object/prefix] = (\/[[\.%~#@!&\^\*\(\)\+=\`\'\":;><?\w-]+)+
     #   <object> = (\/.+\Z)
@@ -29,41 +44,342 @@ class SwiftV1Service(base_service.BaseService):
         r'\A(\/\w+)(\/[[\.%~#@!&\^\*\(\)\+=\`\'\":;><?\w-]+)+(\/.+\Z)'
     )
 
+    # Match: /<tenant-id>
+    ACCOUNT_URL_REGEX = re.compile(r'^\/[^\/]+$')
+
+    # Match: /<tenant-id>/<container>
+    CONTAINER_URL_REGEX = re.compile(r'^\/[^\/]+\/[^\/]+$')
+
+    # Match: /<tenant-id>/<container>/<object>
+    OBJECT_URL_REGEX = re.compile(r'^\/[^\/]+\/[^\/]+\/.+$')
+
+    # Request headers making a GET or HEAD conditional
+    CONDITIONAL_HEADERS = (
+        'if-match',
+        'if-none-match',
+        'if-modified-since',
+        'if-unmodified-since'
+    )
+
+    # Swift caps every listing at 10000 entries
+    CONTAINER_LISTING_LIMIT = 10000
+
+    # Swift's server side copy verb
+    COPY = 'COPY'
+
+    # extract-archive formats and the tarfile stream modes reading them
+    ARCHIVE_MODES = {
+        'tar': 'r|',
+        'tar.gz': 'r|gz',
+        'tar.bz2': 'r|bz2'
+    }
+
     @staticmethod
-    def split_uri(uri):
-        LOG.debug(
-            'SwiftV1Service: Attempting to split URL: {0} using regex '
-            '{1}'.format(
-                uri, SwiftV1Service.URL_REGEX.pattern
-            )
-        )
-        data = SwiftV1Service.URL_REGEX.match(uri)
-        if data:
-            data_groups = data.groups()
-            LOG.debug(
-                'SwiftV1Service: Split URL into {0} groups'.format(
-                    len(data_groups)
+    def split_query(uri, keep_blank_values=False):
+        # only the query is split off; ';' and the like belong to the path
+        path, _, query_string = uri.partition('?')
+        query = {
+            k: v[0]
+            for k, v in six.iteritems(
+                six.moves.urllib.parse.parse_qs(
+                    query_string,
+                    keep_blank_values=keep_blank_values
                 )
             )
+        }
+        return (path, query)
 
-            for dg in data_groups:
-                LOG.debug(
-                    'SwiftV1Service: Split URL - group: {0}'.format(dg)
+    @staticmethod
+    def read_body_text(request):
+        body = request.body
+        if hasattr(body, 'read'):
+            body = body.read()
+
+        if isinstance(body, six.binary_type):
+            body = body.decode('utf-8')
+
+        return body or ''
+
+    @staticmethod
+    def unquote_name(name):
+        """Percent-decode one tenant, container or object name
+
+        Names are always split out of a path before decoding, so an
+        encoded '/' never moves a boundary.
+        """
+        return six.moves.urllib.parse.unquote(name)
+
+    @staticmethod
+    def split_listing_uri(uri, keep_blank_values=False):
+        path, query = SwiftV1Service.split_query(
+            uri,
+            keep_blank_values=keep_blank_values
+        )
+        return (
+            [
+                SwiftV1Service.unquote_name(name)
+                for name in path.split('/')[1:]
+            ],
+            query
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=SPLIT_URI_CACHE_SIZE)
+    def split_uri(uri):
+        """Split an object path into its tenant, container and object
+
+        The tenant is the first segment, the object the last, and the
+        container everything between them. The path is scanned once and
+        each part is then decoded with `unquote_name`.
+
+        :param uri: path of the request, without its query; see
+                    `split_query`
+        :returns: tuple of the tenant, container and object names, or
+                  (None, None, None) if the path does not name an object
+        """
+        tenant_id, _, remainder = uri[1:].partition('/')
+        container, _, object_name = remainder.rpartition('/')
+        if not uri.startswith('/') or '?' in uri or not (
+            tenant_id and container and object_name
+        ):
+            LOG.debug('Swift Service: Failed to split url')
+            return (None, None, None)
+
+        return (
+            SwiftV1Service.unquote_name(tenant_id),
+            SwiftV1Service.unquote_name(container),
+            SwiftV1Service.unquote_name(object_name)
+        )
+
+    @staticmethod
+    def split_copy_path(value):
+        """Split a Destination or X-Copy-From header value
+
+        :returns: tuple of the container and object names, split the same
+                  way as `split_uri`, or (None, None) if the value does not
+                  name an object
+        """
+        path = (value or '').lstrip('/')
+        container_name, _, object_name = path.rpartition('/')
+        if not container_name or not object_name:
+            return (None, None)
+
+        return (
+            SwiftV1Service.unquote_name(container_name),
+            SwiftV1Service.unquote_name(object_name)
+        )
+
+    @staticmethod
+    def parse_range_header(value):
+        """Parse a Range header into (first, last) byte positions
+
+        :returns: list of the requested ranges, see
+                  `streams.resolve_ranges`, or None when there is no header
+                  or it cannot be parsed and must be ignored
+        """
+        if not value:
+            return None
+
+        units, _, range_set = value.partition('=')
+        if units.strip().lower() != 'bytes':
+            return None
+
+        ranges = []
+        for range_spec in range_set.split(','):
+            first, dash, last = range_spec.strip().partition('-')
+            if not dash:
+                return None
+
+            try:
+                first = int(first) if first else None
+                last = int(last) if last else None
+
+            except ValueError:
+                return None
+
+            if (
+                (first is None and last is None) or
+                (first is not None and last is not None and last < first)
+            ):
+                return None
+
+            ranges.append((first, last))
+
+        return ranges
+
+    @staticmethod
+    def parse_http_date(value):
+        """Parse an HTTP date into seconds since the epoch
+
+        :returns: the timestamp, or None if the date cannot be parsed
+        """
+        try:
+            parsed_date = email.utils.parsedate_tz(value)
+
+        except (TypeError, ValueError):
+            return None
+
+        if parsed_date is None:
+            return None
+
+        return email.utils.mktime_tz(parsed_date)
+
+    @staticmethod
+    def parse_container_metadata(request_headers):
+        """Pick the container metadata to set or remove out of a request
+
+        :returns: dict of the metadata; removed keys have a value of None
+        :raises: ValueError if the versioning headers are invalid
+        """
+        metadata = CaseInsensitiveDict()
+        for k, v in six.iteritems(request_headers):
+            k = k.lower()
+            if k.startswith('x-container-meta-'):
+                metadata[k] = v or None
+
+            elif k.startswith('x-remove-container-meta-'):
+                metadata['x-container-meta-{0}'.format(
+                    k[len('x-remove-container-meta-'):]
+                )] = None
+
+        versions_modes = [
+            mode
+            for mode in VERSIONS_MODES
+            if request_headers.get(mode)
+        ]
+        if len(versions_modes) > 1:
+            raise ValueError('Only one versioning mode may be set')
+
+        for mode in VERSIONS_MODES:
+            if (
+                'x-remove-{0}'.format(mode[2:]) in request_headers or
+                (mode in request_headers and not request_headers[mode])
+            ):
+                metadata[mode] = None
+
+        if versions_modes:
+            mode = versions_modes[0]
+            versions_container = SwiftV1Service.unquote_name(
+                request_headers[mode]
+            )
+            if '/' in versions_container:
+                raise ValueError(
+                    'Invalid versions container {0}'.format(
+                        versions_container
+                    )
                 )
 
-            tenant_id = data_groups[0]
-            object_name = data_groups[2]
+            # setting one mode replaces the other
+            for other_mode in VERSIONS_MODES:
+                metadata[other_mode] = None
 
-            container = uri[(len(tenant_id) + 1):-(len(object_name))]
+            metadata[mode] = versions_container
 
-            return (
-                tenant_id[1:],
-                container,
-                object_name[1:]
+        return metadata
+
+    @staticmethod
+    def parse_delete_at(request_headers, now):
+        """Work out when an object expires from its request headers
+
+        X-Delete-At takes precedence over X-Delete-After.
+
+        :returns: the expiry time in seconds since the epoch, or None if
+                  neither header is present
+        :raises: ValueError if the value is not an integer or is not in
+                 the future
+        """
+        if 'x-delete-at' in request_headers:
+            delete_at = int(request_headers['x-delete-at'])
+
+        elif 'x-delete-after' in request_headers:
+            delete_at = int(now) + int(request_headers['x-delete-after'])
+
+        else:
+            return None
+
+        if delete_at <= now:
+            raise ValueError('Expiry {0} is in the past'.format(delete_at))
+
+        return delete_at
+
+    @staticmethod
+    def match_etag(value, etag):
+        """Check an If-Match/If-None-Match header value against an etag"""
+        if etag is None:
+            return False
+
+        for candidate in value.split(','):
+            candidate = candidate.strip()
+            if candidate == '*':
+                return True
+
+            if candidate.startswith('W/'):
+                candidate = candidate[2:]
+
+            if candidate.strip('"').lower() == etag.strip('"').lower():
+                return True
+
+        return False
+
+    @staticmethod
+    def evaluate_conditions(request_headers, metadata):
+        """Evaluate a GET or HEAD request's preconditions
+
+        The preconditions are evaluated in the order RFC 7232 gives, from
+        the object's stored etag and last-modified time alone.
+
+        :returns: 412 or 304 when a precondition fails, otherwise None
+        """
+        etag = metadata.get('etag')
+        last_modified = SwiftV1Service.parse_http_date(
+            metadata.get('last-modified')
+        )
+
+        if 'if-match' in request_headers:
+            if not SwiftV1Service.match_etag(
+                request_headers['if-match'], etag
+            ):
+                return 412
+
+        elif 'if-unmodified-since' in request_headers:
+            since = SwiftV1Service.parse_http_date(
+                request_headers['if-unmodified-since']
+            )
+            if (
+                since is not None and last_modified is not None and
+                last_modified > since
+            ):
+                return 412
+
+        if 'if-none-match' in request_headers:
+            if SwiftV1Service.match_etag(
+                request_headers['if-none-match'], etag
+            ):
+                return 304
+
+        elif 'if-modified-since' in request_headers:
+            since = SwiftV1Service.parse_http_date(
+                request_headers['if-modified-since']
+            )
+            if (
+                since is not None and last_modified is not None and
+                last_modified <= since
+            ):
+                return 304
+
+        return None
+
+    def make_condition_response(self, status, metadata, headers):
+        LOG.debug(
+            'Swift Service ({0}): Precondition result {1}'.format(
+                self.__id, status
             )
+        )
+        for k in ('etag', 'last-modified'):
+            if k in metadata:
+                headers[k] = metadata[k]
 
-        LOG.debug('Swift Service: Failed to split url')
-        return (None, None, None)
+        return (status, headers, None)
 
     @staticmethod
     def sanitize_name(name):
@@ -81,56 +397,784 @@ class SwiftV1Service(base_service.BaseService):
 
         return name
 
-    def __init__(self):
+    def __init__(self, layout=LAYOUT_FLAT, backend=None, dedup=False,
+                 mmap_threshold=None):
         super(SwiftV1Service, self).__init__('swift/v1.0')
         self.__id = uuid.uuid4()
         self.__model = SwiftServiceModel()
-        self.__storage = SwiftStorage(self.__id, self.model)
+        self.__storage = SwiftStorage(
+            self.__id,
+            self.model,
+            mmap_threshold=mmap_threshold,
+            layout=layout,
+            backend=backend,
+            dedup=dedup
+        )
         self.__metadata_information = {}
         self.__custom_metadata = {}
         self.fail_auth = False
         self.fail_error_code = None
+        self.register(StackInABoxService.GET,
+                      SwiftV1Service.ACCOUNT_URL_REGEX,
+                      SwiftV1Service.get_account_handler)
+        self.register(StackInABoxService.HEAD,
+                      SwiftV1Service.ACCOUNT_URL_REGEX,
+                      SwiftV1Service.head_account_handler)
+        self.register(StackInABoxService.PUT,
+                      SwiftV1Service.ACCOUNT_URL_REGEX,
+                      SwiftV1Service.put_account_handler)
+        self.register(StackInABoxService.POST,
+                      SwiftV1Service.ACCOUNT_URL_REGEX,
+                      SwiftV1Service.bulk_delete_handler)
+        self.register(StackInABoxService.DELETE,
+                      SwiftV1Service.ACCOUNT_URL_REGEX,
+                      SwiftV1Service.bulk_delete_handler)
+        self.register(StackInABoxService.GET,
+                      SwiftV1Service.CONTAINER_URL_REGEX,
+                      SwiftV1Service.get_container_handler)
+        self.register(StackInABoxService.HEAD,
+                      SwiftV1Service.CONTAINER_URL_REGEX,
+                      SwiftV1Service.head_container_handler)
+        self.register(StackInABoxService.PUT,
+                      SwiftV1Service.CONTAINER_URL_REGEX,
+                      SwiftV1Service.put_container_handler)
+        self.register(StackInABoxService.POST,
+                      SwiftV1Service.CONTAINER_URL_REGEX,
+                      SwiftV1Service.post_container_handler)
+        for method, handler in (
+            (StackInABoxService.GET, SwiftV1Service.get_object_handler),
+            (StackInABoxService.PUT, SwiftV1Service.put_object_handler),
+            (StackInABoxService.POST, SwiftV1Service.post_object_handler),
+            (StackInABoxService.HEAD, SwiftV1Service.head_object_handler),
+            (StackInABoxService.DELETE, SwiftV1Service.delete_object_handler),
+            (SwiftV1Service.COPY, SwiftV1Service.copy_object_handler)
+        ):
+            self.register(method, SwiftV1Service.OBJECT_URL_REGEX, handler)
 
     @property
     def model(self):
         return self.__model
 
+    def request(self, method, request, uri, headers):
+        # expired objects are gone before any request can see them
+        self.storage.reap_expired_objects()
+        return super(SwiftV1Service, self).request(
+            method, request, uri, headers
+        )
+
     @property
     def storage(self):
         return self.__storage
 
     def do_register_object(self, tenantid, container_name, object_name):
-        uri = '/{0}/{1}/{2}'.format(
-            tenantid,
-            container_name,
-            object_name
-        )
+        """Kept for compatibility; every object is already routed
+
+        All objects are served by the routes for `OBJECT_URL_REGEX` and
+        looked up in the model when requested, so nothing needs to be
+        registered per object.
+        """
         LOG.debug(
-            'SwiftV1Service ({0}): Registering Object Service for '
-            'T/C:O - {1}/{2}: {3}'.format(
+            'SwiftV1Service ({0}): Objects are always routed, nothing to '
+            'register for T/C:O - {1}/{2}: {3}'.format(
                 self.__id, tenantid, container_name, object_name
             )
         )
-        self.register(StackInABoxService.GET,
-                      uri,
-                      SwiftV1Service.get_object_handler)
-        self.register(StackInABoxService.PUT,
-                      uri,
-                      SwiftV1Service.put_object_handler)
-        self.register(StackInABoxService.POST,
-                      uri,
-                      SwiftV1Service.put_object_handler)
-        self.register(StackInABoxService.HEAD,
-                      uri,
-                      SwiftV1Service.head_object_handler)
-        self.register(StackInABoxService.DELETE,
-                      uri,
-                      SwiftV1Service.delete_object_handler)
 
     def add_transaction(self, headers):
         headers['x-trans-id'] = str(uuid.uuid4())
         headers['date'] = str(datetime.datetime.utcnow())
 
+    def add_account_usage(self, tenantid, headers):
+        usage = self.storage.get_account_usage(tenantid)
+        headers['x-account-container-count'] = str(usage['container_count'])
+        headers['x-account-object-count'] = str(usage['object_count'])
+        headers['x-account-bytes-used'] = str(usage['bytes_used'])
+
+    def add_container_usage(self, tenantid, container_name, headers):
+        usage = self.storage.get_container_usage(tenantid, container_name)
+        headers['x-container-object-count'] = str(usage['object_count'])
+        headers['x-container-bytes-used'] = str(usage['bytes_used'])
+
+    def make_listing_response(self, query, listing, headers):
+        """Build a listing response in the format the query asked for
+
+        :returns: tuple of the response arguments for a handler
+        """
+        if query.get('format') == 'json':
+            headers['content-type'] = 'application/json; charset=utf-8'
+            return (200, headers, json.dumps(listing))
+
+        if not listing:
+            return (204, headers, None)
+
+        headers['content-type'] = 'text/plain; charset=utf-8'
+        return (
+            200,
+            headers,
+            ''.join(
+                '{0}\n'.format(entry.get('name', entry.get('subdir')))
+                for entry in listing
+            )
+        )
+
+    def list_handler(self, query, headers, list_entries):
+        """Handle the query parameters shared by all listings
+
+        :param list_entries: callable taking the `marker`, `end_marker`,
+                             `limit`, `prefix` and `delimiter` keyword
+                             arguments and returning the listing
+        :raises: SwiftUnknownTenantError, SwiftUnknownContainerError
+        """
+        LOG.debug(
+            'Swift Service ({0}): Requested listing with {1}'.format(
+                self.__id, query
+            )
+        )
+
+        try:
+            limit = int(
+                query.get('limit', SwiftV1Service.CONTAINER_LISTING_LIMIT)
+            )
+
+        except ValueError:
+            return (412, headers, 'Invalid limit')
+
+        if limit < 0 or limit > SwiftV1Service.CONTAINER_LISTING_LIMIT:
+            LOG.debug(
+                'Swift Service ({0}): Listing limit {1} out of range'.format(
+                    self.__id, limit
+                )
+            )
+            return (
+                412,
+                headers,
+                'Maximum limit is {0}'.format(
+                    SwiftV1Service.CONTAINER_LISTING_LIMIT
+                )
+            )
+
+        listing = list_entries(
+            marker=query.get('marker'),
+            end_marker=query.get('end_marker'),
+            limit=limit,
+            prefix=query.get('prefix'),
+            delimiter=query.get('delimiter')
+        )
+        LOG.debug(
+            'Swift Service ({0}): Listing has {1} entries'.format(
+                self.__id, len(listing)
+            )
+        )
+        return self.make_listing_response(query, listing, headers)
+
+    def get_account_handler(self, request, uri, headers):
+        LOG.debug(
+            'Swift Service ({0}): Received account GET request on '
+            '{1}'.format(
+                self.__id, uri
+            )
+        )
+
+        self.add_transaction(headers)
+
+        if self.fail_auth:
+            return (401, headers, 'Unauthorized')
+
+        elif self.fail_error_code is not None:
+            return (self.fail_error_code, headers, 'mock error')
+
+        (tenantid,), query = SwiftV1Service.split_listing_uri(uri)
+        try:
+            self.add_account_usage(tenantid, headers)
+
+            return self.list_handler(
+                query,
+                headers,
+                lambda **kwargs: self.storage.list_containers(
+                    tenantid, **kwargs
+                )
+            )
+
+        except exceptions.SwiftUnknownTenantError:
+            LOG.debug(
+                'Swift Service ({0}): Did not find the account'.format(
+                    self.__id
+                )
+            )
+            return (404, headers, 'Not found')
+
+    def head_account_handler(self, request, uri, headers):
+        LOG.debug(
+            'Swift Service ({0}): Received account HEAD request on '
+            '{1}'.format(
+                self.__id, uri
+            )
+        )
+
+        self.add_transaction(headers)
+
+        if self.fail_auth:
+            return (401, headers, 'Unauthorized')
+
+        elif self.fail_error_code is not None:
+            return (self.fail_error_code, headers, 'mock error')
+
+        (tenantid,), query = SwiftV1Service.split_listing_uri(uri)
+        try:
+            self.add_account_usage(tenantid, headers)
+
+        except exceptions.SwiftUnknownTenantError:
+            LOG.debug(
+                'Swift Service ({0}): Did not find the account'.format(
+                    self.__id
+                )
+            )
+            return (404, headers, 'Not found')
+
+        return (204, headers, None)
+
+    def make_bulk_response(self, request, headers, result, errors):
+        """Build the summary response of a bulk request
+
+        :param result: dict of the counters to report
+        :param errors: list of (path, status) tuples for the failed items
+        :returns: tuple of the response arguments for a handler; the status
+                  of the request as a whole is reported in the body
+        """
+        result['Response Status'] = (
+            '400 Bad Request' if errors else '200 OK'
+        )
+        result.setdefault('Response Body', '')
+        result['Errors'] = [list(error) for error in errors]
+
+        if 'application/json' in request.headers.get('accept', ''):
+            headers['content-type'] = 'application/json; charset=utf-8'
+            return (200, headers, json.dumps(result))
+
+        headers['content-type'] = 'text/plain; charset=utf-8'
+        lines = [
+            '{0}: {1}'.format(k, v)
+            for k, v in sorted(six.iteritems(result))
+            if k != 'Errors'
+        ]
+        lines.append('Errors:')
+        lines.extend('{0}, {1}'.format(*error) for error in errors)
+        return (200, headers, '\n'.join(lines) + '\n')
+
+    def put_account_handler(self, request, uri, headers):
+        LOG.debug(
+            'Swift Service ({0}): Received account PUT request on '
+            '{1}'.format(
+                self.__id, uri
+            )
+        )
+
+        self.add_transaction(headers)
+
+        if self.fail_auth:
+            return (401, headers, 'Unauthorized')
+
+        elif self.fail_error_code is not None:
+            return (self.fail_error_code, headers, 'mock error')
+
+        if 'x-auth-token' not in request.headers:
+            return (401, headers, 'Not Authorized')
+
+        (tenantid,), query = SwiftV1Service.split_listing_uri(uri)
+        if 'extract-archive' not in query:
+            return (405, headers, 'Method Not Allowed')
+
+        return self.extract_archive(
+            request,
+            headers,
+            tenantid,
+            None,
+            query['extract-archive']
+        )
+
+    def extract_archive(
+        self, request, headers, tenantid, container_name, archive_format
+    ):
+        """Store each file of an uploaded tar archive as an object
+
+        Members are read in tarfile's stream mode and each is streamed
+        straight into the storage, so the archive is never unpacked first;
+        all the objects are added in one transaction. Each file's path,
+        below `container_name` when given, is split like a request path
+        (see `split_uri`) so every object is addressed by that path.
+
+        :param container_name: container the archive is extracted into, or
+                               None when the paths in the archive start
+                               with their containers
+        """
+        mode = SwiftV1Service.ARCHIVE_MODES.get(archive_format)
+        if mode is None:
+            return (
+                400,
+                headers,
+                'Unsupported archive format {0}'.format(archive_format)
+            )
+
+        body = request.body
+        if not hasattr(body, 'read'):
+            if isinstance(body, six.text_type):
+                body = body.encode('utf-8')
+
+            body = io.BytesIO(body or b'')
+
+        created = 0
+        errors = []
+        result = {}
+        with self.model.batch():
+            try:
+                with tarfile.open(fileobj=body, mode=mode) as archive:
+                    for member in archive:
+                        if not member.isfile():
+                            continue
+
+                        name = posixpath.normpath(member.name).lstrip('/')
+                        escapes = name == '..' or name.startswith('../')
+                        if container_name is not None:
+                            name = '{0}/{1}'.format(container_name, name)
+
+                        # unlike Swift, which stores 'dir/file' in the
+                        # URL's container, the last '/' ends the container
+                        # as in `split_uri`; 'dir/file' becomes 'file' in
+                        # '<container>/dir' so GETs of its archive path work
+                        (
+                            object_container, _, object_name
+                        ) = name.rpartition('/')
+                        if (
+                            escapes or
+                            not object_container or
+                            not object_name
+                        ):
+                            errors.append((member.name, '400 Bad Request'))
+                            continue
+
+                        metadata = CaseInsensitiveDict()
+                        metadata.update({
+                            'content-length': str(member.size),
+                            'content-type': 'application/binary'
+                        })
+                        self.storage.store_object(
+                            tenantid,
+                            object_container,
+                            object_name,
+                            archive.extractfile(member),
+                            metadata
+                        )
+                        created += 1
+
+            except (tarfile.TarError, EOFError, OSError) as ex:
+                LOG.debug(
+                    'Swift Service ({0}): Invalid archive: {1}'.format(
+                        self.__id, ex
+                    )
+                )
+                result['Response Body'] = 'Invalid Tar File: {0}'.format(ex)
+                errors.append((archive_format, '400 Bad Request'))
+
+        LOG.debug(
+            'Swift Service ({0}): Extracted {1} objects from archive'.format(
+                self.__id, created
+            )
+        )
+        result['Number Files Created'] = created
+        return self.make_bulk_response(request, headers, result, errors)
+
+    def bulk_delete_handler(self, request, uri, headers):
+        LOG.debug(
+            'Swift Service ({0}): Received account {1} request on '
+            '{2}'.format(
+                self.__id, request.method, uri
+            )
+        )
+
+        self.add_transaction(headers)
+
+        if self.fail_auth:
+            return (401, headers, 'Unauthorized')
+
+        elif self.fail_error_code is not None:
+            return (self.fail_error_code, headers, 'mock error')
+
+        if 'x-auth-token' not in request.headers:
+            return (401, headers, 'Not Authorized')
+
+        (tenantid,), query = SwiftV1Service.split_listing_uri(
+            uri,
+            keep_blank_values=True
+        )
+        if 'bulk-delete' not in query:
+            return (405, headers, 'Method Not Allowed')
+
+        deleted = 0
+        not_found = 0
+        errors = []
+        with self.model.batch():
+            for line in SwiftV1Service.read_body_text(request).splitlines():
+                path = line.strip()
+                if not path:
+                    continue
+
+                container_name, object_name = SwiftV1Service.split_copy_path(
+                    path
+                )
+                try:
+                    if object_name is None:
+                        self.storage.remove_container(
+                            tenantid,
+                            SwiftV1Service.unquote_name(path.strip('/'))
+                        )
+
+                    elif self.storage.has_object(
+                        tenantid,
+                        container_name,
+                        object_name
+                    ):
+                        self.storage.remove_versioned_object(
+                            tenantid,
+                            container_name,
+                            object_name
+                        )
+
+                    else:
+                        not_found += 1
+                        continue
+
+                    deleted += 1
+
+                except (
+                    exceptions.SwiftUnknownTenantError,
+                    exceptions.SwiftUnknownContainerError
+                ):
+                    not_found += 1
+
+                except exceptions.SwiftContainerNotEmptyError:
+                    errors.append((path, '409 Conflict'))
+
+        LOG.debug(
+            'Swift Service ({0}): Bulk deleted {1} items'.format(
+                self.__id, deleted
+            )
+        )
+        return self.make_bulk_response(
+            request,
+            headers,
+            {
+                'Number Deleted': deleted,
+                'Number Not Found': not_found
+            },
+            errors
+        )
+
+    def get_container_handler(self, request, uri, headers):
+        LOG.debug(
+            'Swift Service ({0}): Received container GET request on '
+            '{1}'.format(
+                self.__id, uri
+            )
+        )
+
+        self.add_transaction(headers)
+
+        if self.fail_auth:
+            return (401, headers, 'Unauthorized')
+
+        elif self.fail_error_code is not None:
+            return (self.fail_error_code, headers, 'mock error')
+
+        (tenantid, container_name), query = SwiftV1Service.split_listing_uri(
+            uri
+        )
+        try:
+            self.add_container_usage(tenantid, container_name, headers)
+            headers.update(
+                self.storage.retrieve_container_metadata(
+                    tenantid,
+                    container_name
+                )
+            )
+
+            return self.list_handler(
+                query,
+                headers,
+                lambda **kwargs: self.storage.list_objects(
+                    tenantid, container_name, **kwargs
+                )
+            )
+
+        except (
+            exceptions.SwiftUnknownTenantError,
+            exceptions.SwiftUnknownContainerError
+        ):
+            LOG.debug(
+                'Swift Service ({0}): Did not find the container'.format(
+                    self.__id
+                )
+            )
+            return (404, headers, 'Not found')
+
+    def head_container_handler(self, request, uri, headers):
+        LOG.debug(
+            'Swift Service ({0}): Received container HEAD request on '
+            '{1}'.format(
+                self.__id, uri
+            )
+        )
+
+        self.add_transaction(headers)
+
+        if self.fail_auth:
+            return (401, headers, 'Unauthorized')
+
+        elif self.fail_error_code is not None:
+            return (self.fail_error_code, headers, 'mock error')
+
+        (tenantid, container_name), query = SwiftV1Service.split_listing_uri(
+            uri
+        )
+        try:
+            self.add_container_usage(tenantid, container_name, headers)
+            headers.update(
+                self.storage.retrieve_container_metadata(
+                    tenantid,
+                    container_name
+                )
+            )
+
+        except (
+            exceptions.SwiftUnknownTenantError,
+            exceptions.SwiftUnknownContainerError
+        ):
+            LOG.debug(
+                'Swift Service ({0}): Did not find the container'.format(
+                    self.__id
+                )
+            )
+            return (404, headers, 'Not found')
+
+        return (204, headers, None)
+
+    def put_container_handler(self, request, uri, headers):
+        LOG.debug(
+            'Swift Service ({0}): Received container PUT request on '
+            '{1}'.format(
+                self.__id, uri
+            )
+        )
+
+        self.add_transaction(headers)
+
+        if self.fail_auth:
+            return (401, headers, 'Unauthorized')
+
+        elif self.fail_error_code is not None:
+            return (self.fail_error_code, headers, 'mock error')
+
+        if 'x-auth-token' not in request.headers:
+            return (401, headers, 'Not Authorized')
+
+        (tenantid, container_name), query = SwiftV1Service.split_listing_uri(
+            uri
+        )
+        if 'extract-archive' in query:
+            return self.extract_archive(
+                request,
+                headers,
+                tenantid,
+                container_name,
+                query['extract-archive']
+            )
+
+        try:
+            metadata = SwiftV1Service.parse_container_metadata(
+                request.headers
+            )
+
+        except ValueError as ex:
+            LOG.debug(
+                'Swift Service ({0}): Invalid container metadata: '
+                '{1}'.format(
+                    self.__id, ex
+                )
+            )
+            return (400, headers, str(ex))
+
+        existed = self.storage.has_container(tenantid, container_name)
+        if not existed:
+            self.storage.add_container(tenantid, container_name)
+
+        self.storage.store_or_update_container_metadata(
+            tenantid,
+            container_name,
+            metadata
+        )
+        return (202 if existed else 201, headers, None)
+
+    def post_container_handler(self, request, uri, headers):
+        LOG.debug(
+            'Swift Service ({0}): Received container POST request on '
+            '{1}'.format(
+                self.__id, uri
+            )
+        )
+
+        self.add_transaction(headers)
+
+        if self.fail_auth:
+            return (401, headers, 'Unauthorized')
+
+        elif self.fail_error_code is not None:
+            return (self.fail_error_code, headers, 'mock error')
+
+        if 'x-auth-token' not in request.headers:
+            return (401, headers, 'Not Authorized')
+
+        (tenantid, container_name), query = SwiftV1Service.split_listing_uri(
+            uri
+        )
+        if not self.storage.has_container(tenantid, container_name):
+            LOG.debug(
+                'Swift Service ({0}): Did not find the container'.format(
+                    self.__id
+                )
+            )
+            return (404, headers, 'Not found')
+
+        try:
+            metadata = SwiftV1Service.parse_container_metadata(
+                request.headers
+            )
+
+        except ValueError as ex:
+            LOG.debug(
+                'Swift Service ({0}): Invalid container metadata: '
+                '{1}'.format(
+                    self.__id, ex
+                )
+            )
+            return (400, headers, str(ex))
+
+        self.storage.store_or_update_container_metadata(
+            tenantid,
+            container_name,
+            metadata
+        )
+        return (204, headers, None)
+
+    def get_object_ranges(
+        self, tenantid, container_name, object_name, byte_ranges, headers,
+        expand_manifest=True
+    ):
+        """Build a 206 response holding only the requested byte ranges
+
+        A single range is returned as is, several ranges as a
+        multipart/byteranges body whose parts are only opened as the
+        response is read. Ranges of large objects are not supported, they
+        are returned whole.
+        """
+        size, metadata, ranges = self.storage.retrieve_object_ranges(
+            tenantid,
+            container_name,
+            object_name,
+            byte_ranges
+        )
+        if size is None:
+            LOG.debug(
+                'Swift Service ({0}): Did not find requested T/C:O of '
+                '{1}/{2}:{3}'.format(
+                    self.__id,
+                    tenantid,
+                    container_name,
+                    object_name
+                )
+            )
+            return (404, headers, 'Not found')
+
+        if expand_manifest:
+            large_object = self.get_large_object(tenantid, metadata, headers)
+            if large_object is not None:
+                return large_object
+
+        headers.update(metadata)
+        headers['accept-ranges'] = 'bytes'
+        if not ranges:
+            LOG.debug(
+                'Swift Service ({0}): Unsatisfiable range {1} for an object '
+                'of {2} bytes'.format(
+                    self.__id, byte_ranges, size
+                )
+            )
+            headers['content-length'] = '0'
+            headers['content-range'] = 'bytes */{0}'.format(size)
+            return (416, headers, None)
+
+        if len(ranges) == 1:
+            offset, length, open_stream = ranges[0]
+            headers['content-length'] = str(length)
+            headers['content-range'] = 'bytes {0}-{1}/{2}'.format(
+                offset, offset + length - 1, size
+            )
+            return (206, headers, open_stream())
+
+        boundary = uuid.uuid4().hex
+        content_type = metadata.get('content-type', 'application/octet-stream')
+        parts = []
+        body_length = 0
+        for offset, length, open_stream in ranges:
+            part_header = (
+                '--{0}\r\nContent-Type: {1}\r\n'
+                'Content-Range: bytes {2}-{3}/{4}\r\n\r\n'.format(
+                    boundary, content_type, offset, offset + length - 1, size
+                ).encode('utf-8')
+            )
+            parts.extend([part_header, open_stream, b'\r\n'])
+            body_length += len(part_header) + length + 2
+
+        part_trailer = '--{0}--\r\n'.format(boundary).encode('utf-8')
+        parts.append(part_trailer)
+        body_length += len(part_trailer)
+
+        headers['content-type'] = (
+            'multipart/byteranges; boundary={0}'.format(boundary)
+        )
+        headers['content-length'] = str(body_length)
+        return (
+            206,
+            headers,
+            streams.SwiftChainedStream(
+                parts,
+                chunk_size=self.storage.chunk_size,
+                length=body_length
+            )
+        )
+
+    def get_large_object(self, tenantid, metadata, headers):
+        """Build a response streaming a large object's segments
+
+        :returns: the response, or None when the object is not a manifest
+        """
+        segments = self.storage.get_manifest_segments(tenantid, metadata)
+        if segments is None:
+            return None
+
+        LOG.debug(
+            'Swift Service ({0}): Streaming {1} large object segments'.format(
+                self.__id, len(segments)
+            )
+        )
+        data = self.storage.open_segments(tenantid, segments)
+        headers.update(metadata)
+        headers['content-length'] = str(data.length)
+        headers['etag'] = SwiftStorage.get_manifest_etag(segments)
+        if not data.length:
+            data.close()
+            return (204, headers, None)
+
+        return (200, headers, data)
+
     def get_object_handler(self, request, uri, headers):
         LOG.debug(
             'Swift Service ({0}): Received GET request on {1}'.format(
@@ -152,17 +1196,60 @@ class SwiftV1Service(base_service.BaseService):
         elif self.fail_error_code is not None:
             return (self.fail_error_code, headers, 'mock error')
 
-        tenantid, container_name, object_name = SwiftV1Service.split_uri(uri)
+        uri_path, query = SwiftV1Service.split_query(uri)
+        tenantid, container_name, object_name = SwiftV1Service.split_uri(
+            uri_path
+        )
         LOG.debug(
             'Swift Service ({0}): Requested T/C:O on {1}/{2}:{3}'.format(
                 self.__id, tenantid, container_name, object_name
             )
         )
 
+        if any(
+            k in request.headers
+            for k in SwiftV1Service.CONDITIONAL_HEADERS
+        ):
+            metadata = self.storage.retrieve_object_metadata(
+                tenantid,
+                container_name,
+                object_name,
+                check_data=True
+            )
+            if metadata is None:
+                LOG.debug(
+                    'Swift Service ({0}): Did not find the object'.format(
+                        self.__id
+                    )
+                )
+                return (404, headers, 'Not found')
+
+            status = SwiftV1Service.evaluate_conditions(
+                request.headers,
+                metadata
+            )
+            if status is not None:
+                return self.make_condition_response(status, metadata, headers)
+
+        byte_ranges = SwiftV1Service.parse_range_header(
+            request.headers.get('range')
+        )
+        expand_manifest = query.get('multipart-manifest') != 'get'
+        if byte_ranges is not None:
+            return self.get_object_ranges(
+                tenantid,
+                container_name,
+                object_name,
+                byte_ranges,
+                headers,
+                expand_manifest=expand_manifest
+            )
+
         data, metadata = self.storage.retrieve_object(
             tenantid,
             container_name,
-            object_name
+            object_name,
+            stream=True
         )
         LOG.debug(
             'Swift Service ({0}): Retrieved object'.format(self.__id)
@@ -199,11 +1286,24 @@ class SwiftV1Service(base_service.BaseService):
             return (404, headers, 'Not found')
 
         else:
+            if expand_manifest:
+                large_object = self.get_large_object(
+                    tenantid,
+                    metadata,
+                    headers
+                )
+                if large_object is not None:
+                    data.close()
+                    return large_object
+
             LOG.debug(
                 'Swift Service ({0}): Updating headers with metadata '
                 'information'.format(self.__id)
             )
             headers.update(metadata)
+            if SwiftStorage.is_static_manifest(metadata):
+                # the manifest itself rather than the large object
+                headers['content-length'] = str(data.length)
 
             for k, v in six.iteritems(headers):
                 LOG.debug(
@@ -221,10 +1321,12 @@ class SwiftV1Service(base_service.BaseService):
                 'Swift Service ({0}): Returning object'.format(self.__id)
             )
 
+            headers['accept-ranges'] = 'bytes'
             if int(headers['content-length']) > 0:
                 return (200, headers, data)
 
             else:
+                data.close()
                 return (204, headers, None)
 
     def put_object_handler(self, request, uri, headers):
@@ -250,7 +1352,10 @@ class SwiftV1Service(base_service.BaseService):
         ):
             return (self.fail_error_code, headers, 'mock error')
 
-        tenantid, container_name, object_name = SwiftV1Service.split_uri(uri)
+        uri_path, query = SwiftV1Service.split_query(uri)
+        tenantid, container_name, object_name = SwiftV1Service.split_uri(
+            uri_path
+        )
         LOG.debug(
             'Swift Service ({0}): Requested T/C:O on {1}/{2}:{3}'.format(
                 self.__id, tenantid, container_name, object_name
@@ -272,7 +1377,46 @@ class SwiftV1Service(base_service.BaseService):
             )
             return (401, headers, 'Not Authorized')
 
-        if 'etag' not in request.headers:
+        if 'x-copy-from' in request.headers:
+            source_container, source_object = SwiftV1Service.split_copy_path(
+                request.headers['x-copy-from']
+            )
+            return self.copy_object(
+                request,
+                headers,
+                (
+                    request.headers.get('x-copy-from-account', tenantid),
+                    source_container,
+                    source_object
+                ),
+                (tenantid, container_name, object_name)
+            )
+
+        if query.get('multipart-manifest') == 'put':
+            return self.put_manifest(
+                request,
+                headers,
+                tenantid,
+                container_name,
+                object_name
+            )
+
+        if 'x-static-large-object' in request.headers:
+            LOG.debug(
+                'Swift Service ({0}): Reserved X-Static-Large-Object '
+                'Header'.format(self.__id)
+            )
+            return (
+                400,
+                headers,
+                'X-Static-Large-Object is a reserved header. To create a '
+                'static large object add query param multipart-manifest=put.'
+            )
+
+        if (
+            'etag' not in request.headers and
+            'x-object-manifest' not in request.headers
+        ):
             LOG.debug(
                 'Swift Service ({0}): Missing ETAG Header'.format(
                     self.__id
@@ -280,8 +1424,23 @@ class SwiftV1Service(base_service.BaseService):
             )
             return (400, headers, 'missing etag')
 
+        try:
+            delete_at = SwiftV1Service.parse_delete_at(
+                request.headers,
+                time.time()
+            )
+
+        except ValueError:
+            LOG.debug(
+                'Swift Service ({0}): Invalid object expiry'.format(self.__id)
+            )
+            return (400, headers, 'Invalid X-Delete-At or X-Delete-After')
+
         metadata_headers = [
-            'x-auth-token'
+            'x-auth-token',
+            'transfer-encoding',
+            'x-delete-at',
+            'x-delete-after'
         ]
 
         LOG.debug(
@@ -293,6 +1452,9 @@ class SwiftV1Service(base_service.BaseService):
             if k.lower() not in metadata_headers:
                 metadata[k] = v
 
+        if delete_at is not None:
+            metadata['x-delete-at'] = str(delete_at)
+
         LOG.debug(
             'Swift Service ({0}): Headers filtered.'.format(self.__id)
         )
@@ -308,12 +1470,22 @@ class SwiftV1Service(base_service.BaseService):
                 container_name,
                 object_name,
                 request.body,
-                metadata
+                metadata,
+                verify_etag='etag' in metadata
             )
             LOG.debug(
                 'Swift Service ({0}): Object Stored'.format(self.__id)
             )
 
+        except exceptions.SwiftEtagMismatchError:
+            LOG.debug(
+                'Swift Service ({0}): Object data does not match ETAG '
+                '{1}'.format(
+                    self.__id, metadata['etag']
+                )
+            )
+            return (422, headers, 'Unprocessable Entity')
+
         except Exception:
             LOG.exception(
                 'Swift Service ({0}): Failed to store object'.format(self.__id)
@@ -356,6 +1528,373 @@ class SwiftV1Service(base_service.BaseService):
             )
             return (201, headers, None)
 
+    @staticmethod
+    def is_valid_segment_spec(segment_spec):
+        if not (
+            isinstance(segment_spec, dict) and
+            isinstance(segment_spec.get('path'), six.string_types) and
+            isinstance(segment_spec.get('etag', ''), six.string_types + (
+                type(None),
+            ))
+        ):
+            return False
+
+        size_bytes = segment_spec.get('size_bytes')
+        if size_bytes is None:
+            return True
+
+        if isinstance(size_bytes, six.string_types):
+            return size_bytes.isdigit()
+
+        return (
+            isinstance(size_bytes, six.integer_types) and
+            not isinstance(size_bytes, bool) and
+            size_bytes >= 0
+        )
+
+    def put_manifest(
+        self, request, headers, tenantid, container_name, object_name
+    ):
+        """Store a static large object manifest
+
+        Every segment is checked against its object's stored etag and size
+        once, here; the validated list is what later requests stream.
+        """
+        try:
+            segment_specs = json.loads(SwiftV1Service.read_body_text(request))
+
+        except ValueError:
+            segment_specs = None
+
+        if not (
+            isinstance(segment_specs, list) and
+            segment_specs and
+            all(
+                SwiftV1Service.is_valid_segment_spec(segment_spec)
+                for segment_spec in segment_specs
+            )
+        ):
+            LOG.debug(
+                'Swift Service ({0}): Invalid manifest'.format(self.__id)
+            )
+            return (400, headers, 'Invalid manifest')
+
+        segments = []
+        errors = []
+        for segment_spec in segment_specs:
+            segment_container, segment_object = (
+                SwiftV1Service.split_copy_path(segment_spec['path'])
+            )
+            segment_metadata = None
+            if segment_container is not None:
+                segment_metadata = self.storage.retrieve_object_metadata(
+                    tenantid,
+                    segment_container,
+                    segment_object,
+                    check_data=True
+                )
+
+            if segment_metadata is None:
+                errors.append(
+                    '{0}, 404 Not Found'.format(segment_spec['path'])
+                )
+                continue
+
+            segment = {
+                'container': segment_container,
+                'object': segment_object,
+                'hash': segment_metadata['etag'],
+                'bytes': int(segment_metadata['content-length'])
+            }
+            if (
+                segment_spec.get('etag') is not None and
+                not SwiftV1Service.match_etag(
+                    segment_spec['etag'],
+                    segment['hash']
+                )
+            ):
+                errors.append(
+                    '{0}, Etag Mismatch'.format(segment_spec['path'])
+                )
+
+            if (
+                segment_spec.get('size_bytes') is not None and
+                int(segment_spec['size_bytes']) != segment['bytes']
+            ):
+                errors.append(
+                    '{0}, Size Mismatch'.format(segment_spec['path'])
+                )
+
+            segments.append(segment)
+
+        if errors:
+            LOG.debug(
+                'Swift Service ({0}): Invalid manifest segments {1}'.format(
+                    self.__id, errors
+                )
+            )
+            return (400, headers, 'Errors:\n{0}'.format('\n'.join(errors)))
+
+        if 'etag' in request.headers and not SwiftV1Service.match_etag(
+            request.headers['etag'],
+            SwiftStorage.get_manifest_etag(segments)
+        ):
+            return (422, headers, 'Unprocessable Entity')
+
+        metadata = CaseInsensitiveDict()
+        for k, v in six.iteritems(request.headers):
+            if (
+                k.lower().startswith('x-object-meta-') or
+                k.lower() == 'content-type'
+            ):
+                metadata[k] = v
+
+        self.storage.store_manifest(
+            tenantid,
+            container_name,
+            object_name,
+            segments,
+            metadata
+        )
+
+        headers['etag'] = metadata['etag']
+        if self.fail_error_code:
+            LOG.debug(
+                'Swift Service ({0}): Fail Mode enabled - Returning Failure '
+                'code {1}'.format(
+                    self.__id, self.fail_error_code
+                )
+            )
+            return (self.fail_error_code, headers, '')
+
+        return (201, headers, None)
+
+    def copy_object(self, request, headers, source, destination):
+        """Carry out a server side copy for COPY and X-Copy-From requests
+
+        :param source: tuple of the tenant, container and object names to
+                       copy from; the container and object are None when
+                       the request did not name one
+        :param destination: tuple of the tenant, container and object names
+                            to copy to
+        """
+        if None in source or None in destination:
+            LOG.debug(
+                'Swift Service ({0}): Invalid copy from {1} to {2}'.format(
+                    self.__id, source, destination
+                )
+            )
+            return (412, headers, 'Invalid copy source or destination')
+
+        metadata = CaseInsensitiveDict()
+        for k, v in six.iteritems(request.headers):
+            if (
+                k.lower().startswith('x-object-meta-') or
+                k.lower() == 'content-type'
+            ):
+                metadata[k] = v
+
+        fresh_metadata = request.headers.get(
+            'x-fresh-metadata', ''
+        ).lower() in ('true', '1', 'yes', 'on')
+
+        LOG.debug(
+            'Swift Service ({0}): Copying {1} to {2}'.format(
+                self.__id, source, destination
+            )
+        )
+        copied_metadata = self.storage.copy_object(
+            *(source + destination),
+            metadata=metadata,
+            fresh_metadata=fresh_metadata
+        )
+        if copied_metadata is None:
+            LOG.debug(
+                'Swift Service ({0}): Did not find the object'.format(
+                    self.__id
+                )
+            )
+            return (404, headers, 'Not found')
+
+        headers['etag'] = copied_metadata['etag']
+        headers['last-modified'] = copied_metadata['last-modified']
+        headers['x-copied-from'] = '{0}/{1}'.format(source[1], source[2])
+        headers['x-copied-from-account'] = source[0]
+
+        if self.fail_error_code:
+            LOG.debug(
+                'Swift Service ({0}): Fail Mode enabled - Returning Failure '
+                'code {1}'.format(
+                    self.__id, self.fail_error_code
+                )
+            )
+            return (self.fail_error_code, headers, '')
+
+        return (201, headers, None)
+
+    def copy_object_handler(self, request, uri, headers):
+        LOG.debug(
+            'Swift Service ({0}): Received COPY request on {1}'.format(
+                self.__id, uri
+            )
+        )
+
+        self.add_transaction(headers)
+        LOG.debug(
+            'Swift Service ({0}): Added transaction data to headers'.format(
+                self.__id
+            )
+        )
+
+        if self.fail_auth:
+            return (401, headers, 'Unauthorized')
+
+        elif (
+            self.fail_error_code is not None and
+            self.fail_error_code not in range(200, 299)
+        ):
+            return (self.fail_error_code, headers, 'mock error')
+
+        uri_path, query = SwiftV1Service.split_query(uri)
+        tenantid, container_name, object_name = SwiftV1Service.split_uri(
+            uri_path
+        )
+        LOG.debug(
+            'Swift Service ({0}): Requested T/C:O on {1}/{2}:{3}'.format(
+                self.__id, tenantid, container_name, object_name
+            )
+        )
+
+        if 'x-auth-token' not in request.headers:
+            LOG.debug(
+                'Swift Service ({0}): Missing X-Auth-Token Header'.format(
+                    self.__id
+                )
+            )
+            return (401, headers, 'Not Authorized')
+
+        dest_container, dest_object = SwiftV1Service.split_copy_path(
+            request.headers.get('destination')
+        )
+        return self.copy_object(
+            request,
+            headers,
+            (tenantid, container_name, object_name),
+            (
+                request.headers.get('destination-account', tenantid),
+                dest_container,
+                dest_object
+            )
+        )
+
+    def post_object_handler(self, request, uri, headers):
+        LOG.debug(
+            'Swift Service ({0}): Received POST request on {1}'.format(
+                self.__id, uri
+            )
+        )
+
+        self.add_transaction(headers)
+        LOG.debug(
+            'Swift Service ({0}): Added transaction data to headers'.format(
+                self.__id
+            )
+        )
+
+        if self.fail_auth:
+            return (401, headers, 'Unauthorized')
+
+        elif (
+            self.fail_error_code is not None and
+            self.fail_error_code not in range(200, 299)
+        ):
+            return (self.fail_error_code, headers, 'mock error')
+
+        uri_path, query = SwiftV1Service.split_query(uri)
+        tenantid, container_name, object_name = SwiftV1Service.split_uri(
+            uri_path
+        )
+        LOG.debug(
+            'Swift Service ({0}): Requested T/C:O on {1}/{2}:{3}'.format(
+                self.__id, tenantid, container_name, object_name
+            )
+        )
+
+        if 'x-auth-token' not in request.headers:
+            LOG.debug(
+                'Swift Service ({0}): Missing X-Auth-Token Header'.format(
+                    self.__id
+                )
+            )
+            return (401, headers, 'Not Authorized')
+
+        try:
+            delete_at = SwiftV1Service.parse_delete_at(
+                request.headers,
+                time.time()
+            )
+
+        except ValueError:
+            LOG.debug(
+                'Swift Service ({0}): Invalid object expiry'.format(self.__id)
+            )
+            return (400, headers, 'Invalid X-Delete-At or X-Delete-After')
+
+        # only the object's metadata is updated, its data is left untouched
+        metadata = CaseInsensitiveDict()
+        for k, v in six.iteritems(request.headers):
+            if k.lower().startswith('x-object-meta-'):
+                LOG.debug(
+                    'Swift Service ({0}): Updating Metadata[{1}] = {2}'.format(
+                        self.__id, k, v
+                    )
+                )
+                metadata[k] = v
+
+        try:
+            if delete_at is not None or (
+                'x-remove-delete-at' in request.headers
+            ):
+                self.storage.set_object_delete_at(
+                    tenantid,
+                    container_name,
+                    object_name,
+                    delete_at
+                )
+
+            self.storage.store_or_update_custom_metadata(
+                tenantid,
+                container_name,
+                object_name,
+                metadata
+            )
+
+        except (
+            exceptions.SwiftUnknownTenantError,
+            exceptions.SwiftUnknownContainerError,
+            exceptions.SwiftUnknownObjectError
+        ):
+            LOG.debug(
+                'Swift Service ({0}): Did not find the object'.format(
+                    self.__id
+                )
+            )
+            return (404, headers, 'Not found')
+
+        if self.fail_error_code:
+            LOG.debug(
+                'Swift Service ({0}): Fail Mode enabled - Returning Failure '
+                'code {1}'.format(
+                    self.__id, self.fail_error_code
+                )
+            )
+            return (self.fail_error_code, headers, '')
+
+        LOG.debug(
+            'Swift Service ({0}): Returning success - 202'.format(self.__id)
+        )
+        return (202, headers, None)
+
     def head_object_handler(self, request, uri, headers):
         LOG.debug(
             'Swift Service ({0}): Received HEAD request on {1}'.format(
@@ -376,23 +1915,27 @@ class SwiftV1Service(base_service.BaseService):
         elif self.fail_error_code is not None:
             return (self.fail_error_code, headers, 'mock error')
 
-        tenantid, container_name, object_name = SwiftV1Service.split_uri(uri)
+        uri_path, query = SwiftV1Service.split_query(uri)
+        tenantid, container_name, object_name = SwiftV1Service.split_uri(
+            uri_path
+        )
         LOG.debug(
             'Swift Service ({0}): Requested T/C:O on {1}/{2}:{3}'.format(
                 self.__id, tenantid, container_name, object_name
             )
         )
 
-        data, metadata = self.storage.retrieve_object(
+        metadata = self.storage.retrieve_object_metadata(
             tenantid,
             container_name,
-            object_name
+            object_name,
+            check_data=True
         )
         LOG.debug(
-            'Swift Service ({0}): Retrieved object'.format(self.__id)
+            'Swift Service ({0}): Retrieved object metadata'.format(self.__id)
         )
 
-        if data is None:
+        if metadata is None:
             LOG.debug(
                 'Swift Service ({0}): Did not find the object'.format(
                     self.__id
@@ -412,7 +1955,26 @@ class SwiftV1Service(base_service.BaseService):
                     )
                 )
 
+            status = SwiftV1Service.evaluate_conditions(
+                request.headers,
+                metadata
+            )
+            if status is not None:
+                return self.make_condition_response(status, metadata, headers)
+
             headers.update(metadata)
+            if query.get('multipart-manifest') != 'get':
+                segments = self.storage.get_manifest_segments(
+                    tenantid,
+                    metadata
+                )
+                if segments is not None:
+                    headers['content-length'] = str(
+                        sum(segment['bytes'] for segment in segments)
+                    )
+                    headers['etag'] = SwiftStorage.get_manifest_etag(
+                        segments
+                    )
 
             return (204, headers, None)
 
@@ -436,23 +1998,26 @@ class SwiftV1Service(base_service.BaseService):
         elif self.fail_error_code is not None:
             return (self.fail_error_code, headers, 'mock error')
 
-        tenantid, container_name, object_name = SwiftV1Service.split_uri(uri)
+        uri_path, query = SwiftV1Service.split_query(uri)
+        tenantid, container_name, object_name = SwiftV1Service.split_uri(
+            uri_path
+        )
         LOG.debug(
             'Swift Service ({0}): Requested T/C:O on {1}/{2}:{3}'.format(
                 self.__id, tenantid, container_name, object_name
             )
         )
 
-        data, metadata = self.storage.retrieve_object(
+        metadata = self.storage.retrieve_object_metadata(
             tenantid,
             container_name,
             object_name
         )
         LOG.debug(
-            'Swift Service ({0}): Retrieved object'.format(self.__id)
+            'Swift Service ({0}): Retrieved object metadata'.format(self.__id)
         )
 
-        if data is None:
+        if metadata is None:
             LOG.debug(
                 'Swift Service ({0}): Did not find the object'.format(
                     self.__id
@@ -466,19 +2031,9 @@ class SwiftV1Service(base_service.BaseService):
             )
 
             try:
-                self.storage.remove_custom_metadata(
-                    tenantid,
-                    container_name,
-                    object_name
-                )
-
-                LOG.debug(
-                    'Swift Service ({0}): Removed custom metadata'.format(
-                        self.__id
-                    )
-                )
-
-                self.storage.remove_object(
+                # the object's custom metadata goes with it; versioning may
+                # archive it first or restore an older version in its place
+                self.storage.remove_versioned_object(
                     tenantid,
                     container_name,
                     object_name
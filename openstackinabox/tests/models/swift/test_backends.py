@@ -0,0 +1,101 @@
+import hashlib
+import os
+import os.path
+
+import ddt
+
+from openstackinabox.tests.base import TestBase
+
+from openstackinabox.models.swift import backends
+from openstackinabox.models.swift import exceptions
+
+
+@ddt.ddt
+class TestSwiftBackends(TestBase):
+
+    def setUp(self):
+        super(TestSwiftBackends, self).setUp(initialize=False)
+        self.backends = []
+
+    def tearDown(self):
+        super(TestSwiftBackends, self).tearDown()
+        for backend in self.backends:
+            backend.cleanup()
+
+    def make_backend(self, backend_type):
+        backend = backend_type()
+        self.backends.append(backend)
+
+        directory = '{0}/tenant'.format(backend.location)
+        backend.make_directory(directory)
+        return (backend, '{0}/object'.format(directory))
+
+    @ddt.data(
+        backends.SwiftFilesystemBackend,
+        backends.SwiftMemoryBackend
+    )
+    def test_data(self, backend_type):
+        backend, path = self.make_backend(backend_type)
+        data = os.urandom(100)
+
+        self.assertTrue(backend.exists(os.path.dirname(path)))
+        self.assertFalse(backend.exists(path))
+
+        self.assertEqual(
+            backend.write(path, data, chunk_size=16),
+            (hashlib.md5(data).hexdigest(), 100)
+        )
+        self.assertTrue(backend.exists(path))
+        self.assertEqual(backend.get_size(path), 100)
+        self.assertEqual(bytes(backend.read(path)), data)
+
+        with backend.open_stream(
+            path, chunk_size=16, offset=10, length=20
+        ) as stream:
+            self.assertEqual(stream.length, 20)
+            self.assertEqual(b''.join(bytes(c) for c in stream), data[10:30])
+
+        backend.remove(path)
+        self.assertFalse(backend.exists(path))
+        for operation in (backend.get_size, backend.read, backend.remove):
+            with self.assertRaises(OSError):
+                operation(path)
+
+    @ddt.data(
+        backends.SwiftFilesystemBackend,
+        backends.SwiftMemoryBackend
+    )
+    def test_etag_mismatch(self, backend_type):
+        backend, path = self.make_backend(backend_type)
+        backend.write(path, b'original')
+
+        with self.assertRaises(exceptions.SwiftEtagMismatchError):
+            backend.write(path, b'replacement', expected_etag='bad')
+
+        self.assertEqual(bytes(backend.read(path)), b'original')
+
+        etag = hashlib.md5(b'replacement').hexdigest()
+        backend.write(
+            path,
+            b'replacement',
+            expected_etag='"{0}"'.format(etag.upper())
+        )
+        self.assertEqual(bytes(backend.read(path)), b'replacement')
+
+    def test_memory_backend(self):
+        backend, path = self.make_backend(backends.SwiftMemoryBackend)
+        self.assertIsNone(backend.storage)
+        self.assertFalse(os.path.exists(backend.location))
+
+        backend.write(path, b'data')
+        self.assertFalse(os.path.exists(path))
+
+        # readers keep the data they started with across overwrites
+        stream = backend.open_stream(path)
+        backend.write(path, b'other')
+        self.assertEqual(bytes(stream.read()), b'data')
+
+        backend.cleanup()
+        self.assertFalse(backend.exists(path))
+        self.assertFalse(backend.exists(os.path.dirname(path)))
+        self.assertEqual(backend.data, {})
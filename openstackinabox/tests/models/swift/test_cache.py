@@ -0,0 +1,74 @@
+import ddt
+
+from openstackinabox.tests.base import TestBase
+
+from openstackinabox.models.swift import cache
+
+
+@ddt.ddt
+class TestSwiftPathCache(TestBase):
+
+    def setUp(self):
+        super(TestSwiftPathCache, self).setUp(initialize=False)
+
+    def tearDown(self):
+        super(TestSwiftPathCache, self).tearDown()
+
+    @ddt.data(0, -1)
+    def test_invalid_size(self, max_size):
+        with self.assertRaises(ValueError):
+            cache.SwiftPathCache(max_size)
+
+    def test_hit_and_miss(self):
+        instance = cache.SwiftPathCache(2)
+        self.assertIsNone(instance.get('a'))
+        instance.put('a', 1)
+        self.assertEqual(instance.get('a'), 1)
+        self.assertIn('a', instance)
+
+        self.assertEqual(
+            instance.stats,
+            {
+                'size': 1,
+                'max_size': 2,
+                'hits': 1,
+                'misses': 1,
+                'evictions': 0
+            }
+        )
+
+    def test_eviction_is_least_recently_used(self):
+        instance = cache.SwiftPathCache(2)
+        instance.put('a', 1)
+        instance.put('b', 2)
+
+        # touching 'a' makes 'b' the eviction candidate
+        instance.get('a')
+        instance.put('c', 3)
+
+        self.assertEqual(len(instance), 2)
+        self.assertEqual(instance.evictions, 1)
+        self.assertIn('a', instance)
+        self.assertNotIn('b', instance)
+        self.assertIn('c', instance)
+
+    def test_put_replaces(self):
+        instance = cache.SwiftPathCache(2)
+        instance.put('a', 1)
+        instance.put('a', 2)
+        self.assertEqual(len(instance), 1)
+        self.assertEqual(instance.get('a'), 2)
+        self.assertEqual(instance.evictions, 0)
+
+    def test_invalidate_and_clear(self):
+        instance = cache.SwiftPathCache(4)
+        instance.put('a', 1)
+        instance.put('b', 2)
+
+        instance.invalidate('a')
+        instance.invalidate('missing')
+        self.assertNotIn('a', instance)
+        self.assertIn('b', instance)
+
+        instance.clear()
+        self.assertEqual(len(instance), 0)
@@ -320,3 +320,733 @@ class TestSwiftModel(TestBase):
                 internal_container_id,
                 self.object_name
             )
+
+    @ddt.data(
+        'tenant', 'container', 'object'
+    )
+    def test_resolve_object_failure(self, missing):
+        instance = model.SwiftServiceModel()
+        expected_exception = exceptions.SwiftUnknownTenantError
+        if missing != 'tenant':
+            internal_tenant_id = instance.add_tenant(
+                self.tenant_id,
+                self.tenant_path
+            )
+            expected_exception = exceptions.SwiftUnknownContainerError
+
+            if missing != 'container':
+                instance.add_container(
+                    internal_tenant_id,
+                    self.container_name,
+                    self.container_path
+                )
+                expected_exception = exceptions.SwiftUnknownObjectError
+
+        with self.assertRaises(expected_exception):
+            instance.resolve_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+
+    def test_resolve_object(self):
+        instance = model.SwiftServiceModel()
+        internal_tenant_id = instance.add_tenant(
+            self.tenant_id,
+            self.tenant_path
+        )
+        internal_container_id = instance.add_container(
+            internal_tenant_id,
+            self.container_name,
+            self.container_path
+        )
+        internal_object_id = instance.add_object(
+            internal_tenant_id,
+            internal_container_id,
+            self.object_name,
+            self.object_path
+        )
+
+        self.assertEqual(
+            instance.resolve_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            ),
+            instance.get_object(
+                internal_tenant_id,
+                internal_container_id,
+                internal_object_id
+            )
+        )
+
+    def test_add_is_upsert(self):
+        instance = model.SwiftServiceModel()
+        internal_tenant_id = instance.add_tenant(
+            self.tenant_id,
+            self.tenant_path
+        )
+        internal_container_id = instance.add_container(
+            internal_tenant_id,
+            self.container_name,
+            self.container_path
+        )
+        internal_object_id = instance.add_object(
+            internal_tenant_id,
+            internal_container_id,
+            self.object_name,
+            self.object_path
+        )
+
+        new_path = '{0}_new'.format(self.object_path)
+        for ignored in range(3):
+            self.assertEqual(
+                instance.add_tenant(self.tenant_id, self.tenant_path),
+                internal_tenant_id
+            )
+            self.assertEqual(
+                instance.add_container(
+                    internal_tenant_id,
+                    self.container_name,
+                    self.container_path
+                ),
+                internal_container_id
+            )
+            self.assertEqual(
+                instance.add_object(
+                    internal_tenant_id,
+                    internal_container_id,
+                    self.object_name,
+                    new_path
+                ),
+                internal_object_id
+            )
+
+        for table in ('swift_tenants', 'swift_containers', 'swift_objects'):
+            cursor = instance.database.cursor()
+            cursor.execute('SELECT COUNT(*) FROM {0}'.format(table))
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+        self.assertEqual(
+            instance.get_object(
+                internal_tenant_id,
+                internal_container_id,
+                internal_object_id
+            )['path'],
+            new_path
+        )
+
+    @ddt.data(
+        (model.SQL_HAS_TENANT, 'swift_tenants_tenantid'),
+        (model.SQL_HAS_CONTAINER, 'swift_containers_container_name'),
+        (model.SQL_HAS_OBJECT, 'swift_objects_object_name'),
+        (model.SQL_RESOLVE_OBJECT, 'swift_objects_object_name'),
+        (model.SQL_GET_BLOB, 'swift_blobs_etag'),
+        (model.SQL_LIST_UNREFERENCED_BLOBS, 'swift_blobs_unreferenced'),
+        (model.SQL_GET_NEXT_DELETE_AT, 'swift_objects_delete_at'),
+        (model.SQL_LIST_EXPIRED_OBJECTS, 'swift_objects_delete_at'),
+    )
+    @ddt.unpack
+    def test_lookups_use_indexes(self, query, index_name):
+        instance = model.SwiftServiceModel()
+        cursor = instance.database.cursor()
+        cursor.execute(
+            'EXPLAIN QUERY PLAN {0}'.format(query),
+            {
+                'tenantid': self.tenant_id,
+                'containerid': 1,
+                'container_name': self.container_name,
+                'object_name': self.object_name,
+                'etag': 'etag',
+                'now': 1000,
+                'limit': 10
+            }
+        )
+        plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn(index_name, plan)
+        self.assertNotIn('SCAN', plan)
+
+    def test_add_objects(self):
+        instance = model.SwiftServiceModel()
+        internal_tenant_id = instance.add_tenant(
+            self.tenant_id,
+            self.tenant_path
+        )
+        internal_container_id = instance.add_container(
+            internal_tenant_id,
+            self.container_name,
+            self.container_path
+        )
+
+        object_names = [
+            '{0}_{1}'.format(self.object_name, index)
+            for index in range(10)
+        ]
+        instance.add_objects(
+            {
+                'tenantid': internal_tenant_id,
+                'containerid': internal_container_id,
+                'object_name': object_name,
+                'path': '{0}/{1}'.format(self.container_path, object_name)
+            }
+            for object_name in object_names + object_names[:3]
+        )
+
+        for object_name in object_names:
+            self.assertEqual(
+                instance.resolve_object(
+                    self.tenant_id,
+                    self.container_name,
+                    object_name
+                )['path'],
+                '{0}/{1}'.format(self.container_path, object_name)
+            )
+
+        cursor = instance.database.cursor()
+        cursor.execute('SELECT COUNT(*) FROM swift_objects')
+        self.assertEqual(cursor.fetchone()[0], len(object_names))
+
+    def test_batch(self):
+        instance = model.SwiftServiceModel()
+        self.assertFalse(instance.in_batch)
+
+        with instance.batch():
+            self.assertTrue(instance.in_batch)
+            internal_tenant_id = instance.add_tenant(
+                self.tenant_id,
+                self.tenant_path
+            )
+            with instance.batch():
+                internal_container_id = instance.add_container(
+                    internal_tenant_id,
+                    self.container_name,
+                    self.container_path
+                )
+
+            self.assertTrue(instance.in_batch)
+            self.assertTrue(instance.database.in_transaction)
+            internal_object_id = instance.add_object(
+                internal_tenant_id,
+                internal_container_id,
+                self.object_name,
+                self.object_path
+            )
+
+        self.assertFalse(instance.in_batch)
+        self.assertFalse(instance.database.in_transaction)
+        self.assertEqual(
+            instance.has_tenant(self.tenant_id),
+            internal_tenant_id
+        )
+        self.assertEqual(
+            instance.has_container(internal_tenant_id, self.container_name),
+            internal_container_id
+        )
+        self.assertEqual(
+            instance.has_object(
+                internal_tenant_id,
+                internal_container_id,
+                self.object_name
+            ),
+            internal_object_id
+        )
+
+    def test_batch_rollback(self):
+        instance = model.SwiftServiceModel()
+
+        with self.assertRaises(RuntimeError):
+            with instance.batch():
+                instance.add_tenant(self.tenant_id, self.tenant_path)
+                raise RuntimeError('mock failure')
+
+        self.assertFalse(instance.in_batch)
+        with self.assertRaises(exceptions.SwiftUnknownTenantError):
+            instance.has_tenant(self.tenant_id)
+
+    def test_add_uses_lastrowid(self):
+        instance = model.SwiftServiceModel()
+        with mock.patch.object(
+            instance,
+            'has_tenant',
+            wraps=instance.has_tenant
+        ) as mock_has_tenant:
+            first_id = instance.add_tenant(self.tenant_id, self.tenant_path)
+            mock_has_tenant.assert_not_called()
+
+            # an existing tenant falls back to looking up its id
+            self.assertEqual(
+                instance.add_tenant(self.tenant_id, self.tenant_path),
+                first_id
+            )
+            mock_has_tenant.assert_called_once_with(self.tenant_id)
+
+    def make_listing(self, object_names):
+        instance = model.SwiftServiceModel()
+        internal_tenant_id = instance.add_tenant(
+            self.tenant_id,
+            self.tenant_path
+        )
+        internal_container_id = instance.add_container(
+            internal_tenant_id,
+            self.container_name,
+            self.container_path
+        )
+        instance.add_objects(
+            {
+                'tenantid': internal_tenant_id,
+                'containerid': internal_container_id,
+                'object_name': object_name,
+                'path': '{0}/{1}'.format(self.container_path, object_name)
+            }
+            for object_name in object_names
+        )
+        return (instance, internal_tenant_id, internal_container_id)
+
+    @ddt.data(
+        ({}, ['a', 'a/b', 'a/c', 'ab', 'b', 'c']),
+        ({'limit': 2}, ['a', 'a/b']),
+        ({'marker': 'a/b'}, ['a/c', 'ab', 'b', 'c']),
+        ({'end_marker': 'ab'}, ['a', 'a/b', 'a/c']),
+        ({'marker': 'a', 'end_marker': 'b'}, ['a/b', 'a/c', 'ab']),
+        ({'prefix': 'a/'}, ['a/b', 'a/c']),
+        ({'prefix': 'a'}, ['a', 'a/b', 'a/c', 'ab']),
+        ({'start': 'a0'}, ['ab', 'b', 'c']),
+        ({'prefix': 'a', 'marker': 'a/b', 'limit': 1}, ['a/c']),
+    )
+    @ddt.unpack
+    def test_list_objects(self, kwargs, expected_names):
+        instance, internal_tenant_id, internal_container_id = (
+            self.make_listing(['c', 'a/c', 'b', 'ab', 'a/b', 'a'])
+        )
+
+        listing = instance.list_objects(
+            internal_tenant_id,
+            internal_container_id,
+            **kwargs
+        )
+        self.assertEqual(
+            [entry['object_name'] for entry in listing],
+            expected_names
+        )
+        for entry in listing:
+            self.assertEqual(
+                entry['path'],
+                '{0}/{1}'.format(self.container_path, entry['object_name'])
+            )
+
+    @ddt.data(
+        (u'a', u'b'),
+        (u'a/', u'a0'),
+        (u'a\ud7ff', u'a\ue000'),
+        (u'a\U0010ffff', u'b'),
+        (u'\U0010ffff\U0010ffff', None),
+    )
+    @ddt.unpack
+    def test_get_name_successor(self, name, expected_successor):
+        self.assertEqual(model.get_name_successor(name), expected_successor)
+
+    @ddt.data(
+        (u'\ud7ff', [u'\ud7ff', u'\ud7ffa']),
+        (u'\U0010ffff', [u'\U0010ffff', u'\U0010ffffa']),
+        (u'\ue000', [u'\ue000']),
+    )
+    @ddt.unpack
+    def test_list_objects_prefix_bounds(self, prefix, expected_names):
+        instance, internal_tenant_id, internal_container_id = (
+            self.make_listing([
+                u'\ud7fe', u'\ud7ff', u'\ud7ffa', u'\ue000',
+                u'\U0010ffff', u'\U0010ffffa'
+            ])
+        )
+
+        listing = instance.list_objects(
+            internal_tenant_id,
+            internal_container_id,
+            prefix=prefix
+        )
+        self.assertEqual(
+            [entry['object_name'] for entry in listing],
+            expected_names
+        )
+
+    @ddt.data(
+        (
+            model.SQL_LIST_OBJECTS.format('AND object_name > :marker'),
+            'swift_objects_object_name'
+        ),
+        (
+            model.SQL_LIST_CONTAINERS.format('AND container_name > :marker'),
+            'swift_containers_container_name'
+        ),
+        (
+            model.SQL_GET_LAST_OBJECT.format('AND object_name > :marker'),
+            'swift_objects_object_name'
+        ),
+    )
+    @ddt.unpack
+    def test_listings_use_indexes(self, query, index_name):
+        instance = model.SwiftServiceModel()
+        cursor = instance.database.cursor()
+        cursor.execute(
+            'EXPLAIN QUERY PLAN {0}'.format(query),
+            {
+                'tenantid': 1,
+                'containerid': 1,
+                'marker': self.object_name,
+                'limit': 10
+            }
+        )
+        plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn(index_name, plan)
+        self.assertNotIn('SCAN', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    @ddt.data(
+        (None, 'c'),
+        ('a', 'ab'),
+        ('a/', 'a/c'),
+        ('d', None),
+    )
+    @ddt.unpack
+    def test_get_last_object(self, prefix, expected_name):
+        instance, internal_tenant_id, internal_container_id = (
+            self.make_listing(['c', 'a/c', 'b', 'ab', 'a/b', 'a'])
+        )
+
+        entry = instance.get_last_object(
+            internal_tenant_id,
+            internal_container_id,
+            prefix=prefix
+        )
+        if expected_name is None:
+            self.assertIsNone(entry)
+
+        else:
+            self.assertEqual(entry['object_name'], expected_name)
+
+    def test_remove_container(self):
+        instance = model.SwiftServiceModel()
+        internal_tenant_id = instance.add_tenant(
+            self.tenant_id,
+            self.tenant_path
+        )
+        internal_container_id = instance.add_container(
+            internal_tenant_id,
+            self.container_name,
+            self.container_path
+        )
+        internal_object_id = instance.add_object(
+            internal_tenant_id,
+            internal_container_id,
+            self.object_name,
+            self.object_path,
+            100
+        )
+
+        with self.assertRaises(exceptions.SwiftContainerNotEmptyError):
+            instance.remove_container(
+                internal_tenant_id,
+                internal_container_id
+            )
+
+        instance.remove_object(
+            internal_tenant_id,
+            internal_container_id,
+            internal_object_id
+        )
+        instance.remove_container(internal_tenant_id, internal_container_id)
+        self.assertEqual(
+            instance.get_tenant(internal_tenant_id)['container_count'],
+            0
+        )
+        with self.assertRaises(exceptions.SwiftUnknownContainerError):
+            instance.remove_container(
+                internal_tenant_id,
+                internal_container_id
+            )
+
+    def test_usage_counters(self):
+        instance = model.SwiftServiceModel()
+        internal_tenant_id = instance.add_tenant(
+            self.tenant_id,
+            self.tenant_path
+        )
+        internal_container_id = instance.add_container(
+            internal_tenant_id,
+            self.container_name,
+            self.container_path
+        )
+        other_container_id = instance.add_container(
+            internal_tenant_id,
+            'other',
+            '{0}/other'.format(self.tenant_path)
+        )
+        instance.add_container(
+            internal_tenant_id,
+            self.container_name,
+            self.container_path
+        )
+
+        def assert_usage(containers, objects, bytes_used, other=(0, 0)):
+            tenant_data = instance.get_tenant(internal_tenant_id)
+            self.assertEqual(tenant_data['container_count'], containers)
+            self.assertEqual(tenant_data['object_count'], objects)
+            self.assertEqual(tenant_data['bytes_used'], bytes_used)
+
+            container_data = instance.get_container(
+                internal_tenant_id,
+                internal_container_id
+            )
+            self.assertEqual(
+                container_data['object_count'],
+                objects - other[0]
+            )
+            self.assertEqual(
+                container_data['bytes_used'],
+                bytes_used - other[1]
+            )
+
+        assert_usage(2, 0, 0)
+
+        internal_object_id = instance.add_object(
+            internal_tenant_id,
+            internal_container_id,
+            self.object_name,
+            self.object_path,
+            100
+        )
+        assert_usage(2, 1, 100)
+
+        # overwriting an object only applies the change in size
+        instance.add_object(
+            internal_tenant_id,
+            internal_container_id,
+            self.object_name,
+            self.object_path,
+            40
+        )
+        assert_usage(2, 1, 40)
+
+        instance.add_object(
+            internal_tenant_id,
+            other_container_id,
+            self.object_name,
+            self.object_path,
+            7
+        )
+        assert_usage(2, 2, 47, other=(1, 7))
+
+        instance.remove_object(
+            internal_tenant_id,
+            internal_container_id,
+            internal_object_id
+        )
+        assert_usage(2, 1, 7, other=(1, 7))
+
+        # removing an unknown object leaves the counters alone
+        instance.remove_object(
+            internal_tenant_id,
+            internal_container_id,
+            internal_object_id
+        )
+        assert_usage(2, 1, 7, other=(1, 7))
+
+    @ddt.data(
+        ({}, ['a', 'a/b', 'b']),
+        ({'marker': 'a'}, ['a/b', 'b']),
+        ({'prefix': 'a', 'limit': 1}, ['a']),
+    )
+    @ddt.unpack
+    def test_list_containers(self, kwargs, expected_names):
+        instance = model.SwiftServiceModel()
+        internal_tenant_id = instance.add_tenant(
+            self.tenant_id,
+            self.tenant_path
+        )
+        for container_name in ('b', 'a/b', 'a'):
+            internal_container_id = instance.add_container(
+                internal_tenant_id,
+                container_name,
+                '{0}/{1}'.format(self.tenant_path, container_name)
+            )
+            instance.add_object(
+                internal_tenant_id,
+                internal_container_id,
+                self.object_name,
+                self.object_path,
+                len(container_name)
+            )
+
+        listing = instance.list_containers(internal_tenant_id, **kwargs)
+        self.assertEqual(
+            [entry['container_name'] for entry in listing],
+            expected_names
+        )
+        for entry in listing:
+            self.assertEqual(entry['object_count'], 1)
+            self.assertEqual(entry['bytes_used'], len(entry['container_name']))
+
+    def test_blob_references(self):
+        instance = model.SwiftServiceModel()
+        internal_tenant_id = instance.add_tenant(
+            self.tenant_id,
+            self.tenant_path
+        )
+        internal_container_id = instance.add_container(
+            internal_tenant_id,
+            self.container_name,
+            self.container_path
+        )
+
+        with self.assertRaises(exceptions.SwiftUnknownBlobError):
+            instance.get_blob('etag')
+
+        blobid = instance.add_blob('etag', '/blobs/etag', 10)
+        self.assertEqual(instance.add_blob('etag', '/blobs/other', 5), blobid)
+        other_blobid = instance.add_blob('other', '/blobs/other', 5)
+
+        def assert_references(references, other_references):
+            self.assertEqual(
+                instance.get_blob('etag'),
+                {
+                    'blobid': blobid,
+                    'etag': 'etag',
+                    'path': '/blobs/etag',
+                    'bytes': 10,
+                    'refcount': references
+                }
+            )
+            self.assertEqual(
+                instance.get_blob('other')['refcount'],
+                other_references
+            )
+
+        assert_references(0, 0)
+
+        object_ids = [
+            instance.add_object(
+                internal_tenant_id,
+                internal_container_id,
+                'object{0}'.format(index),
+                '{0}{1}'.format(self.object_path, index),
+                10,
+                blobid
+            )
+            for index in range(3)
+        ]
+        assert_references(3, 0)
+        self.assertEqual(
+            instance.resolve_object(
+                self.tenant_id,
+                self.container_name,
+                'object0'
+            )['blobid'],
+            blobid
+        )
+
+        # replacing an object moves its reference to the new blob
+        instance.add_object(
+            internal_tenant_id,
+            internal_container_id,
+            'object0',
+            '{0}0'.format(self.object_path),
+            5,
+            other_blobid
+        )
+        assert_references(2, 1)
+
+        for object_id in object_ids[1:]:
+            instance.remove_object(
+                internal_tenant_id,
+                internal_container_id,
+                object_id
+            )
+        assert_references(0, 1)
+
+        self.assertEqual(
+            instance.remove_unreferenced_blobs(),
+            ['/blobs/etag']
+        )
+        self.assertEqual(instance.remove_unreferenced_blobs(), [])
+        with self.assertRaises(exceptions.SwiftUnknownBlobError):
+            instance.get_blob('etag')
+
+        self.assertEqual(instance.get_blob('other')['refcount'], 1)
+
+    def test_expired_objects(self):
+        instance = model.SwiftServiceModel()
+        internal_tenant_id = instance.add_tenant(
+            self.tenant_id,
+            self.tenant_path
+        )
+        internal_container_id = instance.add_container(
+            internal_tenant_id,
+            self.container_name,
+            self.container_path
+        )
+        self.assertIsNone(instance.get_next_delete_at())
+
+        object_ids = {}
+        for object_name, delete_at in (
+            ('forever', None),
+            ('late', 300),
+            ('early', 100),
+            ('middle', 200),
+        ):
+            object_ids[object_name] = instance.add_object(
+                internal_tenant_id,
+                internal_container_id,
+                object_name,
+                '{0}/{1}'.format(self.container_path, object_name),
+                delete_at=delete_at
+            )
+
+        self.assertEqual(instance.get_next_delete_at(), 100)
+        self.assertEqual(instance.list_expired_objects(99), [])
+        self.assertEqual(
+            instance.list_expired_objects(200),
+            [
+                (self.tenant_id, self.container_name, 'early'),
+                (self.tenant_id, self.container_name, 'middle')
+            ]
+        )
+        self.assertEqual(
+            instance.list_expired_objects(1000, limit=1),
+            [(self.tenant_id, self.container_name, 'early')]
+        )
+
+        # replacing an object without an expiry clears it
+        instance.add_object(
+            internal_tenant_id,
+            internal_container_id,
+            'early',
+            '{0}/early'.format(self.container_path)
+        )
+        self.assertEqual(instance.get_next_delete_at(), 200)
+
+        instance.set_object_delete_at(
+            internal_tenant_id,
+            internal_container_id,
+            object_ids['forever'],
+            50
+        )
+        instance.set_object_delete_at(
+            internal_tenant_id,
+            internal_container_id,
+            object_ids['middle'],
+            None
+        )
+        self.assertEqual(
+            instance.list_expired_objects(1000),
+            [
+                (self.tenant_id, self.container_name, 'forever'),
+                (self.tenant_id, self.container_name, 'late')
+            ]
+        )
+
+        instance.remove_object(
+            internal_tenant_id,
+            internal_container_id,
+            object_ids['forever']
+        )
+        self.assertEqual(instance.get_next_delete_at(), 300)
@@ -1,5 +1,6 @@
 import copy
 import hashlib
+import io
 import os
 import os.path
 import tempfile
@@ -12,9 +13,12 @@ from stackinabox.util.tools import CaseInsensitiveDict
 
 from openstackinabox.tests.base import TestBase
 
+from openstackinabox.models.swift import backends
+from openstackinabox.models.swift import cache
 from openstackinabox.models.swift import exceptions
 from openstackinabox.models.swift import model
 from openstackinabox.models.swift import storage
+from openstackinabox.models.swift import streams
 from openstackinabox.utils.directory import TemporaryDirectory
 
 
@@ -104,6 +108,29 @@ class TestSwiftStorageInstance(TestSwiftStorageBase):
         self.assertTrue(os.path.exists(instance.location))
         self.assertEqual(instance.metadata, {})
         self.assertEqual(instance.custom_metadata, {})
+        self.assertIsNone(instance.cache)
+        self.assertIsNone(instance.cache_size)
+        self.assertEqual(instance.layout, storage.LAYOUT_FLAT)
+
+    def test_invalid_layout(self):
+        with self.assertRaises(ValueError):
+            storage.SwiftStorage(
+                self.service_id,
+                self.model,
+                layout='unknown'
+            )
+
+    def test_cache_size(self):
+        instance = storage.SwiftStorage(
+            self.service_id,
+            self.model,
+            cache_size=10
+        )
+        self.assertIsInstance(instance.cache, cache.SwiftPathCache)
+        self.assertEqual(instance.cache_size, 10)
+
+        instance.cache_size = None
+        self.assertIsNone(instance.cache)
 
 
 @ddt.ddt
@@ -179,6 +206,68 @@ class TestSwiftStoragePaths(TestSwiftStorageBase):
             self.object_path
         )
 
+    @ddt.data(
+        ('object', 'object'),
+        ('hello world', 'hello%20world'),
+        ('a/b', 'a%2Fb'),
+        ('.', '%2E'),
+        ('..', '%2E%2E'),
+        ('...', '...'),
+        ('../..', '..%2F..'),
+        ('%2E', '%252E'),
+    )
+    @ddt.unpack
+    def test_get_path_name(self, name, expected_path_name):
+        self.assertEqual(
+            storage.SwiftStorage.get_path_name(name),
+            expected_path_name
+        )
+
+    def test_new_object_path_contained(self):
+        instance = storage.SwiftStorage(
+            self.service_id,
+            self.model
+        )
+        container_path = instance.get_container_path(
+            self.tenant_id,
+            self.container_name
+        )
+
+        # no name leaves its container's directory or shares a path
+        object_names = [
+            'object', '.', '..', '../object', '../../../tmp/escaped',
+            'a/../object', 'a/b', 'a%2Fb', '/object'
+        ]
+        paths = [
+            instance.get_new_object_path(
+                self.tenant_id,
+                self.container_name,
+                object_name
+            )
+            for object_name in object_names
+        ]
+        self.assertEqual(len(set(paths)), len(object_names))
+        for path in paths:
+            self.assertEqual(
+                os.path.dirname(os.path.normpath(path)),
+                container_path
+            )
+
+        for tenant_id, container_name in (('..', 'c'), ('t', '../..')):
+            self.assertEqual(
+                os.path.dirname(
+                    os.path.dirname(
+                        os.path.normpath(
+                            instance.get_container_path(
+                                tenant_id,
+                                container_name
+                            )
+                        )
+                    )
+                ),
+                instance.location
+            )
+
     @ddt.data(
         ('tenantid', exceptions.SwiftUnknownTenantError),
         ('container_name', exceptions.SwiftUnknownContainerError),
@@ -481,13 +570,11 @@ class TestSwiftStorageObject(TestSwiftStorageBase):
             self.create_object_file(object_data_file.name, 10)
 
             expected_file_size = os.path.getsize(object_data_file.name)
-            expected_etag = self.instance.get_file_etag(object_data_file.name)
             expected_metadata = CaseInsensitiveDict()
             expected_metadata.update(
                 {
                     'content-length': str(expected_file_size),
                     'content-type': 'application/binary',
-                    'etag': expected_etag
                 }
             )
 
@@ -522,9 +609,93 @@ class TestSwiftStorageObject(TestSwiftStorageBase):
             self.assertEqual(mso_args[4], expected_metadata)
             self.assertEqual(mso_args[5], expected_file_size)
             self.assertEqual(mso_args[6], allow_file_size_mismatch)
+            self.assertEqual(mso_kwargs, {'link': False})
 
             self.assertTrue(hasattr(mso_args[3], 'read'))
 
+    @ddt.data(
+        False,
+        True
+    )
+    def test_load_object_from_file_single_pass(self, link):
+        # keep the source on the same filesystem so it can be linked
+        source_file = '{0}/source-{1}'.format(
+            self.instance.location,
+            str(uuid.uuid4())
+        )
+        self.create_object_file(source_file, 10)
+        with open(source_file, 'rb') as data_input:
+            expected_data = data_input.read()
+
+        self.instance.load_object_from_file(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            source_file,
+            link=link
+        )
+
+        object_path = self.instance.get_object_path(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        )
+        self.assertEqual(
+            self.instance.metadata[object_path]['etag'],
+            storage.SwiftStorage.get_etag(expected_data)
+        )
+        with open(object_path, 'rb') as data_input:
+            self.assertEqual(data_input.read(), expected_data)
+
+        self.assertEqual(
+            os.path.samefile(source_file, object_path),
+            link
+        )
+
+        # overwriting the object must never modify a linked source
+        self.instance.load_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            b'new data'
+        )
+        with open(source_file, 'rb') as data_input:
+            self.assertEqual(data_input.read(), expected_data)
+
+        self.assertEqual(
+            [
+                name
+                for name in os.listdir(os.path.dirname(object_path))
+                if name.startswith('.tmp-')
+            ],
+            []
+        )
+
+    @mock.patch('os.link')
+    def test_load_object_from_file_link_failure(self, mock_os_link):
+        mock_os_link.side_effect = OSError('cross-device link')
+        object_data_file = tempfile.NamedTemporaryFile()
+        self.create_object_file(object_data_file.name, 10)
+
+        self.instance.load_object_from_file(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            object_data_file.name,
+            link=True
+        )
+
+        mock_os_link.assert_called_once()
+        object_path = self.instance.get_object_path(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        )
+        self.assertEqual(
+            self.instance.metadata[object_path]['etag'],
+            storage.SwiftStorage.get_file_etag(object_data_file.name)
+        )
+
     @ddt.data(
         (False, False, False),
         (False, True, False),
@@ -604,6 +775,89 @@ class TestSwiftStorageObject(TestSwiftStorageBase):
                 self.assertEqual(mso_args[5], expected_file_size)
                 self.assertEqual(mso_args[6], allow_file_size_mismatch)
 
+    @ddt.data(
+        None,
+        1,
+        4
+    )
+    def test_load_objects(self, workers):
+        object_data_file = tempfile.NamedTemporaryFile()
+        self.create_object_file(object_data_file.name, 10)
+        with open(object_data_file.name, 'rb') as data_input:
+            file_data = data_input.read()
+
+        expected_data = {}
+        object_specs = []
+        for index in range(20):
+            container_name = '{0}_{1}'.format(self.container_name, index % 3)
+            object_name = 'object_{0}'.format(index)
+            if index % 2:
+                spec = {
+                    'file_name': object_data_file.name
+                }
+                expected_data[(container_name, object_name)] = file_data
+
+            else:
+                spec = {
+                    'content': os.urandom(index * 100),
+                    'content_type': 'text/plain'
+                }
+                expected_data[(container_name, object_name)] = (
+                    spec['content']
+                )
+
+            spec.update({
+                'tenantid': self.tenant_id,
+                'container_name': container_name,
+                'object_name': object_name
+            })
+            object_specs.append(spec)
+
+        add_object = self.model.add_object
+        batched_calls = []
+
+        def check_add_object(*args, **kwargs):
+            batched_calls.append(self.model.in_batch)
+            return add_object(*args, **kwargs)
+
+        with mock.patch.object(
+            self.model,
+            'add_object',
+            side_effect=check_add_object
+        ):
+            with mock.patch.object(
+                self.model,
+                'add_objects',
+                wraps=self.model.add_objects
+            ) as mock_add_objects:
+                self.instance.load_objects(object_specs, workers=workers)
+
+            mock_add_objects.assert_called_once()
+
+        # every object row is written inside the single batch transaction
+        self.assertEqual(batched_calls, [True] * len(object_specs))
+
+        for spec in object_specs:
+            key = (spec['container_name'], spec['object_name'])
+            data, metadata = self.instance.retrieve_object(
+                self.tenant_id,
+                spec['container_name'],
+                spec['object_name']
+            )
+            self.assertEqual(data.read(), expected_data[key])
+            self.assertEqual(
+                metadata['etag'],
+                storage.SwiftStorage.get_etag(expected_data[key])
+            )
+            self.assertEqual(
+                metadata['content-length'],
+                str(len(expected_data[key]))
+            )
+            self.assertEqual(
+                metadata['content-type'],
+                spec.get('content_type', 'application/binary')
+            )
+
     @ddt.data(
         False,
         True
@@ -946,17 +1200,15 @@ class TestSwiftStorageObject(TestSwiftStorageBase):
         self.assertIsNone(metadata)
 
     @mock.patch(
-        'openstackinabox.models.swift.storage.SwiftStorage.get_object_path'
+        'openstackinabox.models.swift.storage.SwiftStorage.resolve_object'
     )
-    @mock.patch('openstackinabox.models.swift.storage.SwiftStorage.has_object')
-    def test_retrieve_object_failure_2(
-        self, mock_has_object, mock_get_object_path
-    ):
+    def test_retrieve_object_failure_2(self, mock_resolve_object):
         object_path = '/dev/null/{0}'.format(
             str(uuid.uuid4()).replace('-', '')
         )
-        mock_has_object.return_value = True
-        mock_get_object_path.return_value = object_path
+        mock_resolve_object.return_value = {
+            'path': object_path
+        }
 
         self.instance.metadata[object_path] = {
             'content-length': 2048
@@ -982,23 +1234,20 @@ class TestSwiftStorageObject(TestSwiftStorageBase):
     )
     @ddt.unpack
     @mock.patch(
-        'openstackinabox.models.swift.storage.SwiftStorage.get_object_path'
+        'openstackinabox.models.swift.storage.SwiftStorage.resolve_object'
     )
-    @mock.patch('openstackinabox.models.swift.storage.SwiftStorage.has_object')
     def test_retrieve_object(
         self,
         has_custom_metadata, has_path_in_metadata,
-        mock_has_object, mock_get_object_path
+        mock_resolve_object
     ):
         temp_file = tempfile.NamedTemporaryFile()
         object_path = temp_file.name
         self.create_object_file(object_path, 2048)
 
-        mock_has_object.return_value = True
-        mock_get_object_path.side_effect = [
-            object_path,
-            object_path
-        ]
+        mock_resolve_object.return_value = {
+            'path': object_path
+        }
 
         metadata = {
             'content-length': 2048
@@ -1018,35 +1267,234 @@ class TestSwiftStorageObject(TestSwiftStorageBase):
             self.container_name,
             self.object_name
         )
+        mock_resolve_object.assert_called_once_with(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        )
+
+        with open(object_path, 'rb') as data_input:
+            self.assertEqual(result_data.read(), data_input.read())
+
+        expected_metadata = CaseInsensitiveDict()
+        if has_path_in_metadata:
+            expected_metadata.update(metadata)
+        if has_custom_metadata:
+            expected_metadata.update(custom_metadata)
+        self.assertEqual(result_metadata, expected_metadata)
+
+    @ddt.data(
+        False,
+        True
+    )
+    def test_retrieve_object_stream(self, stream):
+        content = os.urandom(4096)
+        metadata = {
+            'content-length': len(content)
+        }
+        self.instance.store_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            content,
+            metadata
+        )
+
+        result_data, result_metadata = self.instance.retrieve_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            stream=stream
+        )
+        if stream:
+            self.assertIsInstance(result_data, streams.SwiftObjectStream)
+            self.assertEqual(result_data.length, len(content))
+            self.assertEqual(b''.join(result_data), content)
+            self.assertTrue(result_data.closed)
+        else:
+            self.assertEqual(result_data.read(), content)
+
+        self.assertEqual(result_metadata['content-length'], len(content))
+
+    @ddt.data(
+        (None, 4096, streams.SwiftObjectStream),
+        (4097, 4096, streams.SwiftObjectStream),
+        (4096, 4096, streams.SwiftObjectMemoryMap),
+        (0, 4096, streams.SwiftObjectMemoryMap),
+        (0, 0, streams.SwiftObjectStream),
+    )
+    @ddt.unpack
+    def test_open_object_stream(self, mmap_threshold, size, expected_type):
+        self.instance.mmap_threshold = mmap_threshold
+        content = os.urandom(size)
+        self.instance.store_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            content,
+            {
+                'content-length': len(content)
+            }
+        )
+
+        data = self.instance.open_object_stream(
+            self.instance.get_object_path(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+        )
+        self.assertIsInstance(data, expected_type)
+        self.assertEqual(b''.join(data), content)
+
+    def test_resolve_object_cached(self):
+        self.instance.cache_size = 10
+        content = os.urandom(16)
+        self.instance.store_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            content,
+            {
+                'content-length': len(content)
+            }
+        )
+
+        self.instance.cache.clear()
+        initial_misses = self.instance.cache.misses
+        initial_hits = self.instance.cache.hits
+
+        with mock.patch.object(
+            self.model,
+            'resolve_object',
+            wraps=self.model.resolve_object
+        ) as mock_resolve_object:
+            for ignored in range(5):
+                object_info = self.instance.resolve_object(
+                    self.tenant_id,
+                    self.container_name,
+                    self.object_name
+                )
+
+            mock_resolve_object.assert_called_once()
+
+        self.assertEqual(self.instance.cache.misses - initial_misses, 1)
+        self.assertEqual(self.instance.cache.hits - initial_hits, 4)
+        self.assertEqual(
+            object_info['path'],
+            self.instance.get_object_path(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+        )
+
+    @ddt.data(
+        'store', 'remove'
+    )
+    def test_resolve_object_cache_invalidation(self, operation):
+        self.instance.cache_size = 10
+        content = os.urandom(16)
+        metadata = {
+            'content-length': len(content)
+        }
+        self.instance.store_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            content,
+            metadata
+        )
+        self.instance.resolve_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        )
+        key = (self.tenant_id, self.container_name, self.object_name)
+        self.assertIn(key, self.instance.cache)
+
+        if operation == 'store':
+            self.instance.store_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name,
+                content,
+                metadata
+            )
+            self.assertNotIn(key, self.instance.cache)
+
+        else:
+            self.instance.remove_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+            self.assertNotIn(key, self.instance.cache)
+            with self.assertRaises(exceptions.SwiftUnknownObjectError):
+                self.instance.resolve_object(
+                    self.tenant_id,
+                    self.container_name,
+                    self.object_name
+                )
 
-    @mock.patch('openstackinabox.models.swift.storage.SwiftStorage.has_object')
-    def test_remove_object_no_object(self, mock_has_object):
-        mock_has_object.return_value = False
+    @mock.patch('os.remove')
+    def test_remove_object_no_object(self, mock_os_remove):
         self.instance.remove_object(
             self.tenant_id,
             self.container_name,
             self.object_name
         )
 
+        mock_os_remove.assert_not_called()
+
     @mock.patch(
-        'openstackinabox.models.swift.storage.SwiftStorage.get_object_path'
+        'openstackinabox.models.swift.storage.SwiftStorage.resolve_object'
     )
-    @mock.patch('openstackinabox.models.swift.storage.SwiftStorage.has_object')
     @mock.patch('os.remove')
-    def test_remove_object(
-        self, mock_os_remove, mock_has_object, mock_get_object_path
-    ):
+    def test_remove_object(self, mock_os_remove, mock_resolve_object):
         object_data_file = tempfile.NamedTemporaryFile()
         self.create_object_file(object_data_file.name, 5)
-        self.model.add_object(
+        internal_object_id = self.model.add_object(
             self.internal_tenant_id,
             self.internal_container_id,
             self.object_name,
             self.object_path
         )
 
-        mock_has_object.return_value = True
-        mock_get_object_path.return_value = object_data_file.name
+        mock_resolve_object.return_value = {
+            'tenantid': self.internal_tenant_id,
+            'containerid': self.internal_container_id,
+            'objectid': internal_object_id,
+            'object_name': self.object_name,
+            'path': object_data_file.name
+        }
+
+        self.instance.remove_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        )
+
+        mock_resolve_object.assert_called_once_with(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        )
+        mock_os_remove.assert_called_once_with(object_data_file.name)
+        with self.assertRaises(exceptions.SwiftUnknownObjectError):
+            self.model.has_object(
+                self.internal_tenant_id,
+                self.internal_container_id,
+                self.object_name
+            )
+
+    def test_remove_object_missing_data(self):
+        self.model.add_object(
+            self.internal_tenant_id,
+            self.internal_container_id,
+            self.object_name,
+            self.object_path
+        )
 
         self.instance.remove_object(
             self.tenant_id,
@@ -1054,4 +1502,1475 @@ class TestSwiftStorageObject(TestSwiftStorageBase):
             self.object_name
         )
 
-        mock_os_remove.assert_called()
+        self.assertFalse(
+            self.instance.has_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+        )
+
+    def load_listing(self, object_names):
+        for object_name in object_names:
+            self.instance.load_object(
+                self.tenant_id,
+                self.container_name,
+                object_name,
+                object_name.encode('utf-8')
+            )
+
+    @ddt.data(
+        ({}, ['a', 'a-b', 'a-c', 'a-d-e', 'ab', 'b']),
+        ({'limit': 3}, ['a', 'a-b', 'a-c']),
+        ({'delimiter': '-'}, ['a', 'a-', 'ab', 'b']),
+        ({'delimiter': '-', 'limit': 2}, ['a', 'a-']),
+        ({'delimiter': '-', 'marker': 'a-'}, ['ab', 'b']),
+        ({'delimiter': '-', 'prefix': 'a-'}, ['a-b', 'a-c', 'a-d-']),
+        ({'delimiter': '-b'}, ['a', 'a-b', 'a-c', 'a-d-e', 'ab', 'b']),
+        ({'delimiter': '-d'}, ['a', 'a-b', 'a-c', 'a-d', 'ab', 'b']),
+        ({'prefix': 'a-', 'marker': 'a-b'}, ['a-c', 'a-d-e']),
+        ({'end_marker': 'a-c'}, ['a', 'a-b']),
+    )
+    @ddt.unpack
+    def test_list_objects(self, kwargs, expected_names):
+        self.load_listing(['b', 'a-d-e', 'a-c', 'ab', 'a-b', 'a'])
+
+        listing = self.instance.list_objects(
+            self.tenant_id,
+            self.container_name,
+            **kwargs
+        )
+        self.assertEqual(
+            [entry.get('name', entry.get('subdir')) for entry in listing],
+            expected_names
+        )
+        for entry in listing:
+            if 'name' in entry:
+                data = entry['name'].encode('utf-8')
+                self.assertEqual(entry['bytes'], len(data))
+                self.assertEqual(entry['hash'], storage.SwiftStorage.get_etag(
+                    data
+                ))
+                self.assertEqual(entry['content_type'], 'application/binary')
+                self.assertRegex(
+                    entry['last_modified'],
+                    r'^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{6}$'
+                )
+
+    def test_list_objects_pages(self):
+        object_names = ['{0:04d}'.format(index) for index in range(25)]
+        self.load_listing(object_names)
+
+        with mock.patch.object(storage, 'LISTING_PAGE_SIZE', 10):
+            with mock.patch.object(
+                self.model,
+                'list_objects',
+                wraps=self.model.list_objects
+            ) as mock_list_objects:
+                listing = self.instance.list_objects(
+                    self.tenant_id,
+                    self.container_name
+                )
+
+        self.assertEqual([entry['name'] for entry in listing], object_names)
+        self.assertEqual(mock_list_objects.call_count, 3)
+
+    def test_list_objects_unknown_container(self):
+        with self.assertRaises(exceptions.SwiftUnknownContainerError):
+            self.instance.list_objects(self.tenant_id, 'unknown')
+
+    def test_usage(self):
+        self.instance.load_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            b'0123456789'
+        )
+        self.instance.load_object(
+            self.tenant_id,
+            'other',
+            self.object_name,
+            b'01234'
+        )
+
+        self.assertEqual(
+            self.instance.get_account_usage(self.tenant_id),
+            {
+                'container_count': 2,
+                'object_count': 2,
+                'bytes_used': 15
+            }
+        )
+        self.assertEqual(
+            self.instance.get_container_usage(
+                self.tenant_id,
+                self.container_name
+            ),
+            {
+                'object_count': 1,
+                'bytes_used': 10
+            }
+        )
+        self.assertEqual(
+            self.instance.list_containers(self.tenant_id),
+            [
+                {'name': self.container_name, 'count': 1, 'bytes': 10},
+                {'name': 'other', 'count': 1, 'bytes': 5}
+            ]
+        )
+
+        self.instance.remove_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        )
+        self.assertEqual(
+            self.instance.get_account_usage(self.tenant_id),
+            {
+                'container_count': 2,
+                'object_count': 1,
+                'bytes_used': 5
+            }
+        )
+
+    def test_usage_unknown(self):
+        with self.assertRaises(exceptions.SwiftUnknownTenantError):
+            self.instance.get_account_usage('unknown')
+
+        with self.assertRaises(exceptions.SwiftUnknownContainerError):
+            self.instance.get_container_usage(self.tenant_id, 'unknown')
+
+    def test_retrieve_object_metadata(self):
+        self.instance.load_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            b'0123456789'
+        )
+        self.instance.store_or_update_custom_metadata(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            {'x-object-meta-color': 'blue'}
+        )
+
+        with mock.patch.object(
+            self.instance,
+            'open_object_stream'
+        ) as mock_open_object_stream:
+            for check_data in (False, True):
+                metadata = self.instance.retrieve_object_metadata(
+                    self.tenant_id,
+                    self.container_name,
+                    self.object_name,
+                    check_data=check_data
+                )
+                self.assertEqual(metadata['content-length'], '10')
+                self.assertEqual(metadata['x-object-meta-color'], 'blue')
+
+            mock_open_object_stream.assert_not_called()
+
+        os.remove(self.object_path)
+        self.assertIsNotNone(
+            self.instance.retrieve_object_metadata(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+        )
+        self.assertIsNone(
+            self.instance.retrieve_object_metadata(
+                self.tenant_id,
+                self.container_name,
+                self.object_name,
+                check_data=True
+            )
+        )
+
+    def test_retrieve_object_metadata_unknown(self):
+        self.assertIsNone(
+            self.instance.retrieve_object_metadata(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+        )
+
+    @ddt.data(None, 16)
+    def test_retrieve_object_ranges(self, mmap_threshold):
+        self.instance.mmap_threshold = mmap_threshold
+        data = os.urandom(100)
+        self.instance.load_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            data
+        )
+
+        size, metadata, ranges = self.instance.retrieve_object_ranges(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            [(0, 9), (200, None), (None, 20)]
+        )
+        self.assertEqual(size, 100)
+        self.assertEqual(metadata['content-length'], '100')
+        self.assertEqual(
+            [(offset, length) for offset, length, ignored in ranges],
+            [(0, 10), (80, 20)]
+        )
+        for offset, length, open_stream in ranges:
+            stream = open_stream()
+            self.assertEqual(stream.length, length)
+            self.assertEqual(
+                bytes(stream.read()),
+                data[offset:offset + length]
+            )
+
+    def test_retrieve_object_ranges_unknown(self):
+        self.assertEqual(
+            self.instance.retrieve_object_ranges(
+                self.tenant_id,
+                self.container_name,
+                self.object_name,
+                [(0, 9)]
+            ),
+            (None, None, None)
+        )
+
+    def test_last_modified(self):
+        with mock.patch('time.time') as mock_time:
+            mock_time.return_value = 1420070400
+            self.instance.load_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name,
+                b'data'
+            )
+
+        self.assertEqual(
+            self.instance.retrieve_object_metadata(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )['last-modified'],
+            'Thu, 01 Jan 2015 00:00:00 GMT'
+        )
+        self.assertEqual(
+            self.instance.list_objects(
+                self.tenant_id,
+                self.container_name
+            )[0]['last_modified'],
+            '2015-01-01T00:00:00.000000'
+        )
+        self.assertIsNone(self.instance.get_listing_time(None))
+        self.assertIsNone(self.instance.get_listing_time('not a date'))
+
+    @ddt.data(
+        ('match', False),
+        ('match_quoted', False),
+        ('mismatch', True),
+    )
+    @ddt.unpack
+    def test_write_object_data_expected_etag(self, etag_type, mismatch):
+        with open(self.object_path, 'wb') as data_output:
+            data_output.write(b'original')
+
+        data = os.urandom(1024)
+        etag = storage.SwiftStorage.get_etag(data)
+        expected_etag = {
+            'match': etag.upper(),
+            'match_quoted': '"{0}"'.format(etag),
+            'mismatch': storage.SwiftStorage.get_etag(b'other')
+        }[etag_type]
+
+        if mismatch:
+            with self.assertRaises(exceptions.SwiftEtagMismatchError):
+                self.instance.write_object_data(
+                    self.object_path,
+                    io.BytesIO(data),
+                    expected_etag=expected_etag
+                )
+
+            with open(self.object_path, 'rb') as data_input:
+                self.assertEqual(data_input.read(), b'original')
+
+        else:
+            self.assertEqual(
+                self.instance.write_object_data(
+                    self.object_path,
+                    io.BytesIO(data),
+                    expected_etag=expected_etag
+                ),
+                (etag, len(data))
+            )
+
+            with open(self.object_path, 'rb') as data_input:
+                self.assertEqual(data_input.read(), data)
+
+        self.assertEqual(os.listdir(self.container_dir), [self.object_name])
+
+    def test_store_object_verify_etag(self):
+        metadata = CaseInsensitiveDict()
+        metadata['etag'] = storage.SwiftStorage.get_etag(b'other')
+        with self.assertRaises(exceptions.SwiftEtagMismatchError):
+            self.instance.store_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name,
+                iter([b'da', b'ta']),
+                metadata,
+                verify_etag=True
+            )
+
+        self.assertFalse(
+            self.instance.has_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+        )
+        self.assertEqual(
+            self.instance.get_account_usage(self.tenant_id)['object_count'],
+            0
+        )
+
+    def test_store_object_default_content_length(self):
+        metadata = CaseInsensitiveDict()
+        self.instance.store_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            iter([b'da', b'ta']),
+            metadata
+        )
+        self.assertEqual(metadata['content-length'], '4')
+        self.assertEqual(
+            metadata['etag'],
+            storage.SwiftStorage.get_etag(b'data')
+        )
+
+
+class TestSwiftStorageHashedLayout(TestSwiftStorageBase):
+
+    def setUp(self):
+        super(TestSwiftStorageHashedLayout, self).setUp(initialize=False)
+        self.instance = storage.SwiftStorage(
+            self.service_id,
+            self.model,
+            layout=storage.LAYOUT_HASHED
+        )
+
+    def tearDown(self):
+        super(TestSwiftStorageHashedLayout, self).tearDown()
+        self.instance.storage.cleanup()
+
+    def test_get_new_object_path(self):
+        path = self.instance.get_new_object_path(
+            self.tenant_id,
+            'a/b',
+            'c'
+        )
+        name_hash = os.path.basename(path)
+        self.assertEqual(len(name_hash), 32)
+        self.assertEqual(
+            path,
+            '{0}/objects/{1}/{2}/{3}'.format(
+                self.instance.location,
+                name_hash[:2],
+                name_hash[2:4],
+                name_hash
+            )
+        )
+
+        # the path is stable and distinct for every tenant/container/object
+        self.assertEqual(
+            path,
+            self.instance.get_new_object_path(self.tenant_id, 'a/b', 'c')
+        )
+        self.assertNotEqual(
+            path,
+            self.instance.get_new_object_path(self.tenant_id, 'a', 'b/c')
+        )
+
+    def test_objects(self):
+        object_names = ['plain', 'with/slashes/in/it', '../escape']
+        for object_name in object_names:
+            self.instance.load_object(
+                self.tenant_id,
+                self.container_name,
+                object_name,
+                object_name.encode('utf-8')
+            )
+
+        self.assertEqual(
+            [
+                entry['name']
+                for entry in self.instance.list_objects(
+                    self.tenant_id,
+                    self.container_name
+                )
+            ],
+            sorted(object_names)
+        )
+
+        objects_dir = '{0}/objects'.format(self.instance.location)
+        for object_name in object_names:
+            path = self.instance.get_object_path(
+                self.tenant_id,
+                self.container_name,
+                object_name
+            )
+            self.assertTrue(path.startswith(objects_dir))
+
+            data, metadata = self.instance.retrieve_object(
+                self.tenant_id,
+                self.container_name,
+                object_name
+            )
+            self.assertEqual(data.read(), object_name.encode('utf-8'))
+
+        self.assertEqual(
+            os.listdir(
+                self.instance.get_container_path(
+                    self.tenant_id,
+                    self.container_name
+                )
+            ),
+            []
+        )
+
+        self.instance.remove_object(
+            self.tenant_id,
+            self.container_name,
+            object_names[1]
+        )
+        self.assertFalse(
+            self.instance.has_object(
+                self.tenant_id,
+                self.container_name,
+                object_names[1]
+            )
+        )
+
+    def test_load_objects(self):
+        self.instance.load_objects(
+            {
+                'tenantid': self.tenant_id,
+                'container_name': self.container_name,
+                'object_name': 'object/{0}'.format(index),
+                'content': os.urandom(16)
+            }
+            for index in range(20)
+        )
+        for index in range(20):
+            self.assertTrue(
+                self.instance.has_object(
+                    self.tenant_id,
+                    self.container_name,
+                    'object/{0}'.format(index)
+                )
+            )
+
+
+@ddt.ddt
+class TestSwiftStorageMemoryBackend(TestSwiftStorageBase):
+
+    def setUp(self):
+        super(TestSwiftStorageMemoryBackend, self).setUp(initialize=False)
+        self.backend = backends.SwiftMemoryBackend()
+
+    def make_instance(self, **kwargs):
+        return storage.SwiftStorage(
+            self.service_id,
+            self.model,
+            backend=self.backend,
+            **kwargs
+        )
+
+    def test_instantiation(self):
+        instance = self.make_instance()
+        self.assertIs(instance.backend, self.backend)
+        self.assertIsNone(instance.storage)
+        self.assertEqual(instance.location, self.backend.location)
+
+        default_instance = storage.SwiftStorage(self.service_id, self.model)
+        self.assertIsInstance(
+            default_instance.backend,
+            backends.SwiftFilesystemBackend
+        )
+        default_instance.storage.cleanup()
+
+    @ddt.data(
+        storage.LAYOUT_FLAT,
+        storage.LAYOUT_HASHED
+    )
+    def test_objects(self, layout):
+        instance = self.make_instance(layout=layout, mmap_threshold=1)
+        data = os.urandom(100)
+
+        with mock.patch('os.mkdir') as mock_mkdir:
+            instance.load_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name,
+                data
+            )
+            instance.load_objects([
+                {
+                    'tenantid': self.tenant_id,
+                    'container_name': self.container_name,
+                    'object_name': 'bulk/{0}'.format(index),
+                    'content': data
+                }
+                for index in range(5)
+            ])
+
+        mock_mkdir.assert_not_called()
+        self.assertFalse(os.path.exists(instance.location))
+        self.assertTrue(instance.has_container(
+            self.tenant_id,
+            self.container_name
+        ))
+        self.assertEqual(
+            instance.get_container_usage(self.tenant_id, self.container_name),
+            {'object_count': 6, 'bytes_used': 600}
+        )
+
+        stream, metadata = instance.retrieve_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            stream=True
+        )
+        self.assertEqual(b''.join(bytes(c) for c in stream), data)
+        self.assertEqual(metadata['etag'], instance.get_etag(data))
+
+        size, metadata, ranges = instance.retrieve_object_ranges(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            [(10, 19)]
+        )
+        self.assertEqual(size, 100)
+        offset, length, open_stream = ranges[0]
+        self.assertEqual(bytes(open_stream().read()), data[10:20])
+
+        instance.remove_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        )
+        self.assertFalse(instance.has_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        ))
+        self.assertEqual(len(self.backend.data), 5)
+
+
+@ddt.ddt
+class TestSwiftStorageDedup(TestSwiftStorageBase):
+
+    def setUp(self):
+        super(TestSwiftStorageDedup, self).setUp(initialize=False)
+        self.instances = []
+
+    def tearDown(self):
+        super(TestSwiftStorageDedup, self).tearDown()
+        for instance in self.instances:
+            instance.backend.cleanup()
+
+    def make_instance(self, backend_type, layout=storage.LAYOUT_FLAT):
+        instance = storage.SwiftStorage(
+            self.service_id,
+            self.model,
+            layout=layout,
+            backend=backend_type(),
+            dedup=True
+        )
+        self.instances.append(instance)
+        return instance
+
+    def get_blob_paths(self, instance):
+        cursor = self.model.database.cursor()
+        cursor.execute('SELECT path FROM swift_blobs ORDER BY path')
+        return [row[0] for row in cursor.fetchall()]
+
+    @ddt.data(
+        (backends.SwiftFilesystemBackend, storage.LAYOUT_FLAT),
+        (backends.SwiftFilesystemBackend, storage.LAYOUT_HASHED),
+        (backends.SwiftMemoryBackend, storage.LAYOUT_FLAT),
+    )
+    @ddt.unpack
+    def test_shared_data(self, backend_type, layout):
+        instance = self.make_instance(backend_type, layout)
+        self.assertTrue(instance.dedup)
+        data = os.urandom(100)
+        etag = instance.get_etag(data)
+        containers = ['container{0}'.format(index) for index in range(3)]
+
+        instance.load_object(self.tenant_id, containers[0], 'first', data)
+        with mock.patch.object(
+            instance,
+            'write_object_data',
+            wraps=instance.write_object_data
+        ) as mock_write_object_data:
+            for container_name in containers:
+                instance.load_object(
+                    self.tenant_id,
+                    container_name,
+                    self.object_name,
+                    data
+                )
+
+        # repeated content only links to the stored blob
+        mock_write_object_data.assert_not_called()
+        self.assertEqual(
+            self.get_blob_paths(instance),
+            [instance.get_blob_path(etag)]
+        )
+        self.assertEqual(self.model.get_blob(etag)['refcount'], 4)
+        self.assertEqual(
+            instance.get_account_usage(self.tenant_id)['bytes_used'],
+            400
+        )
+
+        for container_name in containers:
+            path = instance.get_object_path(
+                self.tenant_id,
+                container_name,
+                self.object_name
+            )
+            data_read, metadata = instance.retrieve_object(
+                self.tenant_id,
+                container_name,
+                self.object_name
+            )
+            self.assertEqual(data_read.read(), data)
+            self.assertEqual(metadata['etag'], etag)
+            self.assertEqual(metadata['x-y-object-disk-path'], path)
+            if backend_type is backends.SwiftFilesystemBackend:
+                self.assertTrue(
+                    os.path.samefile(path, instance.get_blob_path(etag))
+                )
+
+        # overwriting an object gives it its own blob
+        other_data = os.urandom(50)
+        instance.load_object(
+            self.tenant_id,
+            containers[0],
+            self.object_name,
+            other_data
+        )
+        self.assertEqual(len(self.get_blob_paths(instance)), 2)
+        self.assertEqual(self.model.get_blob(etag)['refcount'], 3)
+        data_read, metadata = instance.retrieve_object(
+            self.tenant_id,
+            containers[1],
+            self.object_name
+        )
+        self.assertEqual(data_read.read(), data)
+
+        # the blob goes away along with its last reference
+        instance.remove_object(self.tenant_id, containers[0], 'first')
+        for container_name in containers[1:]:
+            instance.remove_object(
+                self.tenant_id,
+                container_name,
+                self.object_name
+            )
+
+        self.assertEqual(
+            self.get_blob_paths(instance),
+            [instance.get_blob_path(instance.get_etag(other_data))]
+        )
+        self.assertFalse(
+            instance.backend.exists(instance.get_blob_path(etag))
+        )
+
+    @ddt.data(
+        backends.SwiftFilesystemBackend,
+        backends.SwiftMemoryBackend
+    )
+    def test_store_object(self, backend_type):
+        instance = self.make_instance(backend_type)
+        data = os.urandom(100)
+        etag = instance.get_etag(data)
+
+        for object_name in ('first', 'second'):
+            metadata = CaseInsensitiveDict()
+            metadata['etag'] = etag
+            instance.store_object(
+                self.tenant_id,
+                self.container_name,
+                object_name,
+                io.BytesIO(data),
+                metadata,
+                verify_etag=True
+            )
+
+        self.assertEqual(self.model.get_blob(etag)['refcount'], 2)
+
+        metadata = CaseInsensitiveDict()
+        metadata['etag'] = 'bad'
+        with self.assertRaises(exceptions.SwiftEtagMismatchError):
+            instance.store_object(
+                self.tenant_id,
+                self.container_name,
+                'third',
+                None,
+                metadata,
+                verify_etag=True,
+                content_etag=etag
+            )
+
+        self.assertFalse(
+            instance.has_object(self.tenant_id, self.container_name, 'third')
+        )
+        self.assertEqual(self.model.get_blob(etag)['refcount'], 2)
+
+    @ddt.data(
+        backends.SwiftFilesystemBackend,
+        backends.SwiftMemoryBackend
+    )
+    def test_load_objects(self, backend_type):
+        instance = self.make_instance(backend_type)
+        payloads = [os.urandom(16) for index in range(2)]
+        instance.load_object(
+            self.tenant_id,
+            self.container_name,
+            'existing',
+            payloads[0]
+        )
+
+        with mock.patch.object(
+            instance,
+            'write_object_data',
+            wraps=instance.write_object_data
+        ) as mock_write_object_data:
+            instance.load_objects(
+                {
+                    'tenantid': self.tenant_id,
+                    'container_name': 'container{0}'.format(index % 4),
+                    'object_name': 'object{0}'.format(index),
+                    'content': payloads[index % 2]
+                }
+                for index in range(20)
+            )
+
+        # stored payloads are only linked and new ones written once
+        self.assertEqual(mock_write_object_data.call_count, 1)
+        self.assertEqual(len(self.get_blob_paths(instance)), 2)
+        for index, payload in enumerate(payloads):
+            self.assertEqual(
+                self.model.get_blob(instance.get_etag(payload))['refcount'],
+                11 - index
+            )
+
+        for index in range(20):
+            data, metadata = instance.retrieve_object(
+                self.tenant_id,
+                'container{0}'.format(index % 4),
+                'object{0}'.format(index)
+            )
+            self.assertEqual(data.read(), payloads[index % 2])
+
+
+@ddt.ddt
+class TestSwiftStorageCopy(TestSwiftStorageBase):
+
+    def setUp(self):
+        super(TestSwiftStorageCopy, self).setUp(initialize=False)
+        self.instance = storage.SwiftStorage(self.service_id, self.model)
+
+    def tearDown(self):
+        super(TestSwiftStorageCopy, self).tearDown()
+        self.instance.storage.cleanup()
+
+    def test_copy_object_no_object(self):
+        self.assertIsNone(
+            self.instance.copy_object(
+                self.tenant_id, self.container_name, self.object_name,
+                self.tenant_id, self.container_name, 'copy'
+            )
+        )
+        self.assertFalse(
+            self.instance.has_container(self.tenant_id, self.container_name)
+        )
+
+    @ddt.data(
+        'copy',
+        None
+    )
+    def test_copy_object(self, dest_object_name):
+        dest_object_name = dest_object_name or self.object_name
+        data = os.urandom(100)
+        self.instance.load_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            data
+        )
+
+        with mock.patch.object(
+            self.instance,
+            'write_object_data'
+        ) as mock_write_object_data:
+            metadata = self.instance.copy_object(
+                self.tenant_id, self.container_name, self.object_name,
+                'other', 'other', dest_object_name,
+                metadata={'content-type': 'text/plain'}
+            )
+
+        mock_write_object_data.assert_not_called()
+        self.assertEqual(metadata['content-type'], 'text/plain')
+        self.assertEqual(metadata['etag'], self.instance.get_etag(data))
+
+        data_read, metadata_read = self.instance.retrieve_object(
+            'other',
+            'other',
+            dest_object_name
+        )
+        self.assertEqual(data_read.read(), data)
+        self.assertEqual(metadata_read, metadata)
+        self.assertEqual(
+            self.instance.get_account_usage('other')['bytes_used'],
+            100
+        )
+
+
+class TestSwiftStorageLargeObjects(TestSwiftStorageBase):
+
+    def setUp(self):
+        super(TestSwiftStorageLargeObjects, self).setUp(initialize=False)
+        self.instance = storage.SwiftStorage(self.service_id, self.model)
+        self.segments = []
+        for index in range(3):
+            data = os.urandom(100)
+            object_name = 'part-{0}'.format(index)
+            self.instance.load_object(
+                self.tenant_id,
+                self.container_name,
+                object_name,
+                data
+            )
+            self.segments.append({
+                'container': self.container_name,
+                'object': object_name,
+                'hash': self.instance.get_etag(data),
+                'bytes': len(data),
+                'data': data
+            })
+
+    def tearDown(self):
+        super(TestSwiftStorageLargeObjects, self).tearDown()
+        self.instance.storage.cleanup()
+
+    def store_manifest(self, object_name, segments):
+        metadata = CaseInsensitiveDict()
+        self.instance.store_manifest(
+            self.tenant_id,
+            self.container_name,
+            object_name,
+            segments,
+            metadata
+        )
+        return metadata
+
+    def test_store_manifest(self):
+        metadata = self.store_manifest(self.object_name, self.segments)
+        self.assertTrue(self.instance.is_static_manifest(metadata))
+        self.assertEqual(metadata['content-length'], '300')
+        self.assertEqual(
+            metadata['etag'],
+            self.instance.get_manifest_etag(self.segments)
+        )
+
+        path = metadata['x-y-object-disk-path']
+        self.assertEqual(self.instance.manifests[path], self.segments)
+
+        # an uncached manifest is parsed from the stored data
+        self.instance.manifests.clear()
+        segments = self.instance.get_manifest_segments(
+            self.tenant_id,
+            metadata
+        )
+        self.assertEqual(
+            segments,
+            [
+                {k: v for k, v in six.iteritems(segment) if k != 'data'}
+                for segment in self.segments
+            ]
+        )
+        self.assertIs(self.instance.manifests[path], segments)
+
+    def test_get_manifest_segments_not_manifest(self):
+        self.assertIsNone(
+            self.instance.get_manifest_segments(self.tenant_id, {})
+        )
+
+    def test_get_manifest_segments_dynamic(self):
+        segments = self.instance.get_manifest_segments(
+            self.tenant_id,
+            {'x-object-manifest': '{0}/part-'.format(self.container_name)}
+        )
+        self.assertEqual(
+            [segment['object'] for segment in segments],
+            [segment['object'] for segment in self.segments]
+        )
+
+        self.assertEqual(
+            self.instance.get_manifest_segments(
+                self.tenant_id,
+                {'x-object-manifest': 'unknown/part-'}
+            ),
+            []
+        )
+
+    def test_open_segments(self):
+        with mock.patch.object(
+            self.instance,
+            'open_object_stream',
+            wraps=self.instance.open_object_stream
+        ) as mock_open_object_stream:
+            stream = self.instance.open_segments(
+                self.tenant_id,
+                self.segments
+            )
+            self.assertEqual(stream.length, 300)
+            self.assertEqual(mock_open_object_stream.call_count, 0)
+
+            # segments are only opened as the stream reaches them
+            self.assertEqual(
+                bytes(stream.read(100)),
+                self.segments[0]['data']
+            )
+            self.assertEqual(mock_open_object_stream.call_count, 1)
+
+            self.assertEqual(
+                b''.join(bytes(chunk) for chunk in stream),
+                self.segments[1]['data'] + self.segments[2]['data']
+            )
+            self.assertEqual(mock_open_object_stream.call_count, 3)
+            stream.close()
+
+    def test_open_segments_nested_too_deep(self):
+        segments = self.segments[:1]
+        for depth in range(storage.MANIFEST_DEPTH_LIMIT + 1):
+            object_name = 'manifest-{0}'.format(depth)
+            metadata = self.store_manifest(object_name, segments)
+            segments = [{
+                'container': self.container_name,
+                'object': object_name,
+                'hash': metadata['etag'],
+                'bytes': 100
+            }]
+
+        with self.assertRaises(exceptions.SwiftManifestError):
+            stream = self.instance.open_segments(self.tenant_id, segments)
+            stream.read()
+
+
+class TestSwiftStorageExpiry(TestSwiftStorageBase):
+
+    def setUp(self):
+        super(TestSwiftStorageExpiry, self).setUp(initialize=False)
+        self.instance = storage.SwiftStorage(self.service_id, self.model)
+
+    def tearDown(self):
+        super(TestSwiftStorageExpiry, self).tearDown()
+        self.instance.storage.cleanup()
+
+    def store_object(self, object_name, delete_at=None):
+        metadata = CaseInsensitiveDict()
+        if delete_at is not None:
+            metadata['x-delete-at'] = str(delete_at)
+
+        self.instance.store_object(
+            self.tenant_id,
+            self.container_name,
+            object_name,
+            b'data',
+            metadata
+        )
+        return metadata['x-y-object-disk-path']
+
+    def test_get_delete_at(self):
+        self.assertIsNone(self.instance.get_delete_at({}))
+        self.assertIsNone(
+            self.instance.get_delete_at({'x-delete-at': 'never'})
+        )
+        self.assertEqual(
+            self.instance.get_delete_at({'x-delete-at': '100'}),
+            100
+        )
+
+    def test_reap_nothing_due(self):
+        self.store_object('forever')
+        with mock.patch.object(
+            self.model,
+            'list_expired_objects'
+        ) as mock_list_expired_objects:
+            self.assertEqual(self.instance.reap_expired_objects(), 0)
+
+            self.store_object('later', delete_at=200)
+            self.assertEqual(self.instance.next_delete_at, 200)
+            self.assertEqual(self.instance.reap_expired_objects(now=199), 0)
+
+        # the next expiry is known without asking the model
+        mock_list_expired_objects.assert_not_called()
+
+    def test_reap_expired_objects(self):
+        paths = {
+            object_name: self.store_object(object_name, delete_at)
+            for object_name, delete_at in (
+                ('forever', None),
+                ('early', 100),
+                ('late', 300),
+                ('middle', 200),
+            )
+        }
+        self.instance.store_or_update_custom_metadata(
+            self.tenant_id,
+            self.container_name,
+            'early',
+            {'x-object-meta-color': 'blue'}
+        )
+        self.assertEqual(self.instance.next_delete_at, 100)
+
+        self.assertEqual(self.instance.reap_expired_objects(now=200), 2)
+        self.assertEqual(self.instance.next_delete_at, 300)
+        for object_name in ('early', 'middle'):
+            self.assertFalse(
+                self.instance.has_object(
+                    self.tenant_id,
+                    self.container_name,
+                    object_name
+                )
+            )
+            self.assertFalse(
+                self.instance.backend.exists(paths[object_name])
+            )
+            self.assertNotIn(paths[object_name], self.instance.metadata)
+            self.assertNotIn(
+                paths[object_name],
+                self.instance.custom_metadata
+            )
+
+        self.assertEqual(
+            self.instance.get_container_usage(
+                self.tenant_id,
+                self.container_name
+            )['object_count'],
+            2
+        )
+
+        self.assertEqual(self.instance.reap_expired_objects(now=1000), 1)
+        self.assertIsNone(self.instance.next_delete_at)
+        self.assertTrue(
+            self.instance.has_object(
+                self.tenant_id,
+                self.container_name,
+                'forever'
+            )
+        )
+
+    def test_reap_in_batches(self):
+        self.instance.load_objects(
+            {
+                'tenantid': self.tenant_id,
+                'container_name': self.container_name,
+                'object_name': 'object{0}'.format(index),
+                'content': b'data',
+                'delete_at': 100 + index
+            }
+            for index in range(5)
+        )
+        self.assertEqual(self.instance.next_delete_at, 100)
+
+        with mock.patch.object(storage, 'REAP_BATCH_SIZE', 2):
+            with mock.patch.object(
+                self.model,
+                'list_expired_objects',
+                wraps=self.model.list_expired_objects
+            ) as mock_list_expired_objects:
+                self.assertEqual(
+                    self.instance.reap_expired_objects(now=1000),
+                    5
+                )
+
+        self.assertEqual(mock_list_expired_objects.call_count, 3)
+        self.assertEqual(
+            self.instance.get_account_usage(self.tenant_id)['object_count'],
+            0
+        )
+
+    def test_set_object_delete_at(self):
+        path = self.store_object(self.object_name)
+        self.instance.set_object_delete_at(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            100
+        )
+        self.assertEqual(self.instance.metadata[path]['x-delete-at'], '100')
+        self.assertEqual(self.instance.next_delete_at, 100)
+
+        self.instance.set_object_delete_at(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            None
+        )
+        self.assertNotIn('x-delete-at', self.instance.metadata[path])
+
+        # the stale cached expiry only costs one lookup
+        self.assertEqual(self.instance.reap_expired_objects(now=1000), 0)
+        self.assertIsNone(self.instance.next_delete_at)
+
+        with self.assertRaises(exceptions.SwiftUnknownObjectError):
+            self.instance.set_object_delete_at(
+                self.tenant_id,
+                self.container_name,
+                'missing',
+                100
+            )
+
+    def test_copy_object_expiry(self):
+        self.store_object(self.object_name, delete_at=100)
+        metadata = self.instance.copy_object(
+            self.tenant_id, self.container_name, self.object_name,
+            self.tenant_id, self.container_name, 'copy',
+            metadata={'x-delete-at': '200'}
+        )
+        self.assertEqual(metadata['x-delete-at'], '200')
+
+        self.assertEqual(self.instance.reap_expired_objects(now=100), 1)
+        self.assertEqual(self.instance.next_delete_at, 200)
+
+
+@ddt.ddt
+class TestSwiftStorageVersioning(TestSwiftStorageBase):
+
+    def setUp(self):
+        super(TestSwiftStorageVersioning, self).setUp(initialize=False)
+        self.instance = storage.SwiftStorage(self.service_id, self.model)
+        self.versions_container = 'versions'
+
+    def tearDown(self):
+        super(TestSwiftStorageVersioning, self).tearDown()
+        self.instance.backend.cleanup()
+
+    def make_versioned(self, mode, backend=None):
+        if backend is not None:
+            self.instance = storage.SwiftStorage(
+                self.service_id,
+                self.model,
+                backend=backend
+            )
+
+        self.instance.add_container(self.tenant_id, self.container_name)
+        self.instance.store_or_update_container_metadata(
+            self.tenant_id,
+            self.container_name,
+            {mode: self.versions_container}
+        )
+
+    def load_versions(self, contents):
+        for content in contents:
+            self.instance.load_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name,
+                content
+            )
+
+    def read_object(self, container_name, object_name):
+        data, metadata = self.instance.retrieve_object(
+            self.tenant_id,
+            container_name,
+            object_name
+        )
+        return data.read() if data is not None else None
+
+    def test_get_version_prefix(self):
+        self.assertEqual(
+            self.instance.get_version_prefix(u'café'),
+            u'005café-'
+        )
+
+    def test_container_metadata(self):
+        self.assertEqual(
+            self.instance.get_versioning(self.tenant_id, self.container_name),
+            (None, None)
+        )
+
+        self.instance.store_or_update_container_metadata(
+            self.tenant_id,
+            self.container_name,
+            {
+                'x-container-meta-color': 'blue',
+                storage.VERSIONS_HISTORY: self.versions_container
+            }
+        )
+        metadata = self.instance.retrieve_container_metadata(
+            self.tenant_id,
+            self.container_name
+        )
+        self.assertEqual(metadata['x-container-meta-color'], 'blue')
+        self.assertEqual(
+            self.instance.get_versioning(self.tenant_id, self.container_name),
+            (storage.VERSIONS_HISTORY, self.versions_container)
+        )
+
+        # retrieved metadata is a copy
+        metadata['x-container-meta-color'] = 'red'
+        self.instance.store_or_update_container_metadata(
+            self.tenant_id,
+            self.container_name,
+            {storage.VERSIONS_HISTORY: None}
+        )
+        metadata = self.instance.retrieve_container_metadata(
+            self.tenant_id,
+            self.container_name
+        )
+        self.assertEqual(metadata['x-container-meta-color'], 'blue')
+        self.assertNotIn(storage.VERSIONS_HISTORY, metadata)
+        self.assertEqual(
+            self.instance.get_versioning(self.tenant_id, self.container_name),
+            (None, None)
+        )
+
+    def test_archive_object_not_versioned(self):
+        self.load_versions([b'first', b'second'])
+        self.assertIsNone(
+            self.instance.archive_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+        )
+        self.assertFalse(
+            self.instance.has_container(
+                self.tenant_id,
+                self.versions_container
+            )
+        )
+
+    def test_archive_object(self):
+        self.make_versioned(storage.VERSIONS_STACK)
+        self.assertIsNone(
+            self.instance.archive_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+        )
+
+        self.load_versions([b'first'])
+        with mock.patch.object(
+            self.instance,
+            'write_object_data'
+        ) as mock_write_object_data:
+            with mock.patch.object(
+                self.instance.backend,
+                'read'
+            ) as mock_read:
+                version_name = self.instance.archive_object(
+                    self.tenant_id,
+                    self.container_name,
+                    self.object_name
+                )
+
+        mock_write_object_data.assert_not_called()
+        mock_read.assert_not_called()
+        self.assertTrue(
+            version_name.startswith(
+                self.instance.get_version_prefix(self.object_name)
+            )
+        )
+        self.assertTrue(
+            os.path.samefile(
+                self.instance.get_object_path(
+                    self.tenant_id,
+                    self.container_name,
+                    self.object_name
+                ),
+                self.instance.get_object_path(
+                    self.tenant_id,
+                    self.versions_container,
+                    version_name
+                )
+            )
+        )
+
+    def test_overwrite_archives(self):
+        self.make_versioned(storage.VERSIONS_STACK)
+        self.load_versions([b'first', b'second', b'third'])
+
+        versions = self.instance.list_versions(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        )
+        self.assertEqual(len(versions), 2)
+        self.assertEqual(
+            [
+                self.read_object(self.versions_container, version)
+                for version in versions
+            ],
+            [b'first', b'second']
+        )
+        self.assertEqual(
+            self.read_object(self.container_name, self.object_name),
+            b'third'
+        )
+
+        # the latest version is a single index lookup
+        with mock.patch.object(
+            self.model,
+            'list_objects'
+        ) as mock_list_objects:
+            self.assertEqual(
+                self.instance.get_latest_version(
+                    self.tenant_id,
+                    self.versions_container,
+                    self.object_name
+                ),
+                versions[-1]
+            )
+
+        mock_list_objects.assert_not_called()
+        self.assertEqual(
+            self.instance.list_versions(
+                self.tenant_id,
+                self.versions_container,
+                self.object_name
+            ),
+            []
+        )
+
+    @ddt.data(
+        None,
+        backends.SwiftMemoryBackend
+    )
+    def test_remove_versioned_object_stack(self, backend_type):
+        self.make_versioned(
+            storage.VERSIONS_STACK,
+            backend_type() if backend_type is not None else None
+        )
+        self.load_versions([b'first', b'second'])
+
+        for expected_content in (b'first', None):
+            self.instance.remove_versioned_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+            self.assertEqual(
+                self.read_object(self.container_name, self.object_name),
+                expected_content
+            )
+
+        self.assertEqual(
+            self.instance.list_versions(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            ),
+            []
+        )
+
+    def test_remove_versioned_object_history(self):
+        self.make_versioned(storage.VERSIONS_HISTORY)
+        self.load_versions([b'first', b'second'])
+
+        self.instance.remove_versioned_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        )
+        self.assertFalse(
+            self.instance.has_object(
+                self.tenant_id,
+                self.container_name,
+                self.object_name
+            )
+        )
+        self.assertEqual(
+            [
+                self.read_object(self.versions_container, version)
+                for version in self.instance.list_versions(
+                    self.tenant_id,
+                    self.container_name,
+                    self.object_name
+                )
+            ],
+            [b'first', b'second']
+        )
+
+
+class TestSwiftStorageRemoveContainer(TestSwiftStorageBase):
+
+    def setUp(self):
+        super(TestSwiftStorageRemoveContainer, self).setUp(initialize=False)
+        self.instance = storage.SwiftStorage(self.service_id, self.model)
+
+    def tearDown(self):
+        super(TestSwiftStorageRemoveContainer, self).tearDown()
+        self.instance.backend.cleanup()
+
+    def test_remove_container_unknown(self):
+        with self.assertRaises(exceptions.SwiftUnknownTenantError):
+            self.instance.remove_container(
+                self.tenant_id,
+                self.container_name
+            )
+
+        self.instance.add_container(self.tenant_id, 'other')
+        with self.assertRaises(exceptions.SwiftUnknownContainerError):
+            self.instance.remove_container(
+                self.tenant_id,
+                self.container_name
+            )
+
+    def test_remove_container(self):
+        self.instance.load_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name,
+            b'data'
+        )
+        self.instance.store_or_update_container_metadata(
+            self.tenant_id,
+            self.container_name,
+            {storage.VERSIONS_STACK: 'versions'}
+        )
+
+        with self.assertRaises(exceptions.SwiftContainerNotEmptyError):
+            self.instance.remove_container(
+                self.tenant_id,
+                self.container_name
+            )
+
+        self.instance.remove_object(
+            self.tenant_id,
+            self.container_name,
+            self.object_name
+        )
+        self.instance.remove_container(self.tenant_id, self.container_name)
+        self.assertFalse(
+            self.instance.has_container(self.tenant_id, self.container_name)
+        )
+        self.assertEqual(self.instance.container_metadata, {})
+
+        # a container of the same name starts out empty
+        self.instance.add_container(self.tenant_id, self.container_name)
+        self.assertEqual(
+            self.instance.get_container_usage(
+                self.tenant_id,
+                self.container_name
+            ),
+            {'object_count': 0, 'bytes_used': 0}
+        )
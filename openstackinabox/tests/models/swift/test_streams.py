@@ -0,0 +1,401 @@
+import hashlib
+import io
+import os
+import tempfile
+
+import ddt
+
+from openstackinabox.tests.base import TestBase
+
+from openstackinabox.models.swift import streams
+
+
+@ddt.ddt
+class TestSwiftObjectStream(TestBase):
+
+    def setUp(self):
+        super(TestSwiftObjectStream, self).setUp(initialize=False)
+        self.data_file = tempfile.NamedTemporaryFile()
+
+    def tearDown(self):
+        super(TestSwiftObjectStream, self).tearDown()
+        self.data_file.close()
+
+    def write_data(self, size):
+        data = os.urandom(size)
+        with open(self.data_file.name, 'wb') as data_output:
+            data_output.write(data)
+
+        return data
+
+    @ddt.data(
+        (0, 16),
+        (1, 16),
+        (16, 16),
+        (1024, 16),
+        (1025, 1024),
+    )
+    @ddt.unpack
+    def test_iteration(self, size, chunk_size):
+        data = self.write_data(size)
+
+        stream = streams.SwiftObjectStream(
+            self.data_file.name,
+            chunk_size=chunk_size
+        )
+        self.assertEqual(stream.length, size)
+        self.assertFalse(stream.closed)
+
+        chunks = list(stream)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), chunk_size)
+
+        self.assertEqual(b''.join(chunks), data)
+        self.assertTrue(stream.closed)
+
+    def test_read(self):
+        data = self.write_data(100)
+
+        stream = streams.SwiftObjectStream(self.data_file.name)
+        self.assertEqual(stream.read(10), data[:10])
+        self.assertEqual(stream.tell(), 10)
+        self.assertFalse(stream.closed)
+
+        self.assertEqual(stream.read(), data[10:])
+        self.assertEqual(stream.tell(), 100)
+        self.assertTrue(stream.closed)
+        self.assertEqual(stream.read(), b'')
+
+    def test_read_zero(self):
+        data = self.write_data(100)
+
+        stream = streams.SwiftObjectStream(self.data_file.name)
+        self.assertEqual(stream.read(0), b'')
+        self.assertFalse(stream.closed)
+
+        self.assertEqual(stream.read(10), data[:10])
+        self.assertEqual(stream.read(0), b'')
+        self.assertFalse(stream.closed)
+        self.assertEqual(stream.read(), data[10:])
+        self.assertTrue(stream.closed)
+
+    def test_read_truncated(self):
+        data = self.write_data(100)
+
+        stream = streams.SwiftObjectStream(self.data_file.name)
+        with open(self.data_file.name, 'wb') as data_output:
+            data_output.write(data[:10])
+
+        # data shrinking under the stream ends it instead of looping
+        self.assertEqual(stream.read(50), data[:10])
+        self.assertFalse(stream.closed)
+        self.assertEqual(stream.read(50), b'')
+        self.assertTrue(stream.closed)
+
+    def test_close(self):
+        self.write_data(100)
+
+        with streams.SwiftObjectStream(self.data_file.name) as stream:
+            stream.read(10)
+
+        self.assertTrue(stream.closed)
+        self.assertEqual(stream.read(), b'')
+
+    @ddt.data(
+        (0, 10),
+        (10, None),
+        (95, 10),
+        (100, 10),
+        (200, None),
+    )
+    @ddt.unpack
+    def test_window(self, offset, length):
+        data = self.write_data(100)
+        expected_data = data[offset:][:length]
+
+        stream = streams.SwiftObjectStream(
+            self.data_file.name,
+            chunk_size=4,
+            offset=offset,
+            length=length
+        )
+        self.assertEqual(stream.length, len(expected_data))
+        self.assertEqual(b''.join(stream), expected_data)
+
+
+@ddt.ddt
+class TestSwiftObjectBuffer(TestBase):
+
+    def setUp(self):
+        super(TestSwiftObjectBuffer, self).setUp(initialize=False)
+
+    @ddt.data(
+        (0, 16),
+        (1, 16),
+        (1025, 1024),
+    )
+    @ddt.unpack
+    def test_iteration(self, size, chunk_size):
+        data = os.urandom(size)
+
+        stream = streams.SwiftObjectBuffer(data, chunk_size=chunk_size)
+        self.assertEqual(stream.length, size)
+
+        chunks = list(stream)
+        for chunk in chunks:
+            self.assertIsInstance(chunk, memoryview)
+            self.assertTrue(chunk.readonly)
+            self.assertLessEqual(len(chunk), chunk_size)
+
+        self.assertEqual(b''.join(chunks), data)
+        self.assertTrue(stream.closed)
+
+    @ddt.data(
+        (0, 10),
+        (10, None),
+        (95, 10),
+        (200, None),
+    )
+    @ddt.unpack
+    def test_window(self, offset, length):
+        data = os.urandom(100)
+        expected_data = data[offset:][:length]
+
+        with streams.SwiftObjectBuffer(
+            data, chunk_size=4, offset=offset, length=length, name='window'
+        ) as stream:
+            self.assertEqual(stream.path, 'window')
+            self.assertEqual(stream.length, len(expected_data))
+            self.assertEqual(bytes(stream.read()), expected_data)
+
+        self.assertTrue(stream.closed)
+        self.assertEqual(stream.read(), b'')
+
+
+@ddt.ddt
+class TestSwiftObjectMemoryMap(TestBase):
+
+    def setUp(self):
+        super(TestSwiftObjectMemoryMap, self).setUp(initialize=False)
+        self.data_file = tempfile.NamedTemporaryFile()
+
+    def tearDown(self):
+        super(TestSwiftObjectMemoryMap, self).tearDown()
+        self.data_file.close()
+
+    def write_data(self, size):
+        data = os.urandom(size)
+        with open(self.data_file.name, 'wb') as data_output:
+            data_output.write(data)
+
+        return data
+
+    @ddt.data(
+        (1, 16),
+        (16, 16),
+        (1024, 16),
+        (1025, 1024),
+    )
+    @ddt.unpack
+    def test_iteration(self, size, chunk_size):
+        data = self.write_data(size)
+
+        stream = streams.SwiftObjectMemoryMap(
+            self.data_file.name,
+            chunk_size=chunk_size
+        )
+        self.assertEqual(stream.length, size)
+
+        chunks = list(stream)
+        for chunk in chunks:
+            self.assertIsInstance(chunk, memoryview)
+            self.assertTrue(chunk.readonly)
+            self.assertLessEqual(len(chunk), chunk_size)
+
+        self.assertEqual(b''.join(chunks), data)
+        self.assertTrue(stream.closed)
+
+    def test_read(self):
+        data = self.write_data(100)
+
+        stream = streams.SwiftObjectMemoryMap(self.data_file.name)
+        self.assertEqual(stream.read(10), data[:10])
+        self.assertEqual(stream.tell(), 10)
+        self.assertFalse(stream.closed)
+
+        self.assertEqual(stream.read(), data[10:])
+        self.assertTrue(stream.closed)
+        self.assertEqual(stream.read(), b'')
+
+    def test_close(self):
+        self.write_data(100)
+
+        with streams.SwiftObjectMemoryMap(self.data_file.name) as stream:
+            chunk = stream.read(10)
+
+        self.assertTrue(stream.closed)
+        self.assertEqual(len(chunk), 10)
+
+    @ddt.data(
+        (0, 10),
+        (10, None),
+        (95, 10),
+        (100, 10),
+    )
+    @ddt.unpack
+    def test_window(self, offset, length):
+        data = self.write_data(100)
+        expected_data = data[offset:][:length]
+
+        stream = streams.SwiftObjectMemoryMap(
+            self.data_file.name,
+            chunk_size=4,
+            offset=offset,
+            length=length
+        )
+        self.assertEqual(stream.length, len(expected_data))
+        self.assertEqual(b''.join(stream), expected_data)
+
+
+@ddt.ddt
+class TestSwiftStreamCopy(TestBase):
+
+    def setUp(self):
+        super(TestSwiftStreamCopy, self).setUp(initialize=False)
+
+    def tearDown(self):
+        super(TestSwiftStreamCopy, self).tearDown()
+
+    @ddt.data(
+        'bytes', 'text', 'file', 'iterable', 'none'
+    )
+    def test_copy_stream(self, content_type):
+        data = b'0123456789' * 100
+        content = {
+            'bytes': data,
+            'text': data.decode('utf-8'),
+            'file': io.BytesIO(data),
+            'iterable': (data[i:i + 7] for i in range(0, len(data), 7)),
+            'none': None
+        }[content_type]
+        if content_type == 'none':
+            data = b''
+
+        output = io.BytesIO()
+        etag, size = streams.copy_stream(content, output, chunk_size=64)
+
+        self.assertEqual(output.getvalue(), data)
+        self.assertEqual(size, len(data))
+        self.assertEqual(etag, hashlib.md5(data).hexdigest())
+
+    def test_iter_chunks_bounded(self):
+        data = os.urandom(1000)
+        chunks = list(streams.iter_chunks(io.BytesIO(data), 64))
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), 64)
+
+        self.assertEqual(b''.join(chunks), data)
+
+
+@ddt.ddt
+class TestSwiftChainedStream(TestBase):
+
+    def setUp(self):
+        super(TestSwiftChainedStream, self).setUp(initialize=False)
+
+    def tearDown(self):
+        super(TestSwiftChainedStream, self).tearDown()
+
+    @ddt.data(1, 3, 64)
+    def test_read(self, read_size):
+        opened = []
+
+        def open_part(data):
+            def opener():
+                opened.append(data)
+                return io.BytesIO(data)
+
+            return opener
+
+        stream = streams.SwiftChainedStream(
+            [
+                b'head',
+                open_part(b'0123456789'),
+                io.BytesIO(b'middle'),
+                open_part(b''),
+                u'tail'
+            ],
+            length=24
+        )
+        self.assertEqual(stream.length, 24)
+        self.assertEqual(opened, [])
+
+        data = b''
+        while True:
+            chunk = stream.read(read_size)
+            if not chunk:
+                break
+
+            self.assertLessEqual(len(chunk), read_size)
+            data += chunk
+
+        self.assertEqual(data, b'head0123456789middletail')
+        self.assertEqual(stream.tell(), 24)
+        self.assertEqual(opened, [b'0123456789', b''])
+        self.assertTrue(stream.closed)
+
+    def test_iteration(self):
+        stream = streams.SwiftChainedStream(
+            [b'abc', io.BytesIO(b'defgh')],
+            chunk_size=2
+        )
+        chunks = list(stream)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), 2)
+
+        self.assertEqual(b''.join(chunks), b'abcdefgh')
+
+    def test_close(self):
+        first = io.BytesIO(b'abc')
+        second = io.BytesIO(b'def')
+        never_opened = []
+
+        stream = streams.SwiftChainedStream(
+            [first, second, lambda: never_opened.append(True)]
+        )
+        self.assertEqual(stream.read(1), b'a')
+        stream.close()
+
+        self.assertTrue(stream.closed)
+        self.assertTrue(first.closed)
+        self.assertTrue(second.closed)
+        self.assertEqual(never_opened, [])
+        self.assertEqual(stream.read(), b'')
+
+
+@ddt.ddt
+class TestSwiftResolveRanges(TestBase):
+
+    def setUp(self):
+        super(TestSwiftResolveRanges, self).setUp(initialize=False)
+
+    def tearDown(self):
+        super(TestSwiftResolveRanges, self).tearDown()
+
+    @ddt.data(
+        ([(0, 9)], 100, [(0, 10)]),
+        ([(90, None)], 100, [(90, 10)]),
+        ([(90, 200)], 100, [(90, 10)]),
+        ([(None, 10)], 100, [(90, 10)]),
+        ([(None, 200)], 100, [(0, 100)]),
+        ([(None, 0)], 100, []),
+        ([(100, None)], 100, []),
+        ([(0, 0)], 0, []),
+        ([(0, 0), (200, 300), (None, 1)], 100, [(0, 1), (99, 1)]),
+    )
+    @ddt.unpack
+    def test_resolve_ranges(self, ranges, size, expected_ranges):
+        self.assertEqual(
+            streams.resolve_ranges(ranges, size),
+            expected_ranges
+        )
@@ -1,19 +1,25 @@
 """
 Stack-In-A-Box: Basic Test
 """
+import hashlib
+import timeit
 import unittest
 import uuid
 
 import ddt
 import mock
 import requests
+import stackinabox.util.requests_mock.core
 from stackinabox.services.service import StackInABoxService
 from stackinabox.stack import StackInABox
 
 from openstackinabox.services.keystone import KeystoneV2Service
 
 from openstackinabox.models.swift.model import SwiftServiceModel
-from openstackinabox.models.swift.storage import SwiftStorage
+from openstackinabox.models.swift.backends import SwiftMemoryBackend
+from openstackinabox.models.swift.storage import (
+    LAYOUT_FLAT, LAYOUT_HASHED, SwiftStorage
+)
 from openstackinabox.services.swift import SwiftV1Service
 
 
@@ -112,6 +118,47 @@ class TestHttprettySwift(unittest.TestCase):
             self.assertEqual(container, expected_container)
             self.assertEqual(object_name, expected_object_name)
 
+    @ddt.data(
+        ('/123456/container/hello%20world',
+         ('123456', 'container', 'hello world')),
+        ('/123456/container/a%2Fb', ('123456', 'container', 'a/b')),
+        ('/123456/pseudo%2Fcontainer/object',
+         ('123456', 'pseudo/container', 'object')),
+        ('/123456/container//object', ('123456', 'container/', 'object')),
+        ('123456/container/object', (None, None, None)),
+        ('/123456/container/object?query', (None, None, None)),
+        ('/123456/container/', (None, None, None)),
+        ('//container/object', (None, None, None)),
+        ('/', (None, None, None)),
+        ('', (None, None, None)),
+    )
+    @ddt.unpack
+    def test_split_uri_names(self, uri, expected_parts):
+        self.assertEqual(SwiftV1Service.split_uri(uri), expected_parts)
+
+    def test_split_uri_cached(self):
+        uri = '/123456/container/{0}'.format(uuid.uuid4())
+        SwiftV1Service.split_uri(uri)
+        hits = SwiftV1Service.split_uri.cache_info().hits
+        self.assertEqual(
+            SwiftV1Service.split_uri(uri),
+            ('123456', 'container', uri.rpartition('/')[2])
+        )
+        self.assertEqual(SwiftV1Service.split_uri.cache_info().hits, hits + 1)
+
+    @ddt.data(
+        '/123456' + '/a' * 10000 + '/object',
+        '/123456/container' + '/' * 10000 + 'object',
+        '/123456/container/' + '%2F' * 10000,
+        '/123456' + '/%' * 10000,
+        '/123456/container' + '/ ' * 10000 + '/',
+    )
+    def test_split_uri_pathological(self, uri):
+        # uncached splits of huge names must stay well within linear time
+        split_uri = SwiftV1Service.split_uri.__wrapped__
+        elapsed = timeit.timeit(lambda: split_uri(uri), number=10) / 10
+        self.assertLess(elapsed, 0.05)
+
     @ddt.data(
         ("hello world", "hello world"),
         ("hello\\world", "hello world"),
@@ -126,48 +173,188 @@ class TestHttprettySwift(unittest.TestCase):
             expected_name
         )
 
+    @ddt.data(
+        (None, (None, None)),
+        ('', (None, None)),
+        ('container', (None, None)),
+        ('/container/', (None, None)),
+        ('container/object', ('container', 'object')),
+        ('/container/object', ('container', 'object')),
+        ('/a/b/object', ('a/b', 'object')),
+        ('/container/hello%20world', ('container', 'hello world')),
+        ('/container/a%2Fb', ('container', 'a/b')),
+    )
+    @ddt.unpack
+    def test_split_copy_path(self, value, expected):
+        self.assertEqual(SwiftV1Service.split_copy_path(value), expected)
+
+    @ddt.data(
+        ('/123456', ['123456']),
+        ('/123456/my%20container', ['123456', 'my container']),
+        ('/123456/a%2Fb?format=json', ['123456', 'a/b']),
+        ('/my%20tenant?bulk-delete', ['my tenant']),
+    )
+    @ddt.unpack
+    def test_split_listing_uri(self, uri, expected_names):
+        names, query = SwiftV1Service.split_listing_uri(uri)
+        self.assertEqual(names, expected_names)
+
+    @ddt.data(
+        (None, None),
+        ('', None),
+        ('bytes=0-9', [(0, 9)]),
+        ('bytes=10-', [(10, None)]),
+        ('bytes=-10', [(None, 10)]),
+        ('bytes=0-0, 5-9,-1', [(0, 0), (5, 9), (None, 1)]),
+        ('BYTES=1-2', [(1, 2)]),
+        ('items=0-9', None),
+        ('bytes=9-0', None),
+        ('bytes=-', None),
+        ('bytes=a-b', None),
+        ('bytes=5', None),
+    )
+    @ddt.unpack
+    def test_parse_range_header(self, value, expected_ranges):
+        self.assertEqual(
+            SwiftV1Service.parse_range_header(value),
+            expected_ranges
+        )
+
+    @ddt.data(
+        ({}, None),
+        ({'if-match': '"abc"'}, None),
+        ({'if-match': 'ABC'}, None),
+        ({'if-match': '*'}, None),
+        ({'if-match': 'def, abc'}, None),
+        ({'if-match': 'def'}, 412),
+        ({'if-none-match': 'abc'}, 304),
+        ({'if-none-match': 'W/"abc"'}, 304),
+        ({'if-none-match': '*'}, 304),
+        ({'if-none-match': 'def'}, None),
+        ({'if-modified-since': 'Thu, 01 Jan 2015 00:00:00 GMT'}, 304),
+        ({'if-modified-since': 'Thu, 01 Jan 2015 00:00:01 GMT'}, 304),
+        ({'if-modified-since': 'Wed, 31 Dec 2014 23:59:59 GMT'}, None),
+        ({'if-modified-since': 'not a date'}, None),
+        ({'if-unmodified-since': 'Wed, 31 Dec 2014 23:59:59 GMT'}, 412),
+        ({'if-unmodified-since': 'Thu, 01 Jan 2015 00:00:00 GMT'}, None),
+        # If-None-Match takes precedence over If-Modified-Since
+        (
+            {
+                'if-none-match': 'def',
+                'if-modified-since': 'Thu, 01 Jan 2015 00:00:00 GMT'
+            },
+            None
+        ),
+        # If-Match takes precedence over If-Unmodified-Since
+        (
+            {
+                'if-match': 'abc',
+                'if-unmodified-since': 'Wed, 31 Dec 2014 23:59:59 GMT'
+            },
+            None
+        ),
+        ({'if-match': 'def', 'if-none-match': 'abc'}, 412),
+    )
+    @ddt.unpack
+    def test_evaluate_conditions(self, request_headers, expected_status):
+        metadata = {
+            'etag': 'abc',
+            'last-modified': 'Thu, 01 Jan 2015 00:00:00 GMT'
+        }
+        self.assertEqual(
+            SwiftV1Service.evaluate_conditions(request_headers, metadata),
+            expected_status
+        )
+
     def test_initialization(self):
         self.assertFalse(self.swift.fail_auth)
         self.assertIsNone(self.swift.fail_error_code)
         self.assertIsInstance(self.swift.model, SwiftServiceModel)
         self.assertIsInstance(self.swift.storage, SwiftStorage)
+        self.assertEqual(self.swift.storage.layout, LAYOUT_FLAT)
+
+        service = SwiftV1Service(layout=LAYOUT_HASHED)
+        self.assertEqual(service.storage.layout, LAYOUT_HASHED)
+
+        backend = SwiftMemoryBackend()
+        service = SwiftV1Service(backend=backend)
+        self.assertIs(service.storage.backend, backend)
+        self.assertFalse(service.storage.dedup)
 
-    def test_do_register_object(self):
+        service = SwiftV1Service(dedup=True)
+        self.assertTrue(service.storage.dedup)
+        self.assertIsNone(service.storage.mmap_threshold)
+
+        service = SwiftV1Service(mmap_threshold=1024)
+        self.assertEqual(service.storage.mmap_threshold, 1024)
+
+    def test_object_routes(self):
         with mock.patch(
             'openstackinabox.services.swift.SwiftV1Service.register'
         ) as mock_stack_register:
             service = SwiftV1Service()
-            tenant_id = '12345'
-            container_name = 'hello'
-            object_name = 'world'
-            expected_uri = '/{0}/{1}/{2}'.format(
-                tenant_id,
-                container_name,
-                object_name
-            )
 
             expected_calls = [
-                (StackInABoxService.GET, expected_uri,
+                (StackInABoxService.GET, SwiftV1Service.OBJECT_URL_REGEX,
                  SwiftV1Service.get_object_handler),
-                (StackInABoxService.PUT, expected_uri,
+                (StackInABoxService.PUT, SwiftV1Service.OBJECT_URL_REGEX,
                  SwiftV1Service.put_object_handler),
-                (StackInABoxService.POST, expected_uri,
-                 SwiftV1Service.put_object_handler),
-                (StackInABoxService.HEAD, expected_uri,
+                (StackInABoxService.POST, SwiftV1Service.OBJECT_URL_REGEX,
+                 SwiftV1Service.post_object_handler),
+                (StackInABoxService.HEAD, SwiftV1Service.OBJECT_URL_REGEX,
                  SwiftV1Service.head_object_handler),
-                (StackInABoxService.DELETE, expected_uri,
-                 SwiftV1Service.delete_object_handler)
+                (StackInABoxService.DELETE, SwiftV1Service.OBJECT_URL_REGEX,
+                 SwiftV1Service.delete_object_handler),
+                (SwiftV1Service.COPY, SwiftV1Service.OBJECT_URL_REGEX,
+                 SwiftV1Service.copy_object_handler)
             ]
-
-            service.do_register_object(
-                tenant_id,
-                container_name,
-                object_name
-            )
-
             for expected_call in expected_calls:
                 mock_stack_register.assert_any_call(*expected_call)
 
+            # objects no longer need routes of their own
+            mock_stack_register.reset_mock()
+            service.do_register_object('12345', 'hello', 'world')
+            mock_stack_register.assert_not_called()
+
+    @ddt.data(
+        ('/12345', False),
+        ('/12345/container', False),
+        ('/12345/container/object', True),
+        ('/12345/container/pseudo/path/object', True),
+        ('/12345/container/', False),
+    )
+    @ddt.unpack
+    def test_object_url_regex(self, path, is_object):
+        self.assertEqual(
+            SwiftV1Service.OBJECT_URL_REGEX.match(path) is not None,
+            is_object
+        )
+
+    def test_unregistered_object(self):
+        routes = len(self.swift.routes)
+        headers = dict(self.headers, etag=hashlib.md5(b'data').hexdigest())
+        url = 'http://localhost/swift/v1.0/12345/container/{0}'
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            for index in range(100):
+                res = requests.put(
+                    url.format('object-{0}'.format(index)),
+                    headers=headers,
+                    data=b'data'
+                )
+                self.assertEqual(res.status_code, 201)
+
+            res = requests.get(url.format('object-99'), headers=self.headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, b'data')
+
+            res = requests.get(url.format('missing'), headers=self.headers)
+            self.assertEqual(res.status_code, 404)
+
+        self.assertEqual(len(self.swift.routes), routes)
+
     def test_add_transaction(self):
         with mock.patch('uuid.uuid4') as mock_uuid:
             mock_uuid.return_value = 'uuid'
@@ -0,0 +1,175 @@
+"""
+Stack-In-A-Box: Swift Account Listing
+"""
+import unittest
+
+import ddt
+import requests
+import stackinabox.util.requests_mock.core
+from stackinabox.stack import StackInABox
+
+from openstackinabox.services.swift import SwiftV1Service
+from openstackinabox.services.keystone import KeystoneV2Service
+
+
+@ddt.ddt
+class TestSwiftV1Account(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSwiftV1Account, self).setUp()
+        self.keystone = KeystoneV2Service()
+        self.swift = SwiftV1Service()
+        self.headers = {
+            'x-auth-token': self.keystone.model.tokens.make_token()
+        }
+        StackInABox.register_service(self.keystone)
+        StackInABox.register_service(self.swift)
+
+        self.tenant_id = '12345'
+        self.objects = {
+            'images': {'a': b'0123456789', 'b': b'01234'},
+            'documents': {'a': b'012'},
+            'empty': {}
+        }
+
+    def tearDown(self):
+        super(TestSwiftV1Account, self).tearDown()
+        StackInABox.reset_services()
+
+    def make_url(self, tenant_id=None, query=None):
+        return (
+            'http://localhost/swift/v1.0/{0}{1}'.format(
+                self.tenant_id if tenant_id is None else tenant_id,
+                '' if query is None else '?{0}'.format(query)
+            )
+        )
+
+    def register_objects(self):
+        for container_name, objects in self.objects.items():
+            self.swift.storage.add_container(self.tenant_id, container_name)
+            for object_name, content in objects.items():
+                self.swift.storage.load_object(
+                    self.tenant_id,
+                    container_name,
+                    object_name,
+                    content
+                )
+
+    @ddt.data(
+        'get',
+        'head'
+    )
+    def test_auth_failure(self, method):
+        self.swift.fail_auth = True
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = getattr(requests, method)(self.make_url())
+            self.assertEqual(res.status_code, 401)
+
+    @ddt.data(
+        'get',
+        'head'
+    )
+    def test_defined_failure(self, method):
+        self.swift.fail_error_code = 499
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = getattr(requests, method)(
+                self.make_url(),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 499)
+
+    @ddt.data(
+        'get',
+        'head'
+    )
+    def test_account_not_found(self, method):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = getattr(requests, method)(
+                self.make_url(),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 404)
+
+    def assert_usage(self, res):
+        self.assertEqual(res.headers['x-account-container-count'], '3')
+        self.assertEqual(res.headers['x-account-object-count'], '3')
+        self.assertEqual(res.headers['x-account-bytes-used'], '18')
+
+    def test_head(self):
+        self.register_objects()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.head(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 204)
+            self.assert_usage(res)
+
+    @ddt.data(
+        ('', ['documents', 'empty', 'images']),
+        ('limit=1', ['documents']),
+        ('marker=documents', ['empty', 'images']),
+        ('prefix=e', ['empty']),
+    )
+    @ddt.unpack
+    def test_listing(self, query, expected_names):
+        self.register_objects()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(
+                self.make_url(query=query),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assert_usage(res)
+            self.assertEqual(res.text.splitlines(), expected_names)
+
+    def test_listing_json(self):
+        self.register_objects()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(
+                self.make_url(query='format=json'),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assert_usage(res)
+            self.assertEqual(
+                res.json(),
+                [
+                    {'name': 'documents', 'count': 1, 'bytes': 3},
+                    {'name': 'empty', 'count': 0, 'bytes': 0},
+                    {'name': 'images', 'count': 2, 'bytes': 15}
+                ]
+            )
+
+    def test_listing_invalid_limit(self):
+        self.register_objects()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(
+                self.make_url(query='limit=10001'),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 412)
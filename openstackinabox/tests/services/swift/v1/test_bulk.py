@@ -0,0 +1,411 @@
+"""
+Stack-In-A-Box: Swift Bulk Delete and Archive Extraction
+"""
+import io
+import tarfile
+import unittest
+
+import ddt
+import mock
+import requests
+import six
+import stackinabox.util.requests_mock.core
+from stackinabox.stack import StackInABox
+
+from openstackinabox.services.swift import SwiftV1Service
+from openstackinabox.services.keystone import KeystoneV2Service
+
+
+@ddt.ddt
+class TestSwiftV1Bulk(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSwiftV1Bulk, self).setUp()
+        self.keystone = KeystoneV2Service()
+        self.swift = SwiftV1Service()
+        self.headers = {
+            'x-auth-token': self.keystone.model.tokens.make_token()
+        }
+        StackInABox.register_service(self.keystone)
+        StackInABox.register_service(self.swift)
+
+        self.tenant_id = '12345'
+        self.container = 'container'
+
+    def tearDown(self):
+        super(TestSwiftV1Bulk, self).tearDown()
+        StackInABox.reset_services()
+
+    def make_url(self, container=None, query=None):
+        return 'http://localhost/swift/v1.0/{0}{1}{2}'.format(
+            self.tenant_id,
+            '' if container is None else '/{0}'.format(container),
+            '' if query is None else '?{0}'.format(query)
+        )
+
+    def make_headers(self, **kwargs):
+        headers = {
+            k: v
+            for k, v in six.iteritems(self.headers)
+        }
+        headers.update(kwargs)
+        return headers
+
+    def make_archive(self, members, mode='w'):
+        archive_data = io.BytesIO()
+        with tarfile.open(fileobj=archive_data, mode=mode) as archive:
+            for name, content in members:
+                member = tarfile.TarInfo(name)
+                if content is None:
+                    member.type = tarfile.DIRTYPE
+                    archive.addfile(member)
+
+                else:
+                    member.size = len(content)
+                    archive.addfile(member, io.BytesIO(content))
+
+        return archive_data.getvalue()
+
+    def load_objects(self, paths):
+        for container, object_name in paths:
+            self.swift.storage.load_object(
+                self.tenant_id,
+                container,
+                object_name,
+                b'data'
+            )
+
+    def read_object(self, container, object_name):
+        data, metadata = self.swift.storage.retrieve_object(
+            self.tenant_id,
+            container,
+            object_name
+        )
+        return data.read() if data is not None else None
+
+    def bulk_delete(self, paths, **headers):
+        return requests.delete(
+            self.make_url(query='bulk-delete'),
+            headers=self.make_headers(**headers),
+            data='\n'.join(paths)
+        )
+
+    def test_auth_failure(self):
+        self.swift.fail_auth = True
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.bulk_delete(['/container/object'])
+            self.assertEqual(res.status_code, 401)
+
+            res = requests.put(
+                self.make_url(query='extract-archive=tar'),
+                headers=self.headers,
+                data=self.make_archive([])
+            )
+            self.assertEqual(res.status_code, 401)
+
+    @ddt.data(
+        ('put', None),
+        ('post', None),
+        ('delete', None),
+        ('put', 'bulk-delete'),
+    )
+    @ddt.unpack
+    def test_not_bulk_request(self, method, query):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.request(
+                method,
+                self.make_url(query=query),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 405)
+
+    @ddt.data('delete', 'post')
+    def test_bulk_delete(self, method):
+        self.load_objects([
+            (self.container, 'a'),
+            (self.container, 'b c'),
+            ('other', 'd'),
+        ])
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.request(
+                method,
+                self.make_url(query='bulk-delete'),
+                headers=self.make_headers(accept='application/json'),
+                data='\n'.join([
+                    '/container/a',
+                    'container/b%20c',
+                    '',
+                    '/container/missing',
+                    '/unknown/e',
+                    '/container',
+                ])
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(
+                res.json(),
+                {
+                    'Number Deleted': 3,
+                    'Number Not Found': 2,
+                    'Response Body': '',
+                    'Response Status': '200 OK',
+                    'Errors': []
+                }
+            )
+
+        self.assertFalse(
+            self.swift.storage.has_container(self.tenant_id, self.container)
+        )
+        self.assertEqual(self.read_object('other', 'd'), b'data')
+
+    def test_bulk_delete_encoded_tenant(self):
+        self.tenant_id = 'my tenant'
+        self.load_objects([(self.container, 'a')])
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.delete(
+                'http://localhost/swift/v1.0/my%20tenant?bulk-delete',
+                headers=self.make_headers(accept='application/json'),
+                data='/container/a'
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.json()['Number Deleted'], 1)
+
+    def test_bulk_delete_container_not_empty(self):
+        self.load_objects([(self.container, 'a')])
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.bulk_delete(['/container'])
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(
+                res.text.splitlines(),
+                [
+                    'Number Deleted: 0',
+                    'Number Not Found: 0',
+                    'Response Body: ',
+                    'Response Status: 400 Bad Request',
+                    'Errors:',
+                    '/container, 409 Conflict',
+                ]
+            )
+
+        self.assertEqual(self.read_object(self.container, 'a'), b'data')
+
+    def test_bulk_delete_one_transaction(self):
+        self.load_objects([(self.container, 'a'), (self.container, 'b')])
+        remove_object = self.swift.model.remove_object
+        batched_calls = []
+
+        def check_remove_object(*args, **kwargs):
+            batched_calls.append(self.swift.model.in_batch)
+            return remove_object(*args, **kwargs)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            with mock.patch.object(
+                self.swift.model,
+                'remove_object',
+                side_effect=check_remove_object
+            ):
+                res = self.bulk_delete(['/container/a', '/container/b'])
+                self.assertEqual(res.status_code, 200)
+
+        # every object row is removed inside the request's transaction
+        self.assertEqual(batched_calls, [True, True])
+
+    @ddt.data(
+        ('tar', 'w'),
+        ('tar.gz', 'w:gz'),
+        ('tar.bz2', 'w:bz2'),
+    )
+    @ddt.unpack
+    def test_extract_archive_account(self, archive_format, mode):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(
+                    query='extract-archive={0}'.format(archive_format)
+                ),
+                headers=self.make_headers(accept='application/json'),
+                data=self.make_archive(
+                    [
+                        ('container', None),
+                        ('container/a', b'first'),
+                        ('./other/b', b'second'),
+                        ('loose', b'third'),
+                        ('../other/c', b'fourth'),
+                    ],
+                    mode=mode
+                )
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(
+                res.json(),
+                {
+                    'Number Files Created': 2,
+                    'Response Body': '',
+                    'Response Status': '400 Bad Request',
+                    'Errors': [
+                        ['loose', '400 Bad Request'],
+                        ['../other/c', '400 Bad Request']
+                    ]
+                }
+            )
+
+        self.assertEqual(self.read_object(self.container, 'a'), b'first')
+        self.assertEqual(self.read_object('other', 'b'), b'second')
+
+    def test_extract_archive_container(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(
+                    container=self.container,
+                    query='extract-archive=tar'
+                ),
+                headers=self.make_headers(accept='application/json'),
+                data=self.make_archive([('a', b'first'), ('b', b'second')])
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.json()['Number Files Created'], 2)
+            self.assertEqual(res.json()['Response Status'], '200 OK')
+
+            res = requests.get(
+                self.make_url(container=self.container),
+                headers=self.headers
+            )
+            self.assertEqual(res.text.split(), ['a', 'b'])
+
+        self.assertEqual(
+            self.swift.storage.get_container_usage(
+                self.tenant_id,
+                self.container
+            ),
+            {'object_count': 2, 'bytes_used': 11}
+        )
+
+    @ddt.data(
+        (None, 'container/'),
+        ('container', ''),
+    )
+    @ddt.unpack
+    def test_extract_archive_round_trip(self, container, member_prefix):
+        members = [
+            ('{0}dir/file'.format(member_prefix), b'nested'),
+            ('{0}a/b/c'.format(member_prefix), b'deeper'),
+            ('{0}file'.format(member_prefix), b'top'),
+        ]
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(
+                    container=container,
+                    query='extract-archive=tar'
+                ),
+                headers=self.make_headers(accept='application/json'),
+                data=self.make_archive(members)
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.json()['Number Files Created'], 3)
+
+            # every file is found at the path it had in the archive
+            paths = ['container/dir/file', 'container/a/b/c', 'container/file']
+            for path, (name, content) in zip(paths, members):
+                res = requests.get(
+                    'http://localhost/swift/v1.0/{0}/{1}'.format(
+                        self.tenant_id,
+                        path
+                    ),
+                    headers=self.headers
+                )
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(res.content, content)
+
+            res = self.bulk_delete(paths, accept='application/json')
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.json()['Number Deleted'], 3)
+            self.assertEqual(res.json()['Number Not Found'], 0)
+
+    def test_extract_archive_container_listing(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(
+                    container=self.container,
+                    query='extract-archive=tar'
+                ),
+                headers=self.make_headers(accept='application/json'),
+                data=self.make_archive([('dir/file', b'nested'), ('top', b'')])
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.json()['Number Files Created'], 2)
+
+            # nested files are listed in their own container, split off at
+            # the last '/' like request paths, not in the URL's container
+            res = requests.get(
+                self.make_url(container=self.container),
+                headers=self.headers
+            )
+            self.assertEqual(res.text.split(), ['top'])
+
+            res = requests.get(
+                self.make_url(container='{0}%2Fdir'.format(self.container)),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.text.split(), ['file'])
+
+    def test_extract_archive_unsupported_format(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(query='extract-archive=zip'),
+                headers=self.headers,
+                data=b'data'
+            )
+            self.assertEqual(res.status_code, 400)
+
+    def test_extract_archive_invalid(self):
+        archive = self.make_archive([('container/a', b'first')], mode='w:gz')
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(query='extract-archive=tar.gz'),
+                headers=self.make_headers(accept='application/json'),
+                data=archive[:len(archive) // 2]
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.json()['Response Status'], '400 Bad Request')
+            self.assertIn('Invalid Tar File', res.json()['Response Body'])
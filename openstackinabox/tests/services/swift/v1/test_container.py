@@ -0,0 +1,293 @@
+"""
+Stack-In-A-Box: Swift Container Listing
+"""
+import email.utils
+import hashlib
+import unittest
+
+import ddt
+import requests
+import stackinabox.util.requests_mock.core
+from stackinabox.stack import StackInABox
+
+from openstackinabox.services.swift import SwiftV1Service
+from openstackinabox.services.keystone import KeystoneV2Service
+
+
+@ddt.ddt
+class TestSwiftV1ContainerGet(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSwiftV1ContainerGet, self).setUp()
+        self.keystone = KeystoneV2Service()
+        self.swift = SwiftV1Service()
+        self.headers = {
+            'x-auth-token': self.keystone.model.tokens.make_token()
+        }
+        StackInABox.register_service(self.keystone)
+        StackInABox.register_service(self.swift)
+
+        self.tenant_id = '12345'
+        self.container = 'container'
+        self.object_names = ['b', 'a-d-e', 'a-c', 'ab', 'a-b', 'a']
+
+    def tearDown(self):
+        super(TestSwiftV1ContainerGet, self).tearDown()
+        StackInABox.reset_services()
+
+    def make_url(self, tenant_id=None, container=None, query=None):
+        return (
+            'http://localhost/swift/v1.0/{0}/{1}{2}'.format(
+                self.tenant_id if tenant_id is None else tenant_id,
+                self.container if container is None else container,
+                '' if query is None else '?{0}'.format(query)
+            )
+        )
+
+    def register_objects(self):
+        for object_name in self.object_names:
+            self.swift.storage.load_object(
+                self.tenant_id,
+                self.container,
+                object_name,
+                object_name.encode('utf-8')
+            )
+
+    def test_auth_failure(self):
+        self.swift.fail_auth = True
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(self.make_url())
+            self.assertEqual(res.status_code, 401)
+
+    def test_defined_failure(self):
+        self.swift.fail_error_code = 499
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 499)
+
+    def test_container_not_found(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 404)
+
+    def test_empty_container(self):
+        self.swift.storage.add_container(self.tenant_id, self.container)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 204)
+
+            res = requests.get(
+                self.make_url(query='format=json'),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.json(), [])
+
+    @ddt.data(
+        ('', ['a', 'a-b', 'a-c', 'a-d-e', 'ab', 'b']),
+        ('limit=2', ['a', 'a-b']),
+        ('marker=a-c', ['a-d-e', 'ab', 'b']),
+        ('end_marker=ab', ['a', 'a-b', 'a-c', 'a-d-e']),
+        ('prefix=a-', ['a-b', 'a-c', 'a-d-e']),
+        ('delimiter=-', ['a', 'a-', 'ab', 'b']),
+        ('delimiter=-&prefix=a-', ['a-b', 'a-c', 'a-d-']),
+        ('delimiter=-&marker=a-', ['ab', 'b']),
+    )
+    @ddt.unpack
+    def test_listing(self, query, expected_names):
+        self.register_objects()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(
+                self.make_url(query=query),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertTrue(
+                res.headers['content-type'].startswith('text/plain')
+            )
+            self.assertEqual(res.text.splitlines(), expected_names)
+            self.assertEqual(res.headers['x-container-object-count'], '6')
+            self.assertEqual(res.headers['x-container-bytes-used'], '15')
+
+    def test_listing_json(self):
+        self.register_objects()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(
+                self.make_url(query='format=json&delimiter=-&prefix=a-'),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertTrue(
+                res.headers['content-type'].startswith('application/json')
+            )
+            listing = res.json()
+            self.assertEqual(
+                [entry.get('name', entry.get('subdir')) for entry in listing],
+                ['a-b', 'a-c', 'a-d-']
+            )
+            self.assertEqual(listing[0]['bytes'], 3)
+            self.assertEqual(
+                listing[0]['content_type'],
+                'application/binary'
+            )
+            self.assertEqual(
+                listing[0]['hash'],
+                self.swift.storage.get_etag(b'a-b')
+            )
+
+            res = requests.head(
+                'http://localhost/swift/v1.0/{0}/{1}/a-b'.format(
+                    self.tenant_id,
+                    self.container
+                ),
+                headers=self.headers
+            )
+            self.assertEqual(
+                listing[0]['last_modified'],
+                email.utils.parsedate_to_datetime(
+                    res.headers['last-modified']
+                ).strftime('%Y-%m-%dT%H:%M:%S.%f')
+            )
+
+    def test_listing_pages(self):
+        self.register_objects()
+
+        names = []
+        marker = ''
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            while True:
+                res = requests.get(
+                    self.make_url(query='limit=4&marker={0}'.format(marker)),
+                    headers=self.headers
+                )
+                if res.status_code == 204:
+                    break
+
+                page = res.text.splitlines()
+                self.assertLessEqual(len(page), 4)
+                names.extend(page)
+                marker = page[-1]
+
+        self.assertEqual(names, sorted(self.object_names))
+
+    @ddt.data(
+        'limit=-1',
+        'limit=10001',
+        'limit=abc'
+    )
+    def test_invalid_limit(self, query):
+        self.register_objects()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(
+                self.make_url(query=query),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 412)
+
+    def test_head(self):
+        self.register_objects()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.head(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 204)
+            self.assertEqual(res.headers['x-container-object-count'], '6')
+            self.assertEqual(res.headers['x-container-bytes-used'], '15')
+
+            res = requests.head(
+                self.make_url(container='unknown'),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 404)
+
+    def test_encoded_names(self):
+        self.container = 'my container'
+        self.register_objects()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            # the container is named the same way object paths name it
+            res = requests.put(
+                'http://localhost/swift/v1.0/{0}/my%20container/c%20d'.format(
+                    self.tenant_id
+                ),
+                headers=dict(
+                    self.headers,
+                    etag=hashlib.md5(b'').hexdigest()
+                ),
+                data=b''
+            )
+            self.assertEqual(res.status_code, 201)
+
+            for method in ('get', 'head'):
+                res = requests.request(
+                    method,
+                    self.make_url(container='my%20container'),
+                    headers=self.headers
+                )
+                self.assertIn(res.status_code, (200, 204))
+                self.assertEqual(res.headers['x-container-object-count'], '7')
+
+            res = requests.get(
+                self.make_url(container='my%20container'),
+                headers=self.headers
+            )
+            self.assertIn('c d', res.text.splitlines())
+
+    @ddt.data(
+        ('prefix=%ED%9F%BF', [u'\ud7ff-a']),
+        (
+            'delimiter=%ED%9F%BF',
+            ['a', 'a-b', 'a-c', 'a-d-e', 'ab', 'b', u'\ud7ff']
+        ),
+        ('prefix=%ED%9F%BF&delimiter=-', [u'\ud7ff-']),
+    )
+    @ddt.unpack
+    def test_listing_surrogate_bounds(self, query, expected_names):
+        self.object_names.append(u'\ud7ff-a')
+        self.register_objects()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(
+                self.make_url(query=query),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.text.splitlines(), expected_names)
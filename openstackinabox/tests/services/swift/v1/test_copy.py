@@ -0,0 +1,288 @@
+"""
+Stack-In-A-Box: Swift Server Side Object Copy
+"""
+import os
+import unittest
+
+import ddt
+import requests
+import six
+import stackinabox.util.requests_mock.core
+from stackinabox.stack import StackInABox
+
+from openstackinabox.models.swift.backends import SwiftMemoryBackend
+from openstackinabox.services.swift import SwiftV1Service
+from openstackinabox.services.keystone import KeystoneV2Service
+
+
+@ddt.ddt
+class TestSwiftV1ObjectCopy(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSwiftV1ObjectCopy, self).setUp()
+        self.keystone = KeystoneV2Service()
+        self.headers = {
+            'x-auth-token': self.keystone.model.tokens.make_token()
+        }
+        self.tenant_id = '12345'
+        self.container = 'container'
+        self.object_name = 'object_name'
+        self.dest_container = 'backups'
+        self.dest_object_name = 'object_copy'
+        self.make_service(SwiftV1Service())
+
+    def tearDown(self):
+        super(TestSwiftV1ObjectCopy, self).tearDown()
+        StackInABox.reset_services()
+
+    def make_service(self, service):
+        StackInABox.reset_services()
+        self.swift = service
+        StackInABox.register_service(self.keystone)
+        StackInABox.register_service(self.swift)
+        for container, object_name in (
+            (self.container, self.object_name),
+            (self.dest_container, self.dest_object_name)
+        ):
+            self.swift.do_register_object(
+                self.tenant_id,
+                container,
+                object_name
+            )
+
+    def make_url(self, container=None, object_name=None):
+        return (
+            'http://localhost/swift/v1.0/{0}/{1}/{2}'.format(
+                self.tenant_id,
+                self.container if container is None else container,
+                self.object_name if object_name is None else object_name
+            )
+        )
+
+    def make_headers(self, **kwargs):
+        headers = {
+            k: v
+            for k, v in six.iteritems(self.headers)
+        }
+        headers.update(kwargs)
+        return headers
+
+    def register_object(self, content):
+        self.swift.storage.load_object(
+            self.tenant_id,
+            self.container,
+            self.object_name,
+            content
+        )
+        self.swift.storage.store_or_update_custom_metadata(
+            self.tenant_id,
+            self.container,
+            self.object_name,
+            {'x-object-meta-color': 'blue'}
+        )
+
+    def copy(self, **kwargs):
+        return requests.request(
+            SwiftV1Service.COPY,
+            self.make_url(),
+            headers=self.make_headers(**kwargs)
+        )
+
+    def copy_from(self, **kwargs):
+        return requests.put(
+            self.make_url(self.dest_container, self.dest_object_name),
+            headers=self.make_headers(
+                **{
+                    'x-copy-from': '/{0}/{1}'.format(
+                        self.container,
+                        self.object_name
+                    )
+                }
+            ),
+            **kwargs
+        )
+
+    def assert_copied(self, res, content):
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(
+            res.headers['x-copied-from'],
+            '{0}/{1}'.format(self.container, self.object_name)
+        )
+        self.assertEqual(
+            res.headers['etag'],
+            self.swift.storage.get_etag(content)
+        )
+
+        res = requests.get(
+            self.make_url(self.dest_container, self.dest_object_name),
+            headers=self.headers
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.content, content)
+        return res
+
+    def test_auth_failure(self):
+        self.swift.fail_auth = True
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.request(SwiftV1Service.COPY, self.make_url())
+            self.assertEqual(res.status_code, 401)
+
+            res = self.copy_from()
+            self.assertEqual(res.status_code, 401)
+
+    def test_auth_failure_no_headers(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.request(SwiftV1Service.COPY, self.make_url())
+            self.assertEqual(res.status_code, 401)
+
+    @ddt.data(
+        {},
+        {'destination': 'backups'},
+        {'destination': '/backups/'},
+    )
+    def test_invalid_destination(self, extra_headers):
+        self.register_object(b'data')
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.copy(**extra_headers)
+            self.assertEqual(res.status_code, 412)
+
+    def test_object_not_found(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.copy(
+                destination='/{0}/{1}'.format(
+                    self.dest_container,
+                    self.dest_object_name
+                )
+            )
+            self.assertEqual(res.status_code, 404)
+
+            res = self.copy_from()
+            self.assertEqual(res.status_code, 404)
+
+    def test_copy(self):
+        content = os.urandom(1024)
+        self.register_object(content)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.copy(
+                destination='/{0}/{1}'.format(
+                    self.dest_container,
+                    self.dest_object_name
+                )
+            )
+            res = self.assert_copied(res, content)
+            self.assertEqual(res.headers['x-object-meta-color'], 'blue')
+
+            # the copy shares the source's data instead of duplicating it
+            source_path = self.swift.storage.get_object_path(
+                self.tenant_id,
+                self.container,
+                self.object_name
+            )
+            dest_path = self.swift.storage.get_object_path(
+                self.tenant_id,
+                self.dest_container,
+                self.dest_object_name
+            )
+            self.assertNotEqual(source_path, dest_path)
+            self.assertTrue(os.path.samefile(source_path, dest_path))
+
+            # and is unaffected by the source being replaced or removed
+            self.swift.storage.load_object(
+                self.tenant_id,
+                self.container,
+                self.object_name,
+                b'replaced'
+            )
+            res = requests.delete(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 204)
+
+            res = requests.get(
+                self.make_url(self.dest_container, self.dest_object_name),
+                headers=self.headers
+            )
+            self.assertEqual(res.content, content)
+
+    def test_copy_metadata(self):
+        content = os.urandom(1024)
+        self.register_object(content)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.copy(
+                **{
+                    'destination': '/{0}/{1}'.format(
+                        self.dest_container,
+                        self.dest_object_name
+                    ),
+                    'x-fresh-metadata': 'true',
+                    'x-object-meta-shape': 'round',
+                    'content-type': 'text/plain'
+                }
+            )
+            res = self.assert_copied(res, content)
+            self.assertEqual(res.headers['x-object-meta-shape'], 'round')
+            self.assertEqual(res.headers['content-type'], 'text/plain')
+            self.assertNotIn('x-object-meta-color', res.headers)
+
+    def test_copy_from(self):
+        content = os.urandom(1024)
+        self.register_object(content)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.copy_from(data=b'')
+            self.assert_copied(res, content)
+            self.assertEqual(
+                self.swift.storage.get_container_usage(
+                    self.tenant_id,
+                    self.dest_container
+                ),
+                {'object_count': 1, 'bytes_used': 1024}
+            )
+
+    @ddt.data(
+        {'backend': SwiftMemoryBackend()},
+        {'dedup': True},
+        {'backend': SwiftMemoryBackend(), 'dedup': True},
+    )
+    def test_copy_storage_modes(self, service_kwargs):
+        self.make_service(SwiftV1Service(**service_kwargs))
+        content = os.urandom(1024)
+        self.register_object(content)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.copy_from()
+            self.assert_copied(res, content)
+
+        if self.swift.storage.dedup:
+            self.assertEqual(
+                self.swift.model.get_blob(
+                    self.swift.storage.get_etag(content)
+                )['refcount'],
+                2
+            )
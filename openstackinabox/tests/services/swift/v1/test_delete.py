@@ -10,6 +10,7 @@ import six
 import stackinabox.util.requests_mock.core
 from stackinabox.stack import StackInABox
 
+from openstackinabox.models.swift.storage import SwiftStorage
 from openstackinabox.services.swift import SwiftV1Service
 from openstackinabox.services.keystone import KeystoneV2Service
 
@@ -183,7 +184,7 @@ class TestSwiftV1ObjectHead(unittest.TestCase):
     def test_internal_error(self):
         with mock.patch(
             'openstackinabox.models.swift.storage.SwiftStorage.'
-            'remove_custom_metadata'
+            'remove_versioned_object'
         ) as mock_storage_remove:
             mock_storage_remove.side_effect = Exception('Mock Error')
 
@@ -219,3 +220,42 @@ class TestSwiftV1ObjectHead(unittest.TestCase):
                     if six.PY2
                     else b'Internal Server Error'
                 )
+
+    def test_does_not_read_data(self):
+        object_size = 1024
+        object_data = os.urandom(object_size)
+        self.swift.do_register_object(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+        self.register_tenant()
+        self.register_object(
+            content=object_data,
+            file_size=object_size,
+            metadata={
+                'content-length': '{0}'.format(object_size)
+            }
+        )
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            with mock.patch.object(
+                SwiftStorage,
+                'retrieve_object'
+            ) as mock_retrieve_object:
+                res = requests.delete(
+                    self.make_url(),
+                    headers=self.headers
+                )
+
+            self.assertEqual(res.status_code, 204)
+            mock_retrieve_object.assert_not_called()
+
+            res = requests.head(
+                self.make_url(),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 404)
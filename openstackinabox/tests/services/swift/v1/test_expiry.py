@@ -0,0 +1,175 @@
+"""
+Stack-In-A-Box: Swift Expiring Objects
+"""
+import hashlib
+import time
+import unittest
+
+import ddt
+import mock
+import requests
+import six
+import stackinabox.util.requests_mock.core
+from stackinabox.stack import StackInABox
+
+from openstackinabox.services.swift import SwiftV1Service
+from openstackinabox.services.keystone import KeystoneV2Service
+
+
+@ddt.ddt
+class TestSwiftV1ObjectExpiry(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSwiftV1ObjectExpiry, self).setUp()
+        self.keystone = KeystoneV2Service()
+        self.swift = SwiftV1Service()
+        self.headers = {
+            'x-auth-token': self.keystone.model.tokens.make_token()
+        }
+        StackInABox.register_service(self.keystone)
+        StackInABox.register_service(self.swift)
+
+        self.tenant_id = '12345'
+        self.container = 'container'
+        self.object_name = 'object_name'
+        self.url = 'http://localhost/swift/v1.0/{0}/{1}/{2}'.format(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+        self.content = b'short lived'
+        self.now = int(time.time())
+
+    def tearDown(self):
+        super(TestSwiftV1ObjectExpiry, self).tearDown()
+        StackInABox.reset_services()
+
+    def make_headers(self, **kwargs):
+        headers = {
+            k: v
+            for k, v in six.iteritems(self.headers)
+        }
+        headers.update(kwargs)
+        return headers
+
+    def put(self, **kwargs):
+        return requests.put(
+            self.url,
+            headers=self.make_headers(
+                etag=hashlib.md5(self.content).hexdigest(),
+                **kwargs
+            ),
+            data=self.content
+        )
+
+    def get_at(self, now):
+        with mock.patch('time.time', return_value=now):
+            return requests.get(self.url, headers=self.headers)
+
+    @ddt.data(
+        {'x-delete-at': '{0}'},
+        {'x-delete-after': '100'},
+    )
+    def test_expiry(self, expiry_headers):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            with mock.patch('time.time', return_value=self.now):
+                res = self.put(
+                    **{
+                        k: v.format(self.now + 100)
+                        for k, v in six.iteritems(expiry_headers)
+                    }
+                )
+            self.assertEqual(res.status_code, 201)
+            path = self.swift.storage.get_object_path(
+                self.tenant_id,
+                self.container,
+                self.object_name
+            )
+
+            res = self.get_at(self.now + 99)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, self.content)
+            self.assertEqual(res.headers['x-delete-at'], str(self.now + 100))
+            self.assertNotIn('x-delete-after', res.headers)
+
+            res = self.get_at(self.now + 100)
+            self.assertEqual(res.status_code, 404)
+            self.assertFalse(self.swift.storage.backend.exists(path))
+            self.assertNotIn(path, self.swift.storage.metadata)
+            self.assertIsNone(self.swift.storage.next_delete_at)
+
+    @ddt.data(
+        {'x-delete-at': 'tomorrow'},
+        {'x-delete-at': '1'},
+        {'x-delete-after': 'soon'},
+        {'x-delete-after': '-1'},
+    )
+    def test_invalid_expiry(self, expiry_headers):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put(**expiry_headers)
+            self.assertEqual(res.status_code, 400)
+
+            res = self.put()
+            self.assertEqual(res.status_code, 201)
+
+            res = requests.post(
+                self.url,
+                headers=self.make_headers(**expiry_headers)
+            )
+            self.assertEqual(res.status_code, 400)
+
+    def test_post_expiry(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put()
+            self.assertEqual(res.status_code, 201)
+
+            res = requests.post(
+                self.url,
+                headers=self.make_headers(
+                    **{'x-delete-at': str(self.now + 100)}
+                )
+            )
+            self.assertEqual(res.status_code, 202)
+            res = self.get_at(self.now)
+            self.assertEqual(res.headers['x-delete-at'], str(self.now + 100))
+
+            res = requests.post(
+                self.url,
+                headers=self.make_headers(**{'x-remove-delete-at': '1'})
+            )
+            self.assertEqual(res.status_code, 202)
+            res = self.get_at(self.now + 100)
+            self.assertEqual(res.status_code, 200)
+            self.assertNotIn('x-delete-at', res.headers)
+
+            res = requests.post(
+                self.url.replace(self.object_name, 'missing'),
+                headers=self.make_headers(
+                    **{'x-delete-at': str(self.now + 100)}
+                )
+            )
+            self.assertEqual(res.status_code, 404)
+
+    def test_overwrite_clears_expiry(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put(**{'x-delete-after': '100'})
+            self.assertEqual(res.status_code, 201)
+
+            res = self.put()
+            self.assertEqual(res.status_code, 201)
+
+            res = self.get_at(self.now + 1000)
+            self.assertEqual(res.status_code, 200)
+            self.assertNotIn('x-delete-at', res.headers)
@@ -1,17 +1,24 @@
 """
 Stack-In-A-Box: Basic Test
 """
+import email
 import os
 import unittest
 
+import ddt
+import mock
 import requests
+import six
 import stackinabox.util.requests_mock.core
 from stackinabox.stack import StackInABox
 
+from openstackinabox.models.swift.backends import SwiftMemoryBackend
+from openstackinabox.models.swift.storage import SwiftStorage
 from openstackinabox.services.swift import SwiftV1Service
 from openstackinabox.services.keystone import KeystoneV2Service
 
 
+@ddt.ddt
 class TestSwiftV1ObjectGet(unittest.TestCase):
 
     def setUp(self):
@@ -150,7 +157,35 @@ class TestSwiftV1ObjectGet(unittest.TestCase):
             self.assertEqual(res.status_code, 204)
 
     def test_nonzero_length_file(self):
-        object_size = 1024
+        self.assert_nonzero_length_file(1024)
+
+    def test_multiple_chunk_file(self):
+        self.assert_nonzero_length_file(
+            self.swift.storage.chunk_size * 3 + 1
+        )
+
+    def test_memory_mapped_file(self):
+        StackInABox.reset_services()
+        self.swift = SwiftV1Service(mmap_threshold=1024)
+        StackInABox.register_service(self.keystone)
+        StackInABox.register_service(self.swift)
+
+        self.assert_nonzero_length_file(
+            self.swift.storage.chunk_size * 3 + 1
+        )
+
+    def test_memory_backend(self):
+        StackInABox.reset_services()
+        self.swift = SwiftV1Service(backend=SwiftMemoryBackend())
+        StackInABox.register_service(self.keystone)
+        StackInABox.register_service(self.swift)
+
+        self.assert_nonzero_length_file(
+            self.swift.storage.chunk_size * 3 + 1
+        )
+        self.assertFalse(os.path.exists(self.swift.storage.location))
+
+    def assert_nonzero_length_file(self, object_size):
         object_data = os.urandom(object_size)
         self.swift.do_register_object(
             self.tenant_id,
@@ -178,3 +213,222 @@ class TestSwiftV1ObjectGet(unittest.TestCase):
             content = res.content
             self.assertEqual(content, object_data)
             self.assertEqual(len(content), object_size)
+
+    def register_range_object(self, object_size=1024):
+        object_data = os.urandom(object_size)
+        self.swift.do_register_object(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+        self.register_tenant()
+        self.register_object(
+            content=object_data,
+            file_size=object_size,
+            metadata={
+                'content-length': '{0}'.format(object_size),
+                'content-type': 'application/binary'
+            }
+        )
+        return object_data
+
+    @ddt.data(
+        ('bytes=0-99', 0, 100),
+        ('bytes=1000-', 1000, 24),
+        ('bytes=1000-5000', 1000, 24),
+        ('bytes=-24', 1000, 24),
+        ('bytes=-5000', 0, 1024),
+    )
+    @ddt.unpack
+    def test_single_range(self, range_header, offset, length):
+        object_data = self.register_range_object()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            headers = dict(self.headers)
+            headers['range'] = range_header
+            res = requests.get(self.make_url(), headers=headers)
+            self.assertEqual(res.status_code, 206)
+            self.assertEqual(res.content, object_data[offset:offset + length])
+            self.assertEqual(res.headers['content-length'], str(length))
+            self.assertEqual(
+                res.headers['content-range'],
+                'bytes {0}-{1}/1024'.format(offset, offset + length - 1)
+            )
+
+    def test_multiple_ranges(self):
+        object_data = self.register_range_object()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            headers = dict(self.headers)
+            headers['range'] = 'bytes=0-9,2000-3000,-10'
+            res = requests.get(self.make_url(), headers=headers)
+            self.assertEqual(res.status_code, 206)
+            self.assertEqual(
+                res.headers['content-length'],
+                str(len(res.content))
+            )
+            self.assertTrue(
+                res.headers['content-type'].startswith(
+                    'multipart/byteranges'
+                )
+            )
+
+            message_from_bytes = (
+                email.message_from_string
+                if six.PY2
+                else email.message_from_bytes
+            )
+            message = message_from_bytes(
+                'Content-Type: {0}\r\n\r\n'.format(
+                    res.headers['content-type']
+                ).encode('utf-8') + res.content
+            )
+            parts = message.get_payload()
+            self.assertEqual(len(parts), 2)
+            self.assertEqual(
+                parts[0]['content-range'],
+                'bytes 0-9/1024'
+            )
+            self.assertEqual(
+                parts[0].get_payload(decode=True),
+                object_data[:10]
+            )
+            self.assertEqual(
+                parts[1]['content-range'],
+                'bytes 1014-1023/1024'
+            )
+            self.assertEqual(
+                parts[1].get_payload(decode=True),
+                object_data[-10:]
+            )
+
+    def test_unsatisfiable_range(self):
+        self.register_range_object()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            headers = dict(self.headers)
+            headers['range'] = 'bytes=2000-3000'
+            res = requests.get(self.make_url(), headers=headers)
+            self.assertEqual(res.status_code, 416)
+            self.assertEqual(res.headers['content-range'], 'bytes */1024')
+
+    def test_invalid_range_ignored(self):
+        object_data = self.register_range_object()
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            headers = dict(self.headers)
+            headers['range'] = 'bytes=10-1'
+            res = requests.get(self.make_url(), headers=headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, object_data)
+            self.assertEqual(res.headers['accept-ranges'], 'bytes')
+
+    def test_range_object_not_found(self):
+        self.swift.do_register_object(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            headers = dict(self.headers)
+            headers['range'] = 'bytes=0-9'
+            res = requests.get(self.make_url(), headers=headers)
+            self.assertEqual(res.status_code, 404)
+
+    @ddt.data(
+        ('if-none-match', '{etag}', 304),
+        ('if-match', 'other', 412),
+        ('if-modified-since', '{last_modified}', 304),
+        ('if-unmodified-since', 'Thu, 01 Jan 2015 00:00:00 GMT', 412),
+    )
+    @ddt.unpack
+    def test_conditional_failure(self, header, value, expected_status):
+        self.register_range_object()
+        metadata = self.swift.storage.retrieve_object_metadata(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            headers = dict(self.headers)
+            headers[header] = value.format(
+                etag=metadata['etag'],
+                last_modified=metadata['last-modified']
+            )
+            with mock.patch.object(
+                SwiftStorage,
+                'open_object_stream'
+            ) as mock_open_object_stream:
+                res = requests.get(self.make_url(), headers=headers)
+
+            self.assertEqual(res.status_code, expected_status)
+            self.assertEqual(res.headers['etag'], metadata['etag'])
+            self.assertEqual(
+                res.headers['last-modified'],
+                metadata['last-modified']
+            )
+            mock_open_object_stream.assert_not_called()
+
+    @ddt.data(
+        ('if-none-match', 'other'),
+        ('if-match', '{etag}'),
+        ('if-modified-since', 'Thu, 01 Jan 2015 00:00:00 GMT'),
+        ('if-unmodified-since', '{last_modified}'),
+    )
+    @ddt.unpack
+    def test_conditional_success(self, header, value):
+        object_data = self.register_range_object()
+        metadata = self.swift.storage.retrieve_object_metadata(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            headers = dict(self.headers)
+            headers[header] = value.format(
+                etag=metadata['etag'],
+                last_modified=metadata['last-modified']
+            )
+            res = requests.get(self.make_url(), headers=headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, object_data)
+
+    def test_conditional_object_not_found(self):
+        self.swift.do_register_object(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            headers = dict(self.headers)
+            headers['if-none-match'] = '*'
+            res = requests.get(self.make_url(), headers=headers)
+            self.assertEqual(res.status_code, 404)
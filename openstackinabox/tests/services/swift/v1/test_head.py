@@ -4,10 +4,12 @@ Stack-In-A-Box: Basic Test
 import os
 import unittest
 
+import mock
 import requests
 import stackinabox.util.requests_mock.core
 from stackinabox.stack import StackInABox
 
+from openstackinabox.models.swift.storage import SwiftStorage
 from openstackinabox.services.swift import SwiftV1Service
 from openstackinabox.services.keystone import KeystoneV2Service
 
@@ -177,3 +179,115 @@ class TestSwiftV1ObjectHead(unittest.TestCase):
             self.assertEqual(res.status_code, 204)
             content = res.content
             self.assertEqual(len(content), 0)
+
+    def test_does_not_read_data(self):
+        object_size = 1024
+        object_data = os.urandom(object_size)
+        self.swift.do_register_object(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+        self.register_tenant()
+        self.register_object(
+            content=object_data,
+            file_size=object_size,
+            metadata={
+                'content-length': '{0}'.format(object_size)
+            }
+        )
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            with mock.patch.object(
+                SwiftStorage,
+                'retrieve_object'
+            ) as mock_retrieve_object:
+                with mock.patch.object(
+                    SwiftStorage,
+                    'open_object_stream'
+                ) as mock_open_object_stream:
+                    res = requests.head(
+                        self.make_url(),
+                        headers=self.headers
+                    )
+
+            self.assertEqual(res.status_code, 204)
+            self.assertEqual(
+                res.headers['content-length'],
+                str(object_size)
+            )
+            mock_retrieve_object.assert_not_called()
+            mock_open_object_stream.assert_not_called()
+
+    def test_missing_data(self):
+        self.swift.do_register_object(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+        self.register_tenant()
+        self.register_object(
+            content=b'data',
+            file_size=4,
+            metadata={
+                'content-length': '4'
+            }
+        )
+        os.remove(
+            self.swift.storage.get_object_path(
+                self.tenant_id,
+                self.container,
+                self.object_name
+            )
+        )
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.head(
+                self.make_url(),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 404)
+
+    def test_conditional(self):
+        self.swift.do_register_object(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+        self.register_tenant()
+        self.register_object(
+            content=b'data',
+            file_size=4,
+            metadata={
+                'content-length': '4'
+            }
+        )
+        metadata = self.swift.storage.retrieve_object_metadata(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            headers = dict(self.headers)
+            headers['if-none-match'] = metadata['etag']
+            res = requests.head(self.make_url(), headers=headers)
+            self.assertEqual(res.status_code, 304)
+            self.assertEqual(
+                res.headers['last-modified'],
+                metadata['last-modified']
+            )
+
+            headers = dict(self.headers)
+            headers['if-match'] = 'other'
+            res = requests.head(self.make_url(), headers=headers)
+            self.assertEqual(res.status_code, 412)
@@ -0,0 +1,386 @@
+"""
+Stack-In-A-Box: Swift Static and Dynamic Large Objects
+"""
+import hashlib
+import json
+import os
+import unittest
+
+import ddt
+import requests
+import six
+import stackinabox.util.requests_mock.core
+from stackinabox.stack import StackInABox
+
+from openstackinabox.services.swift import SwiftV1Service
+from openstackinabox.services.keystone import KeystoneV2Service
+
+
+@ddt.ddt
+class TestSwiftV1LargeObject(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSwiftV1LargeObject, self).setUp()
+        self.keystone = KeystoneV2Service()
+        self.swift = SwiftV1Service()
+        self.headers = {
+            'x-auth-token': self.keystone.model.tokens.make_token()
+        }
+        StackInABox.register_service(self.keystone)
+        StackInABox.register_service(self.swift)
+
+        self.tenant_id = '12345'
+        self.container = 'container'
+        self.object_name = 'large'
+        self.segment_container = 'segments'
+        self.segment_names = [
+            'part-{0:03d}'.format(index) for index in range(3)
+        ]
+        self.segments = [os.urandom(1024 + index) for index in range(3)]
+        for object_name in [self.object_name, 'nested']:
+            self.swift.do_register_object(
+                self.tenant_id,
+                self.container,
+                object_name
+            )
+
+        for object_name, content in zip(self.segment_names, self.segments):
+            self.swift.do_register_object(
+                self.tenant_id,
+                self.segment_container,
+                object_name
+            )
+            self.swift.storage.load_object(
+                self.tenant_id,
+                self.segment_container,
+                object_name,
+                content
+            )
+
+    def tearDown(self):
+        super(TestSwiftV1LargeObject, self).tearDown()
+        StackInABox.reset_services()
+
+    def make_url(self, container=None, object_name=None, query=None):
+        return (
+            'http://localhost/swift/v1.0/{0}/{1}/{2}{3}'.format(
+                self.tenant_id,
+                self.container if container is None else container,
+                self.object_name if object_name is None else object_name,
+                '' if query is None else '?{0}'.format(query)
+            )
+        )
+
+    def make_headers(self, **kwargs):
+        headers = {
+            k: v
+            for k, v in six.iteritems(self.headers)
+        }
+        headers.update(kwargs)
+        return headers
+
+    def make_manifest(self, with_etags=True, with_sizes=True):
+        return [
+            {
+                'path': '/{0}/{1}'.format(self.segment_container, name),
+                'etag': (
+                    hashlib.md5(content).hexdigest() if with_etags else None
+                ),
+                'size_bytes': len(content) if with_sizes else None
+            }
+            for name, content in zip(self.segment_names, self.segments)
+        ]
+
+    def get_large_object_etag(self):
+        return hashlib.md5(
+            b''.join(
+                hashlib.md5(content).hexdigest().encode('utf-8')
+                for content in self.segments
+            )
+        ).hexdigest()
+
+    def put_manifest(self, manifest, object_name=None, **headers):
+        return requests.put(
+            self.make_url(
+                object_name=object_name,
+                query='multipart-manifest=put'
+            ),
+            headers=self.make_headers(**headers),
+            data=json.dumps(manifest)
+        )
+
+    def test_auth_failure(self):
+        self.swift.fail_auth = True
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_manifest(self.make_manifest())
+            self.assertEqual(res.status_code, 401)
+
+    @ddt.data(
+        (True, True),
+        (False, True),
+        (True, False),
+        (False, False),
+    )
+    @ddt.unpack
+    def test_static_large_object(self, with_etags, with_sizes):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_manifest(
+                self.make_manifest(with_etags, with_sizes),
+                **{'x-object-meta-color': 'blue'}
+            )
+            self.assertEqual(res.status_code, 201)
+            self.assertEqual(res.headers['etag'], self.get_large_object_etag())
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, b''.join(self.segments))
+            self.assertEqual(
+                res.headers['content-length'],
+                str(sum(len(content) for content in self.segments))
+            )
+            self.assertEqual(res.headers['etag'], self.get_large_object_etag())
+            self.assertEqual(res.headers['x-static-large-object'], 'True')
+            self.assertEqual(res.headers['x-object-meta-color'], 'blue')
+
+            res = requests.head(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 204)
+            self.assertEqual(
+                res.headers['content-length'],
+                str(sum(len(content) for content in self.segments))
+            )
+
+            # ranges of large objects are answered with the whole object
+            res = requests.get(
+                self.make_url(),
+                headers=self.make_headers(range='bytes=0-9')
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, b''.join(self.segments))
+
+    def test_get_manifest(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_manifest(self.make_manifest())
+            self.assertEqual(res.status_code, 201)
+
+            res = requests.get(
+                self.make_url(query='multipart-manifest=get'),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(
+                int(res.headers['content-length']),
+                len(res.content)
+            )
+            self.assertEqual(
+                [segment['name'] for segment in res.json()],
+                [
+                    '/{0}/{1}'.format(self.segment_container, name)
+                    for name in self.segment_names
+                ]
+            )
+
+    def test_cached_manifest(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_manifest(self.make_manifest())
+            self.assertEqual(res.status_code, 201)
+            self.assertEqual(len(self.swift.storage.manifests), 1)
+
+            # a manifest missing from the cache is read back from its data
+            self.swift.storage.manifests.clear()
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.content, b''.join(self.segments))
+            self.assertEqual(len(self.swift.storage.manifests), 1)
+
+            res = requests.delete(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 204)
+            self.assertEqual(self.swift.storage.manifests, {})
+
+    def test_nested_static_large_object(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_manifest(self.make_manifest())
+            self.assertEqual(res.status_code, 201)
+
+            manifest = [
+                {'path': '/{0}/{1}'.format(self.container, self.object_name)}
+            ] + self.make_manifest()[:1]
+            res = self.put_manifest(manifest, object_name='nested')
+            self.assertEqual(res.status_code, 201)
+
+            res = requests.get(
+                self.make_url(object_name='nested'),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(
+                res.content,
+                b''.join(self.segments) + self.segments[0]
+            )
+
+    def test_delete_manifest(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_manifest(self.make_manifest())
+            self.assertEqual(res.status_code, 201)
+
+            # as sent by python-swiftclient when deleting a large object
+            for method in ('post', 'delete'):
+                res = requests.request(
+                    method,
+                    self.make_url(query='multipart-manifest=delete'),
+                    headers=self.headers
+                )
+                self.assertIn(res.status_code, (202, 204))
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 404)
+
+    @ddt.data(
+        ('missing', 'path', '/segments/missing'),
+        ('etag', 'etag', 'bad'),
+        ('size', 'size_bytes', 1),
+    )
+    @ddt.unpack
+    def test_invalid_segments(self, error, key, value):
+        manifest = self.make_manifest()
+        manifest[1][key] = value
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_manifest(manifest)
+            self.assertEqual(res.status_code, 400)
+            self.assertIn(manifest[1]['path'], res.text)
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 404)
+
+    @ddt.data(
+        'not json',
+        '[]',
+        '{"path": "/segments/part-000"}',
+        '[{"etag": "etag"}]',
+        '[{"path": "/segments/part-000", "size_bytes": "x"}]',
+        '[{"path": "/segments/part-000", "size_bytes": -1}]',
+        '[{"path": "/segments/part-000", "size_bytes": true}]',
+        '[{"path": "/segments/part-000", "etag": 5}]',
+        '[{"path": 5}]',
+    )
+    def test_invalid_manifest(self, body):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(query='multipart-manifest=put'),
+                headers=self.headers,
+                data=body
+            )
+            self.assertEqual(res.status_code, 400)
+
+    def test_reserved_header(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(),
+                headers=self.make_headers(
+                    etag=hashlib.md5(b'not a manifest').hexdigest(),
+                    **{'x-static-large-object': 'True'}
+                ),
+                data=b'not a manifest'
+            )
+            self.assertEqual(res.status_code, 400)
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 404)
+
+    def test_manifest_etag_mismatch(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_manifest(self.make_manifest(), etag='bad')
+            self.assertEqual(res.status_code, 422)
+
+            res = self.put_manifest(
+                self.make_manifest(),
+                etag=self.get_large_object_etag()
+            )
+            self.assertEqual(res.status_code, 201)
+
+    def test_dynamic_large_object(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(),
+                headers=self.make_headers(
+                    **{
+                        'x-object-manifest': '{0}/part-'.format(
+                            self.segment_container
+                        )
+                    }
+                ),
+                data=b''
+            )
+            self.assertEqual(res.status_code, 201)
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, b''.join(self.segments))
+            self.assertEqual(res.headers['etag'], self.get_large_object_etag())
+
+            # segments are whatever is listed under the prefix at the time
+            self.swift.storage.load_object(
+                self.tenant_id,
+                self.segment_container,
+                'part-003',
+                b'tail'
+            )
+            res = requests.head(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 204)
+            self.assertEqual(
+                res.headers['content-length'],
+                str(sum(len(content) for content in self.segments) + 4)
+            )
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.content, b''.join(self.segments) + b'tail')
+
+    def test_empty_dynamic_large_object(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(),
+                headers=self.make_headers(
+                    **{'x-object-manifest': 'unknown/part-'}
+                ),
+                data=b''
+            )
+            self.assertEqual(res.status_code, 201)
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 204)
@@ -0,0 +1,227 @@
+"""
+Stack-In-A-Box: Swift Object Metadata Update
+"""
+import os
+import unittest
+
+import mock
+import requests
+import six
+import stackinabox.util.requests_mock.core
+from stackinabox.stack import StackInABox
+
+from openstackinabox.models.swift.storage import SwiftStorage
+from openstackinabox.services.swift import SwiftV1Service
+from openstackinabox.services.keystone import KeystoneV2Service
+
+
+class TestSwiftV1ObjectPost(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSwiftV1ObjectPost, self).setUp()
+        self.keystone = KeystoneV2Service()
+        self.swift = SwiftV1Service()
+        self.headers = {
+            'x-auth-token': self.keystone.model.tokens.make_token()
+        }
+        StackInABox.register_service(self.keystone)
+        StackInABox.register_service(self.swift)
+
+        self.tenant_id = '12345'
+        self.container = 'container'
+        self.object_name = 'object_name'
+        self.swift.do_register_object(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+
+    def tearDown(self):
+        super(TestSwiftV1ObjectPost, self).tearDown()
+        StackInABox.reset_services()
+
+    def make_url(self, tenant_id=None, container=None, object_name=None):
+        return (
+            'http://localhost/swift/v1.0/{0}/{1}/{2}'.format(
+                self.tenant_id if tenant_id is None else tenant_id,
+                self.container if container is None else container,
+                self.object_name if object_name is None else object_name
+            )
+        )
+
+    def register_object(self, content):
+        self.swift.storage.load_object(
+            self.tenant_id,
+            self.container,
+            self.object_name,
+            content
+        )
+
+    def make_headers(self, **kwargs):
+        headers = {
+            k: v
+            for k, v in six.iteritems(self.headers)
+        }
+        headers.update(kwargs)
+        return headers
+
+    def test_auth_failure(self):
+        self.swift.fail_auth = True
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.post(self.make_url())
+            self.assertEqual(res.status_code, 401)
+
+    def test_auth_failure_no_headers(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.post(self.make_url())
+            self.assertEqual(res.status_code, 401)
+
+    def test_defined_failure(self):
+        self.swift.fail_error_code = 499
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.post(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 499)
+
+    def test_defined_success_code(self):
+        self.swift.fail_error_code = 205
+        self.register_object(b'data')
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.post(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 205)
+
+    def test_object_not_found(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.post(
+                self.make_url(),
+                headers=self.make_headers(**{'x-object-meta-color': 'blue'})
+            )
+            self.assertEqual(res.status_code, 404)
+
+    def test_metadata_update(self):
+        content = os.urandom(1024)
+        self.register_object(content)
+        object_path = self.swift.storage.get_object_path(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+        object_stat = os.stat(object_path)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            with mock.patch.object(
+                SwiftStorage,
+                'write_object_data'
+            ) as mock_write_object_data:
+                res = requests.post(
+                    self.make_url(),
+                    headers=self.make_headers(**{
+                        'x-object-meta-color': 'blue',
+                        'x-object-meta-size': 'large'
+                    }),
+                    data=b'ignored'
+                )
+                self.assertEqual(res.status_code, 202)
+
+                res = requests.post(
+                    self.make_url(),
+                    headers=self.make_headers(**{
+                        'x-object-meta-color': 'red',
+                        'x-other-header': 'ignored'
+                    })
+                )
+                self.assertEqual(res.status_code, 202)
+
+            mock_write_object_data.assert_not_called()
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, content)
+            self.assertEqual(res.headers['x-object-meta-color'], 'red')
+            self.assertEqual(res.headers['x-object-meta-size'], 'large')
+            self.assertNotIn('x-other-header', res.headers)
+
+        self.assertEqual(os.stat(object_path).st_mtime, object_stat.st_mtime)
+        self.assertEqual(os.stat(object_path).st_ino, object_stat.st_ino)
+
+    def test_overwrite_drops_posted_metadata(self):
+        object_data = os.urandom(1024)
+        etag = SwiftStorage.get_etag(object_data)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(),
+                headers=self.make_headers(
+                    etag=etag,
+                    **{'x-object-meta-color': 'red'}
+                ),
+                data=object_data
+            )
+            self.assertEqual(res.status_code, 201)
+
+            res = requests.post(
+                self.make_url(),
+                headers=self.make_headers(**{'x-object-meta-color': 'green'})
+            )
+            self.assertEqual(res.status_code, 202)
+
+            res = requests.put(
+                self.make_url(),
+                headers=self.make_headers(
+                    etag=etag,
+                    **{'x-object-meta-color': 'blue'}
+                ),
+                data=object_data
+            )
+            self.assertEqual(res.status_code, 201)
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.headers['x-object-meta-color'], 'blue')
+
+    def test_load_drops_posted_metadata(self):
+        self.register_object(b'first')
+        self.swift.storage.store_or_update_custom_metadata(
+            self.tenant_id,
+            self.container,
+            self.object_name,
+            {'x-object-meta-color': 'green'}
+        )
+        self.swift.storage.load_objects([{
+            'tenantid': self.tenant_id,
+            'container_name': self.container,
+            'object_name': self.object_name,
+            'content': b'second'
+        }])
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, b'second')
+            self.assertNotIn('x-object-meta-color', res.headers)
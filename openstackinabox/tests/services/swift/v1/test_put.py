@@ -2,7 +2,11 @@
 Stack-In-A-Box: Basic Test
 """
 import hashlib
+import os
+import os.path
+import tempfile
 import unittest
+import uuid
 
 import ddt
 import requests
@@ -142,7 +146,7 @@ class TestSwiftV1ObjectGet(unittest.TestCase):
             )
             self.assertEqual(res.status_code, 499)
 
-    @ddt.data('PUT', 'POST')
+    @ddt.data('PUT')
     def test_zero_length_file_no_etag_header(self, http_method):
         self.swift.do_register_object(
             self.tenant_id,
@@ -174,7 +178,7 @@ class TestSwiftV1ObjectGet(unittest.TestCase):
             )
             self.assertEqual(res.status_code, 400)
 
-    @ddt.data('PUT', 'POST')
+    @ddt.data('PUT')
     def test_zero_length_file_defined_failure(self, http_method):
         self.swift.fail_error_code = 205
         self.swift.do_register_object(
@@ -208,7 +212,7 @@ class TestSwiftV1ObjectGet(unittest.TestCase):
             )
             self.assertEqual(res.status_code, 205)
 
-    @ddt.data('PUT', 'POST')
+    @ddt.data('PUT')
     def test_zero_length_file(self, http_method):
         self.swift.do_register_object(
             self.tenant_id,
@@ -241,7 +245,7 @@ class TestSwiftV1ObjectGet(unittest.TestCase):
             )
             self.assertEqual(res.status_code, 201)
 
-    @ddt.data('PUT', 'POST')
+    @ddt.data('PUT')
     def test_internal_error(self, http_method):
         self.swift.do_register_object(
             self.tenant_id,
@@ -274,3 +278,182 @@ class TestSwiftV1ObjectGet(unittest.TestCase):
                 headers=headers
             )
             self.assertEqual(res.status_code, 500)
+
+    def put_object(self, data, etag, object_name=None):
+        headers = {
+            k: v
+            for k, v in six.iteritems(self.headers)
+        }
+        headers['etag'] = etag
+
+        return requests.put(
+            self.make_url(object_name=object_name),
+            headers=headers,
+            data=data
+        )
+
+    def test_etag_verified(self):
+        self.swift.do_register_object(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+        object_data = os.urandom(1024)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_object(object_data, self.get_etag(object_data))
+            self.assertEqual(res.status_code, 201)
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, object_data)
+
+    def test_etag_mismatch(self):
+        self.swift.do_register_object(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+        object_data = os.urandom(1024)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_object(object_data, self.get_etag(object_data))
+            self.assertEqual(res.status_code, 201)
+
+            res = self.put_object(
+                os.urandom(1024),
+                self.get_etag(object_data)
+            )
+            self.assertEqual(res.status_code, 422)
+
+            # the stored object is left untouched
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, object_data)
+
+        container_path = self.swift.storage.get_container_path(
+            self.tenant_id,
+            self.container
+        )
+        self.assertEqual(os.listdir(container_path), [self.object_name])
+
+    def test_chunked_body(self):
+        self.swift.do_register_object(
+            self.tenant_id,
+            self.container,
+            self.object_name
+        )
+        chunks = [os.urandom(1000) for ignored in range(10)]
+        object_data = b''.join(chunks)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_object(
+                (chunk for chunk in chunks),
+                self.get_etag(object_data)
+            )
+            self.assertEqual(res.status_code, 201)
+            self.assertEqual(
+                res.headers['x-content-length'],
+                str(len(object_data))
+            )
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, object_data)
+            self.assertNotIn('transfer-encoding', res.headers)
+
+    @ddt.data(
+        'a;b',
+        'a;b=c',
+        'a%3Fb',
+    )
+    def test_reserved_characters(self, object_name):
+        object_data = os.urandom(1024)
+        other_data = os.urandom(1024)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_object(other_data, self.get_etag(other_data), 'a')
+            self.assertEqual(res.status_code, 201)
+
+            res = self.put_object(
+                object_data,
+                self.get_etag(object_data),
+                object_name
+            )
+            self.assertEqual(res.status_code, 201)
+
+            # the whole name is kept rather than read as path parameters
+            # or a query
+            for name, data in ((object_name, object_data), ('a', other_data)):
+                res = requests.get(
+                    self.make_url(object_name=name),
+                    headers=self.headers
+                )
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(res.content, data)
+
+    def test_dot_segments_contained(self):
+        escape_name = 'escaped-{0}'.format(uuid.uuid4().hex)
+        escape_path = os.path.join(tempfile.gettempdir(), escape_name)
+        object_names = {
+            '..%2F' * 6 + 'tmp%2F' + escape_name: os.urandom(1024),
+            '..%2Fother%2Fobject_name': os.urandom(1024),
+            '%2E%2E': os.urandom(1024),
+        }
+        other_data = os.urandom(1024)
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.put(
+                self.make_url(container='other'),
+                headers=dict(self.headers, etag=self.get_etag(other_data)),
+                data=other_data
+            )
+            self.assertEqual(res.status_code, 201)
+
+            for object_name, object_data in six.iteritems(object_names):
+                res = self.put_object(
+                    object_data,
+                    self.get_etag(object_data),
+                    object_name
+                )
+                self.assertEqual(res.status_code, 201)
+
+            self.assertFalse(os.path.exists(escape_path))
+
+            # every object keeps its own data inside its container
+            object_names[('other', self.object_name)] = other_data
+            for object_name, object_data in six.iteritems(object_names):
+                container, object_name = (
+                    object_name if isinstance(object_name, tuple)
+                    else (self.container, object_name)
+                )
+                res = requests.get(
+                    self.make_url(
+                        container=container,
+                        object_name=object_name
+                    ),
+                    headers=self.headers
+                )
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(res.content, object_data)
+
+        container_path = self.swift.storage.get_container_path(
+            self.tenant_id,
+            self.container
+        )
+        self.assertEqual(len(os.listdir(container_path)), 3)
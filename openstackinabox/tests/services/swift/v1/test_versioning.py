@@ -0,0 +1,310 @@
+"""
+Stack-In-A-Box: Swift Container Versioning
+"""
+import hashlib
+import unittest
+
+import ddt
+import mock
+import requests
+import six
+import stackinabox.util.requests_mock.core
+from stackinabox.stack import StackInABox
+
+from openstackinabox.services.swift import SwiftV1Service
+from openstackinabox.services.keystone import KeystoneV2Service
+
+
+@ddt.ddt
+class TestSwiftV1Versioning(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSwiftV1Versioning, self).setUp()
+        self.keystone = KeystoneV2Service()
+        self.swift = SwiftV1Service()
+        self.headers = {
+            'x-auth-token': self.keystone.model.tokens.make_token()
+        }
+        StackInABox.register_service(self.keystone)
+        StackInABox.register_service(self.swift)
+
+        self.tenant_id = '12345'
+        self.container = 'container'
+        self.versions_container = 'versions'
+        self.object_name = 'object_name'
+
+    def tearDown(self):
+        super(TestSwiftV1Versioning, self).tearDown()
+        StackInABox.reset_services()
+
+    def make_url(self, container=None, object_name=None):
+        url = 'http://localhost/swift/v1.0/{0}/{1}'.format(
+            self.tenant_id,
+            self.container if container is None else container
+        )
+        if object_name is not None:
+            url = '{0}/{1}'.format(url, object_name)
+
+        return url
+
+    def make_headers(self, **kwargs):
+        headers = {
+            k: v
+            for k, v in six.iteritems(self.headers)
+        }
+        headers.update(kwargs)
+        return headers
+
+    def put_container(self, **kwargs):
+        return requests.put(
+            self.make_url(),
+            headers=self.make_headers(**kwargs)
+        )
+
+    def put_object(self, content):
+        return requests.put(
+            self.make_url(object_name=self.object_name),
+            headers=self.make_headers(etag=hashlib.md5(content).hexdigest()),
+            data=content
+        )
+
+    def get_object(self):
+        return requests.get(
+            self.make_url(object_name=self.object_name),
+            headers=self.headers
+        )
+
+    def delete_object(self):
+        return requests.delete(
+            self.make_url(object_name=self.object_name),
+            headers=self.headers
+        )
+
+    def get_versions(self):
+        res = requests.get(
+            self.make_url(self.versions_container),
+            headers=self.headers
+        )
+        return res.text.split()
+
+    def test_auth_failure(self):
+        self.swift.fail_auth = True
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_container()
+            self.assertEqual(res.status_code, 401)
+
+            res = requests.post(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 401)
+
+    def test_container_metadata(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = requests.post(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 404)
+
+            res = self.put_container(
+                **{
+                    'x-container-meta-color': 'blue',
+                    'x-versions-location': self.versions_container
+                }
+            )
+            self.assertEqual(res.status_code, 201)
+
+            res = requests.head(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 204)
+            self.assertEqual(res.headers['x-container-meta-color'], 'blue')
+            self.assertEqual(
+                res.headers['x-versions-location'],
+                self.versions_container
+            )
+
+            # setting the history location replaces the versions location
+            res = requests.post(
+                self.make_url(),
+                headers=self.make_headers(
+                    **{
+                        'x-remove-container-meta-color': '1',
+                        'x-history-location': self.versions_container
+                    }
+                )
+            )
+            self.assertEqual(res.status_code, 204)
+
+            res = self.put_container()
+            self.assertEqual(res.status_code, 202)
+
+            res = requests.get(self.make_url(), headers=self.headers)
+            self.assertEqual(res.status_code, 204)
+            self.assertNotIn('x-container-meta-color', res.headers)
+            self.assertNotIn('x-versions-location', res.headers)
+            self.assertEqual(
+                res.headers['x-history-location'],
+                self.versions_container
+            )
+
+            res = requests.post(
+                self.make_url(),
+                headers=self.make_headers(
+                    **{'x-remove-history-location': '1'}
+                )
+            )
+            self.assertEqual(res.status_code, 204)
+            self.assertEqual(
+                self.swift.storage.get_versioning(
+                    self.tenant_id,
+                    self.container
+                ),
+                (None, None)
+            )
+
+    @ddt.data(
+        {'x-versions-location': 'versions', 'x-history-location': 'history'},
+        {'x-versions-location': 'versions/nested'},
+    )
+    def test_invalid_versioning(self, versioning_headers):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_container(**versioning_headers)
+            self.assertEqual(res.status_code, 400)
+
+            res = self.put_container()
+            self.assertEqual(res.status_code, 201)
+
+            res = requests.post(
+                self.make_url(),
+                headers=self.make_headers(**versioning_headers)
+            )
+            self.assertEqual(res.status_code, 400)
+
+    def test_versions_stack(self):
+        contents = [b'first', b'second', b'third']
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_container(
+                **{'x-versions-location': self.versions_container}
+            )
+            self.assertEqual(res.status_code, 201)
+
+            # each overwrite writes its own data once and only links the
+            # previous version's
+            with mock.patch.object(
+                self.swift.storage,
+                'write_object_data',
+                wraps=self.swift.storage.write_object_data
+            ) as mock_write_object_data:
+                for content in contents:
+                    res = self.put_object(content)
+                    self.assertEqual(res.status_code, 201)
+
+            self.assertEqual(
+                mock_write_object_data.call_count,
+                len(contents)
+            )
+
+            versions = self.get_versions()
+            self.assertEqual(len(versions), 2)
+            for version in versions:
+                self.assertTrue(version.startswith('00bobject_name-'))
+
+            res = self.get_object()
+            self.assertEqual(res.content, b'third')
+
+            # deleting pops the archived versions back, newest first
+            for content in reversed(contents[:-1]):
+                res = self.delete_object()
+                self.assertEqual(res.status_code, 204)
+                res = self.get_object()
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(res.content, content)
+
+            self.assertEqual(self.get_versions(), [])
+
+            res = self.delete_object()
+            self.assertEqual(res.status_code, 204)
+            res = self.get_object()
+            self.assertEqual(res.status_code, 404)
+
+    def test_versions_history(self):
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_container(
+                **{'x-history-location': self.versions_container}
+            )
+            self.assertEqual(res.status_code, 201)
+
+            for content in (b'first', b'second'):
+                res = self.put_object(content)
+                self.assertEqual(res.status_code, 201)
+
+            res = requests.post(
+                self.make_url(object_name=self.object_name),
+                headers=self.make_headers(
+                    **{'x-object-meta-color': 'blue'}
+                )
+            )
+            self.assertEqual(res.status_code, 202)
+
+            res = self.delete_object()
+            self.assertEqual(res.status_code, 204)
+            res = self.get_object()
+            self.assertEqual(res.status_code, 404)
+
+            versions = self.get_versions()
+            self.assertEqual(len(versions), 2)
+            data, metadata = self.swift.storage.retrieve_object(
+                self.tenant_id,
+                self.versions_container,
+                versions[-1]
+            )
+            self.assertEqual(data.read(), b'second')
+            self.assertEqual(metadata['x-object-meta-color'], 'blue')
+
+    def test_versions_addressable(self):
+        contents = [b'first', b'second', b'third']
+
+        with stackinabox.util.requests_mock.core.activate():
+            stackinabox.util.requests_mock.core.requests_mock_registration(
+                'localhost')
+
+            res = self.put_container(
+                **{'x-history-location': self.versions_container}
+            )
+            self.assertEqual(res.status_code, 201)
+
+            for content in contents:
+                res = self.put_object(content)
+                self.assertEqual(res.status_code, 201)
+
+            # the listed archive names can be used as request paths
+            versions = self.get_versions()
+            self.assertEqual(len(versions), 2)
+            for version, content in zip(versions, contents):
+                res = requests.get(
+                    self.make_url(self.versions_container, version),
+                    headers=self.headers
+                )
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(res.content, content)
+
+            res = requests.delete(
+                self.make_url(self.versions_container, versions[0]),
+                headers=self.headers
+            )
+            self.assertEqual(res.status_code, 204)
+            self.assertEqual(self.get_versions(), versions[1:])
+
+            res = self.get_object()
+            self.assertEqual(res.content, b'third')